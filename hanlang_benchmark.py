@@ -0,0 +1,876 @@
+# -*- coding: utf-8 -*-
+"""
+한랭(HanLang) 벤치마크 - 인터프리터 성능 측정
+최적화 전후의 실행 시간과 메모리 사용량을 비교합니다.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict
+
+import hanlang_interpreter
+from hanlang_interpreter import HanlangInterpreter
+
+
+def 프로그램(본문: str) -> str:
+    """본문에 한랭 필수 시작/끝 문구를 붙임"""
+    return "개발자한준후가 만든언어입니다.\n" + 본문 + "\n감사합니다.\n"
+
+
+def 실행측정(소스: str, **옵션) -> Dict[str, Any]:
+    """프로그램을 한 번 실행하고 시간, 최대/유지 메모리, Environment 생성 수를 측정
+
+    유지 메모리는 실행이 끝난 뒤에도 전역 변수 등에 남아 있는 메모리다.
+    """
+    생성수 = [0]
+    원래초기화 = hanlang_interpreter.Environment.__init__
+
+    def 세는초기화(환경, parent=None):
+        생성수[0] += 1
+        원래초기화(환경, parent)
+
+    출력들 = []
+    인터프리터 = HanlangInterpreter(output_callback=출력들.append, **옵션)
+    hanlang_interpreter.Environment.__init__ = 세는초기화
+    tracemalloc.start()
+    try:
+        시작 = time.perf_counter()
+        인터프리터.run(소스)
+        경과 = time.perf_counter() - 시작
+        유지메모리, 최대메모리 = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        hanlang_interpreter.Environment.__init__ = 원래초기화
+
+    return {
+        '시간': 경과,
+        '최대메모리': 최대메모리,
+        '유지메모리': 유지메모리,
+        '환경생성': 생성수[0],
+        '출력': 출력들,
+        '인터프리터': 인터프리터,
+    }
+
+
+def 비교출력(제목: str, 소스: str):
+    """최적화 끔/켬 결과를 나란히 출력"""
+    끔 = 실행측정(소스, 최적화=False)
+    켬 = 실행측정(소스, 최적화=True)
+    if 끔['출력'] != 켬['출력']:
+        raise AssertionError(f"{제목}: 최적화 전후 출력이 다릅니다")
+
+    print(f"[{제목}]")
+    for 이름, 결과 in (("최적화 끔", 끔), ("최적화 켬", 켬)):
+        print(f"  {이름}: {결과['시간'] * 1000:8.1f} ms, "
+              f"최대 메모리 {결과['최대메모리'] / 1024:8.1f} KB, "
+              f"유지 메모리 {결과['유지메모리'] / 1024:8.1f} KB, "
+              f"Environment 생성 {결과['환경생성']}회")
+
+
+def 프레임할당_벤치마크():
+    """클로저를 만들지 않는 함수/반복문/잡기 스코프의 Environment 재사용"""
+    소스 = 프로그램('''
+함수 피보나치(n) {
+    만약 n <= 1 {
+        반환 n
+    }
+    반환 피보나치(n - 1) + 피보나치(n - 2)
+}
+
+함수 안전나누기(a, b) {
+    시도 {
+        만약 b == 0 {
+            던지기 "0으로 나눔"
+        }
+        반환 a / b
+    } 잡기 (오류) {
+        반환 0
+    }
+}
+
+변수 합 = 0
+반복 i = 1 : 300 {
+    반복 j = 0 : 3 {
+        합 = 합 + 안전나누기(i, j)
+    }
+}
+출력(피보나치(18), 합)
+''')
+    비교출력("프레임 할당", 소스)
+
+
+def 메서드호출_벤치마크():
+    """메서드 호출 지점의 인라인 캐시와 바인딩된 메서드 없이 바로 호출하는 경로"""
+    소스 = 프로그램('''
+클래스 점 {
+    함수 생성(x, y) {
+        나.x = x
+        나.y = y
+    }
+
+    함수 이동(dx, dy) {
+        나.x = 나.x + dx
+        나.y = 나.y + dy
+    }
+
+    함수 거리제곱() {
+        반환 나.x * 나.x + 나.y * 나.y
+    }
+}
+
+변수 p = 점(0, 0)
+변수 합 = 0
+반복 i = 1 : 20000 {
+    p.이동(1, -1)
+    합 = 합 + p.거리제곱()
+}
+출력(p.x, p.y, 합)
+''')
+    비교출력("메서드 호출", 소스)
+
+
+def 인스턴스_벤치마크():
+    """모양(필드 배치)을 공유하는 인스턴스의 메모리와 필드 접근 시간"""
+    개수 = 5000
+    생성 = 실행측정(프로그램(f'''
+클래스 점 {{
+    함수 생성(x, y) {{
+        나.x = x
+        나.y = y
+    }}
+}}
+
+변수 점들 = []
+반복 i = 1 : {개수} {{
+    추가(점들, 점(i, -i))
+}}
+출력(길이(점들))
+'''))
+    인터프리터 = 생성['인터프리터']
+    점들 = 인터프리터.global_env.get('점들')
+    모양들 = {id(점.모양) for 점 in 점들}
+    필드크기 = sys.getsizeof(점들[0].값들)
+    딕셔너리크기 = sys.getsizeof(점들[0].필드들)
+
+    접근 = 실행측정(프로그램('''
+클래스 점 {
+    함수 생성(x, y) {
+        나.x = x
+        나.y = y
+    }
+}
+
+변수 p = 점(3, 4)
+변수 합 = 0
+반복 i = 1 : 20000 {
+    합 = 합 + p.x * p.y
+}
+출력(합)
+'''))
+
+    print("[인스턴스 모양]")
+    print(f"  인스턴스 {개수}개: 유지 메모리 {생성['유지메모리'] / 1024:8.1f} KB "
+          f"(인스턴스당 {생성['유지메모리'] / 개수:6.1f} B), 모양 {len(모양들)}개 공유")
+    print(f"  필드 저장소: 칸 리스트 {필드크기} B (필드 딕셔너리였다면 {딕셔너리크기} B)")
+    print(f"  필드 읽기 40000회: {접근['시간'] * 1000:8.1f} ms")
+
+
+def 레코드_벤치마크():
+    """레코드, 클래스 인스턴스, 딕셔너리로 만든 행의 메모리와 필드 읽기 시간"""
+    개수 = 5000
+    선언들 = {
+        "레코드": ("레코드 행(x, y)", "행(i, -i)", "목록[i].x"),
+        "클래스": ("클래스 행 {\n    함수 생성(x, y) {\n        나.x = x\n        나.y = y\n    }\n}",
+                 "행(i, -i)", "목록[i].x"),
+        "딕셔너리": ("", '{"x": i, "y": -i}', '목록[i]["x"]'),
+    }
+    print("[레코드]")
+    for 종류, (선언, 생성식, 읽기식) in 선언들.items():
+        생성 = 실행측정(프로그램(f'''
+{선언}
+변수 목록 = []
+반복 i = 0 : {개수 - 1} {{
+    추가(목록, {생성식})
+}}
+'''))
+        읽기 = 실행측정(프로그램(f'''
+{선언}
+변수 목록 = []
+반복 i = 0 : 99 {{
+    추가(목록, {생성식})
+}}
+변수 합 = 0
+반복 j = 1 : 200 {{
+    반복 i = 0 : 99 {{
+        합 = 합 + {읽기식}
+    }}
+}}
+출력(합)
+'''))
+        print(f"  {종류:5}: {개수}개 유지 메모리 {생성['유지메모리'] / 1024:8.1f} KB "
+              f"(개당 {생성['유지메모리'] / 개수:6.1f} B), "
+              f"필드 읽기 20000회 {읽기['시간'] * 1000:8.1f} ms")
+
+
+def 항목반복_벤치마크():
+    """인덱스 반복과 항목 반복, 리스트와 지연 범위 비교"""
+    개수 = 20000
+    소스들 = {
+        "인덱스로 리스트 반복": f'''
+변수 목록 = 목록으로(범위(0, {개수}))
+반복 i = 0 : 길이(목록) - 1 {{
+    합 += 목록[i]
+}}''',
+        "항목으로 리스트 반복": f'''
+변수 목록 = 목록으로(범위(0, {개수}))
+반복 x 안에 목록 {{
+    합 += x
+}}''',
+        "항목으로 범위 반복": f'''
+반복 x 안에 범위(0, {개수}) {{
+    합 += x
+}}''',
+    }
+    print("[항목 반복]")
+    for 제목, 본문 in 소스들.items():
+        결과 = 실행측정(프로그램("변수 합 = 0" + 본문 + "\n출력(합)"))
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms, "
+              f"최대 메모리 {결과['최대메모리'] / 1024:8.1f} KB")
+
+
+def 생성기_벤치마크():
+    """리스트를 만든 뒤 처리하는 방식과 생성기로 흘려보내는 방식의 최대 메모리"""
+    개수 = 20000
+    소스들 = {
+        "리스트 파이프라인": f'''
+함수 제곱목록(원본) {{
+    변수 결과 = []
+    반복 x 안에 원본 {{
+        추가(결과, x * x)
+    }}
+    반환 결과
+}}
+출력(합계(제곱목록(목록으로(범위(0, {개수})))))''',
+        "생성기 파이프라인": f'''
+함수 제곱들(원본) {{
+    반복 x 안에 원본 {{
+        양보 x * x
+    }}
+}}
+출력(합계(제곱들(범위(0, {개수}))))''',
+    }
+    print("[생성기]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("생성기: 두 파이프라인의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms, "
+              f"최대 메모리 {결과['최대메모리'] / 1024:8.1f} KB")
+
+
+def 리스트내포_벤치마크():
+    """반복문과 추가()로 리스트를 만드는 방식과 리스트 내포 비교"""
+    개수 = 20000
+    소스들 = {
+        "반복문 + 추가": f'''
+변수 결과 = []
+반복 x 안에 범위(0, {개수}) {{
+    만약 x % 2 == 0 {{
+        추가(결과, x * x)
+    }}
+}}
+출력(길이(결과), 결과[{개수 // 2 - 1}])''',
+        "리스트 내포": f'''
+변수 결과 = [x * x 반복 x 안에 범위(0, {개수}) 만약 x % 2 == 0]
+출력(길이(결과), 결과[{개수 // 2 - 1}])''',
+    }
+    print("[리스트 내포]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("리스트 내포: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 슬라이스_벤치마크():
+    """반씩 나누어 재귀할 때 슬라이스 복사와 보기(복사 없는 구간) 비교"""
+    개수 = 5000
+    재귀 = '''
+함수 최댓값(x) {{
+    만약 길이(x) == 1 {{
+        반환 x[0]
+    }}
+    변수 중간 = 정수변환(길이(x) / 2)
+    변수 왼쪽 = 최댓값(x[:중간])
+    변수 오른쪽 = 최댓값(x[중간:])
+    반환 왼쪽 > 오른쪽 ? 왼쪽 : 오른쪽
+}}
+변수 목록 = 목록으로(범위(0, {개수}))
+출력(최댓값({인자}))'''
+    소스들 = {
+        "슬라이스 복사": 재귀.format(개수=개수, 인자="목록"),
+        "보기": 재귀.format(개수=개수, 인자="보기(목록)"),
+    }
+    print("[슬라이스]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("슬라이스: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms, "
+              f"최대 메모리 {결과['최대메모리'] / 1024:8.1f} KB")
+
+
+def 선택_벤치마크():
+    """200갈래 상태 분기를 만약/아니면만약 사슬과 선택문(점프표)으로 실행"""
+    갈래 = 200
+    사슬 = "만약 상태 == 0 {\n        다음 = 1\n    }" + "".join(
+        f" 아니면만약 상태 == {i} {{\n        다음 = {(i + 1) % 갈래}\n    }}"
+        for i in range(1, 갈래))
+    경우들 = "\n".join(f"        경우 {i}: 다음 = {(i + 1) % 갈래}" for i in range(갈래))
+    반복본문 = '''
+변수 상태 = 0
+변수 다음 = 0
+반복 i = 1 : 1000 {{
+    {분기}
+    상태 = 다음
+}}
+출력(상태)'''
+    소스들 = {
+        "만약 사슬": 반복본문.format(분기=사슬),
+        "선택문": 반복본문.format(분기="선택 상태 {\n" + 경우들 + "\n    }"),
+    }
+    print("[선택문]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("선택문: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 문자열만들기_벤치마크():
+    """100자 조각을 이어 붙여 긴 문자열 만들기 - 매번 복사, 로프(+=), 문자열빌더 비교"""
+    조각 = "x" * 99 + "\\n"
+    소스들 = {
+        # 왼쪽이 변수 자신이 아니면 로프를 쓰지 않으므로 매번 전체를 복사
+        ("매번 복사", 10000): 'm = "" + m + 조각',
+        ("로프 +=", 10000): "m += 조각",
+        ("로프 +=", 100000): "m += 조각",
+        ("문자열빌더", 100000): "빌더.추가(조각)",
+    }
+    print("[문자열 만들기]")
+    for (제목, 개수), 본문 in 소스들.items():
+        결과 = 실행측정(프로그램(f'''
+변수 조각 = "{조각}"
+변수 m = ""
+변수 빌더 = 문자열빌더()
+반복 i = 1 : {개수} {{
+    {본문}
+}}
+출력(길이(m) + 길이(빌더.문자열()))'''))
+        print(f"  {제목} ({int(결과['출력'][0]) / 1000000:4.1f} MB): "
+              f"{결과['시간'] * 1000:8.1f} ms, 최대 메모리 {결과['최대메모리'] / 1024:8.1f} KB")
+
+
+def 자료구조_벤치마크():
+    """리스트로 만든 큐/방문표/우선순위 큐와 덱/집합/힙 비교"""
+    개수 = 12000
+    너비우선 = '''
+변수 큐 = {큐}
+변수 방문 = {방문}
+추가(큐, 0)
+추가(방문, 0)
+동안 길이(큐) > 0 {{
+    변수 현재 = 빼기(큐, 0)
+    반복 다음 안에 [현재 * 2 + 1, 현재 * 2 + 2] {{
+        만약 다음 < {개수} 그리고 아님 (다음 안에 방문) {{
+            추가(방문, 다음)
+            추가(큐, 다음)
+        }}
+    }}
+}}
+출력(길이(방문))'''
+    우선순위 = '''
+변수 대기 = {대기}
+반복 i = 1 : {개수} {{
+    추가(대기, (i * 7919) % {개수})
+    {정렬}
+}}
+변수 합 = 0
+동안 길이(대기) > 0 {{
+    합 = 합 + 빼기(대기{앞})
+}}
+출력(합)'''
+    소스들 = {
+        "너비 우선 탐색 - 리스트": 너비우선.format(큐="[]", 방문="[]", 개수=개수),
+        "너비 우선 탐색 - 덱/집합": 너비우선.format(큐="덱()", 방문="집합()", 개수=개수),
+        "우선순위 큐 - 추가마다 정렬": 우선순위.format(
+            대기="[]", 정렬="대기 = 정렬(대기)", 앞=", 0", 개수=개수 // 3),
+        "우선순위 큐 - 힙": 우선순위.format(대기="힙()", 정렬="", 앞="", 개수=개수 // 3),
+    }
+    print("[자료구조]")
+    for 제목, 본문 in 소스들.items():
+        결과 = 실행측정(프로그램(본문))
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms (출력 {결과['출력'][0]})")
+
+
+def 고차함수_벤치마크():
+    """반복문으로 직접 처리하는 방식과 맵/필터/줄이기, 키 함수 정렬 비교"""
+    개수 = 20000
+    소스들 = {
+        "반복문으로 변환/거르기/합": f'''
+변수 결과 = []
+반복 x 안에 범위(0, {개수}) {{
+    만약 x % 3 == 0 {{
+        추가(결과, x * 2)
+    }}
+}}
+변수 합 = 0
+반복 x 안에 결과 {{
+    합 = 합 + x
+}}
+출력(합)''',
+        "맵/필터/줄이기": f'''
+변수 결과 = 맵(필터(범위(0, {개수}), (x) => x % 3 == 0), (x) => x * 2)
+출력(줄이기(결과, (a, b) => a + b, 0))''',
+    }
+    print("[고차 함수]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("고차 함수: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+    레코드수 = 100000
+    인터프리터 = HanlangInterpreter(output_callback=lambda 출력: None)
+    인터프리터.run(프로그램(f'''
+레코드 사람(번호, 나이)
+변수 사람들 = 맵(범위(0, {레코드수}), (i) => 사람(i, (i * 7919) % 100))'''))
+    시작 = time.perf_counter()
+    인터프리터.run(프로그램("사람들 = 정렬(사람들, (p) => p.나이)"))
+    경과 = time.perf_counter() - 시작
+    print(f"  레코드 {레코드수}개 키 함수로 정렬: {경과 * 1000:8.1f} ms")
+
+
+def 정렬된목록_벤치마크():
+    """추가할 때마다 정렬하고 인덱스()로 찾는 방식과 정렬된목록/하한 비교 (순위표)"""
+    개수 = 20000
+    순위표 = '''
+변수 점수들 = {목록}
+변수 순위합 = 0
+반복 i = 1 : {개수} {{
+    변수 점수 = (i * 7919) % 100003
+    {추가}
+    순위합 = 순위합 + {순위}
+}}
+출력(길이(점수들), 순위합)'''
+    소스들 = {
+        "추가 후 정렬 + 인덱스": 순위표.format(
+            목록="[]", 추가="추가(점수들, 점수)\n    점수들 = 정렬(점수들)",
+            순위="인덱스(점수들, 점수)", 개수=개수),
+        "정렬된목록 + 하한": 순위표.format(
+            목록="정렬된목록()", 추가="추가(점수들, 점수)", 순위="하한(점수들, 점수)", 개수=개수),
+    }
+    print("[정렬된 목록]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("정렬된 목록: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 배열_벤치마크():
+    """원소마다 반복하는 수치 계산과 배열 원소별 연산 비교"""
+    개수 = 20000
+    소스들 = {
+        "리스트 원소별 반복": f'''
+변수 위치 = 목록으로(범위(0, {개수}))
+변수 속도 = []
+반복 i = 0 : {개수 - 1} {{
+    추가(속도, 0.5)
+}}
+반복 i = 0 : {개수 - 1} {{
+    위치[i] = 위치[i] + 속도[i] * 2
+}}
+변수 합 = 0
+반복 x 안에 위치 {{
+    합 = 합 + x * x
+}}
+출력(합)''',
+        "배열 원소별 연산": f'''
+변수 위치 = 범위배열(0, {개수})
+변수 속도 = 영배열({개수}) + 0.5
+위치 = 위치 + 속도 * 2
+출력(합계(위치 * 위치))''',
+    }
+    백엔드 = "NumPy" if hanlang_interpreter.np is not None else "파이썬 리스트"
+    print(f"[배열 - {백엔드}]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("배열: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 기억함수_벤치마크():
+    """단순 재귀 피보나치와 기억 함수 피보나치 비교"""
+    피보나치 = '''
+{기억}함수 피보나치(n) {{
+    만약 n < 2 {{ 반환 n }}
+    반환 피보나치(n - 1) + 피보나치(n - 2)
+}}
+출력(피보나치(20))'''
+    소스들 = {
+        "단순 재귀": 피보나치.format(기억=""),
+        "기억 함수": 피보나치.format(기억="기억 "),
+    }
+    print("[기억 함수]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("기억 함수: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+    통계 = 결과들["기억 함수"]['인터프리터'].기억통계()['피보나치']
+    print(f"  캐시 적중 {통계['적중']}회, 실패 {통계['실패']}회")
+
+
+def 병렬맵_벤치마크():
+    """CPU를 많이 쓰는 함수를 맵과 병렬맵(작업자 프로세스)으로 적용한 시간 비교"""
+    일괄작업 = '''
+함수 소수개수(시작) {{
+    변수 개수 = 0
+    반복 n = 시작 : 시작 + 499 {{
+        변수 소수 = n > 1
+        변수 i = 2
+        동안 소수 그리고 i * i <= n {{
+            만약 n % i == 0 {{ 소수 = 거짓 }}
+            i += 1
+        }}
+        만약 소수 {{ 개수 += 1 }}
+    }}
+    반환 개수
+}}
+변수 구간들 = [i * 500 반복 i 안에 범위(0, 16)]
+출력({맵}(구간들, 소수개수))'''
+    소스들 = {
+        "맵": 일괄작업.format(맵="맵"),
+        "병렬맵": 일괄작업.format(맵="병렬맵"),
+    }
+    작업자수 = HanlangInterpreter.병렬_작업자수 or os.cpu_count() or 1
+    print(f"[병렬맵 - 작업자 {작업자수}개]")
+    # 작업자 프로세스가 fork되면 tracemalloc 추적까지 이어받으므로 시간만 잰다
+    결과들 = {}
+    for 제목, 본문 in 소스들.items():
+        출력들 = []
+        인터프리터 = HanlangInterpreter(output_callback=출력들.append)
+        시작 = time.perf_counter()
+        인터프리터.run(프로그램(본문))
+        결과들[제목] = {'시간': time.perf_counter() - 시작, '출력': 출력들}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("병렬맵: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 비동기_벤치마크():
+    """기다리는 작업들을 하나씩 기다릴 때와 모두기다리기로 겹쳐 기다릴 때 비교"""
+    개수 = 20
+    요청 = '''
+비동기 함수 요청(n) {{
+    기다리기 잠자기(0.01)
+    반환 n * n
+}}
+{본문}'''
+    소스들 = {
+        "하나씩 기다리기": 요청.format(본문=f'''변수 결과들 = []
+반복 i = 0 : {개수 - 1} {{
+    추가(결과들, 기다리기 요청(i))
+}}
+출력(합계(결과들))'''),
+        "모두기다리기": 요청.format(본문=f'''변수 결과들 = 기다리기 모두기다리기([요청(i) 반복 i 안에 범위({개수})])
+출력(합계(결과들))'''),
+    }
+    print(f"[비동기 - 10ms 대기 {개수}개]")
+    결과들 = {제목: 실행측정(프로그램(본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("비동기: 두 방식의 출력이 다릅니다")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 비동기호스트_벤치마크():
+    """대화형 세션들을 세션마다 스레드로 실행할 때와 한 이벤트 루프에서 run_async로 실행할 때 비교"""
+    세션수, 입력지연 = 200, 0.005
+    소스 = 프로그램('''변수 합 = 0
+반복 i = 1 : 3 {
+    합 += 정수변환(입력("수? "))
+}
+출력("합", 합)''')
+
+    def 스레드마다():
+        출력들 = [[] for _ in range(세션수)]
+
+        def 입력받기(프롬프트):
+            time.sleep(입력지연)
+            return "7"
+
+        스레드들 = [threading.Thread(target=HanlangInterpreter(
+            output_callback=출력.append, input_callback=입력받기).run, args=(소스,))
+            for 출력 in 출력들]
+        for 스레드 in 스레드들:
+            스레드.start()
+        for 스레드 in 스레드들:
+            스레드.join()
+        return 출력들, 세션수
+
+    async def 이벤트루프에서():
+        출력들 = [[] for _ in range(세션수)]
+
+        async def 입력받기(프롬프트):
+            await asyncio.sleep(입력지연)
+            return "7"
+
+        def 출력대상(출력):
+            async def 보내기(줄):
+                출력.append(줄)
+            return 보내기
+
+        await asyncio.gather(*(HanlangInterpreter(
+            async_input_callback=입력받기, async_output_callback=출력대상(출력)).run_async(소스)
+            for 출력 in 출력들))
+        return 출력들, 0
+
+    print(f"[비동기 호스트 - 세션 {세션수}개, 입력 3번 x {입력지연 * 1000:.0f}ms]")
+    결과들 = {}
+    for 제목, 실행 in (("세션마다 스레드", 스레드마다), ("run_async", lambda: asyncio.run(이벤트루프에서()))):
+        시작 = time.perf_counter()
+        출력들, 스레드수 = 실행()
+        결과들[제목] = (time.perf_counter() - 시작, 출력들, 스레드수)
+    if len({str(출력들) for _, 출력들, _ in 결과들.values()}) != 1:
+        raise AssertionError("비동기 호스트: 두 방식의 출력이 다릅니다")
+    for 제목, (시간, _, 스레드수) in 결과들.items():
+        print(f"  {제목}: {시간 * 1000:8.1f} ms, 추가 스레드 {스레드수}개")
+
+    # 계산만 하는 프로그램이 도는 동안 같은 루프의 다른 작업이 기다린 최대 시간 (반복은 일반 함수 안)
+    계산 = 프로그램('''함수 더하기(n) {
+    변수 합 = 0
+    반복 i = 1 : n {
+        합 += i
+    }
+    반환 합
+}
+변수 합 = 더하기(200000)''')
+
+    async def 최대지연(쉬기간격):
+        간격들 = []
+        끝남 = asyncio.Event()
+
+        async def 시계():
+            이전 = time.perf_counter()
+            while not 끝남.is_set():
+                await asyncio.sleep(0)
+                지금 = time.perf_counter()
+                간격들.append(지금 - 이전)
+                이전 = 지금
+
+        시계작업 = asyncio.create_task(시계())
+        await asyncio.sleep(0)
+        해석기 = HanlangInterpreter(async_output_callback=lambda 줄: asyncio.sleep(0))
+        해석기.비동기_쉬기간격 = 쉬기간격
+        await 해석기.run_async(계산)
+        끝남.set()
+        await 시계작업
+        return max(간격들)
+
+    for 제목, 쉬기간격 in (("쉬지 않음", 10 ** 9), (f"{HanlangInterpreter.비동기_쉬기간격}문장마다 쉬기",
+                                                 HanlangInterpreter.비동기_쉬기간격)):
+        print(f"  {제목}: 다른 작업 최대 지연 {asyncio.run(최대지연(쉬기간격)) * 1000:8.1f} ms")
+
+
+def 파일_벤치마크():
+    """데이터를 소스 리터럴에 붙여 넣을 때와 파일에서 줄들로 읽을 때 비교 (작은 파일 / mmap)"""
+    개수 = 10000
+    값들 = [str(i * 7 % 1000) for i in range(개수)]
+    합계식 = '''변수 합 = 0
+반복 x 안에 {대상} {{
+    합 += 정수변환(x)
+}}
+출력(합)'''
+    with tempfile.TemporaryDirectory() as 폴더:
+        with open(os.path.join(폴더, "값.txt"), "w", encoding="utf-8") as 파일:
+            파일.write("\n".join(값들))
+        리터럴 = "[" + ", ".join(f'"{값}"' for 값 in 값들) + "]"
+        원래최소크기 = HanlangInterpreter.파일_mmap최소크기
+        결과들 = {}
+        try:
+            결과들["소스 리터럴"] = 실행측정(프로그램(합계식.format(대상=리터럴)))
+            HanlangInterpreter.파일_mmap최소크기 = 1 << 40
+            결과들["줄들 (버퍼 읽기)"] = 실행측정(프로그램(합계식.format(대상='줄들("값.txt")')), 허용경로들=[폴더])
+            HanlangInterpreter.파일_mmap최소크기 = 1
+            결과들["줄들 (mmap)"] = 실행측정(프로그램(합계식.format(대상='줄들("값.txt")')), 허용경로들=[폴더])
+        finally:
+            HanlangInterpreter.파일_mmap최소크기 = 원래최소크기
+        # 파일 핸들의 파이썬 파일 객체로 허용경로들 밖에 접근할 수 없어야 함 (형식 문자열로도)
+        for 소스 in ('출력(파일열기("값.txt")._파일)', '출력("{0._파일.name}".format(파일열기("값.txt")))'):
+            try:
+                HanlangInterpreter(허용경로들=[폴더]).run(프로그램(소스))
+            except hanlang_interpreter.런타임에러:
+                pass
+            else:
+                raise AssertionError("파일: 파일 핸들의 내부 파일 객체에 접근할 수 있습니다")
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("파일: 세 방식의 출력이 다릅니다")
+    print(f"[파일 - 값 {개수}개 합계]")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms, 최대 메모리 {결과['최대메모리'] / 1024:9.1f} KB")
+
+
+def CSV_벤치마크():
+    """CSV를 줄들과 분리로 직접 나눌 때와 CSV읽기/JSON줄들로 읽을 때 비교"""
+    개수 = 20000
+    with tempfile.TemporaryDirectory() as 폴더:
+        with open(os.path.join(폴더, "표.csv"), "w", encoding="utf-8") as 파일:
+            파일.write("이름,점수,반\n")
+            파일.writelines(f"학생{i},{i * 7 % 100},{i % 5}\n" for i in range(개수))
+        with open(os.path.join(폴더, "표.jsonl"), "w", encoding="utf-8") as 파일:
+            파일.writelines(f'{{"이름": "학생{i}", "점수": {i * 7 % 100}, "반": {i % 5}}}\n'
+                          for i in range(개수))
+        소스들 = {
+            "줄들 + 분리": '''변수 합 = 0
+변수 첫줄 = 참
+반복 줄 안에 줄들("표.csv") {
+    만약 첫줄 {
+        첫줄 = 거짓
+        계속
+    }
+    변수 칸 = 분리(공백제거(줄), ",")
+    합 += 정수변환(칸[1])
+}
+출력(합)''',
+            "CSV읽기": '''변수 합 = 0
+반복 행 안에 CSV읽기("표.csv", 참) {
+    합 += 정수변환(행["점수"])
+}
+출력(합)''',
+            "JSON줄들": '''변수 합 = 0
+반복 값 안에 JSON줄들("표.jsonl") {
+    합 += 값["점수"]
+}
+출력(합)''',
+        }
+        결과들 = {제목: 실행측정(프로그램(본문), 허용경로들=[폴더]) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("CSV: 세 방식의 출력이 다릅니다")
+    print(f"[CSV/JSON - {개수}행 열 합계]")
+    for 제목, 결과 in 결과들.items():
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms")
+
+
+def 정규식_벤치마크():
+    """줄마다 숫자를 찾아 더할 때 문자 반복, 정규식 (캐시), 정규식컴파일 비교"""
+    줄수 = 2000
+    준비 = f'''변수 줄목록 = []
+반복 i = 1 : {줄수} {{
+    추가(줄목록, "주문 " + 문자열변환(i) + "번: 사과 " + 문자열변환(i % 7) + "개, 배 " + 문자열변환(i % 3) + "개")
+}}
+변수 합 = 0
+'''
+    소스들 = {
+        "문자 반복": '''반복 줄 안에 줄목록 {
+    변수 숫자 = ""
+    반복 글자 안에 줄 + " " {
+        만약 글자 >= "0" 그리고 글자 <= "9" {
+            숫자 += 글자
+        } 아니면만약 숫자 != "" {
+            합 += 정수변환(숫자)
+            숫자 = ""
+        }
+    }
+}
+출력(합)''',
+        "정규식찾기모두": '''반복 줄 안에 줄목록 {
+    반복 숫자 안에 정규식찾기모두("\\d+", 줄) {
+        합 += 정수변환(숫자)
+    }
+}
+출력(합)''',
+        "정규식컴파일": '''변수 숫자식 = 정규식컴파일("\\d+")
+반복 줄 안에 줄목록 {
+    반복 숫자 안에 정규식찾기모두(숫자식, 줄) {
+        합 += 정수변환(숫자)
+    }
+}
+출력(합)''',
+    }
+    결과들 = {제목: 실행측정(프로그램(준비 + 본문)) for 제목, 본문 in 소스들.items()}
+    if len({tuple(결과['출력']) for 결과 in 결과들.values()}) != 1:
+        raise AssertionError("정규식: 세 방식의 출력이 다릅니다")
+    print(f"[정규식 - {줄수}줄에서 숫자 합계]")
+    for 제목, 결과 in 결과들.items():
+        통계 = 결과['인터프리터'].정규식통계()
+        print(f"  {제목}: {결과['시간'] * 1000:8.1f} ms, 캐시 적중 {통계['적중']}회 / 실패 {통계['실패']}회")
+
+
+def 클로저메모리_벤치마크():
+    """리스트에 보관한 콜백이 자유 변수만 캡처하는지 (유지 메모리 비교)"""
+    소스 = 프로그램('''
+함수 배수함수(n) {
+    변수 임시목록 = 범위(0, 500)
+    변수 배수 = n
+    반환 (x) => x * 배수
+}
+
+함수 카운터() {
+    변수 기록 = 범위(0, 500)
+    변수 수 = 0
+    함수 증가() {
+        수 += 1
+        반환 수
+    }
+    반환 증가
+}
+
+변수 콜백들 = []
+변수 카운터들 = []
+반복 i = 1 : 200 {
+    추가(콜백들, 배수함수(i))
+    추가(카운터들, 카운터())
+}
+카운터들[0]()
+출력(콜백들[9](3), 카운터들[0]())
+''')
+    비교출력("클로저 유지 메모리", 소스)
+
+    예제 = os.path.join(os.path.dirname(os.path.abspath(__file__)), "examples", "06_lambda.hanlang")
+    if os.path.exists(예제):
+        with open(예제, encoding="utf-8") as 파일:
+            비교출력("06_lambda.hanlang", 파일.read())
+
+
+if __name__ == "__main__":
+    프레임할당_벤치마크()
+    클로저메모리_벤치마크()
+    메서드호출_벤치마크()
+    인스턴스_벤치마크()
+    레코드_벤치마크()
+    항목반복_벤치마크()
+    생성기_벤치마크()
+    리스트내포_벤치마크()
+    슬라이스_벤치마크()
+    선택_벤치마크()
+    문자열만들기_벤치마크()
+    자료구조_벤치마크()
+    고차함수_벤치마크()
+    정렬된목록_벤치마크()
+    배열_벤치마크()
+    기억함수_벤치마크()
+    병렬맵_벤치마크()
+    비동기_벤치마크()
+    비동기호스트_벤치마크()
+    파일_벤치마크()
+    CSV_벤치마크()
+    정규식_벤치마크()
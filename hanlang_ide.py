@@ -8,6 +8,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, font
 import threading
 import queue
+import multiprocessing
 import re
 import os
 from typing import Optional, Dict, List
@@ -33,26 +34,35 @@ class 구문강조:
         '클래스': '#4EC9B0',      # 청록색
     }
 
-    키워드 = ['변수', '상수', '함수', '반환', '만약', '아니면', '아니면만약',
-              '반복', '동안', '중단', '계속', '클래스', '참', '거짓', '없음',
+    키워드 = ['변수', '상수', '함수', '기억', '비동기', '기다리기', '반환', '양보', '만약', '아니면', '아니면만약',
+              '선택', '경우', '기본', '반복', '안에', '동안', '중단', '계속', '클래스', '레코드', '참', '거짓', '없음',
               '그리고', '또는', '아님', '출력', '입력',
               '시도', '잡기', '마침내', '던지기']
 
-    내장함수 = ['길이', '정수변환', '실수변환', '문자열변환', '타입', '범위',
+    내장함수 = ['길이', '정수변환', '실수변환', '문자열변환', '타입', '범위', '목록으로',
                '절대값', '최대값', '최소값', '합계', '정렬', '뒤집기', '추가',
-               '제거', '포함',
+               '제거', '포함', '맵', '필터', '줄이기', '병렬맵',
+               '작업시작', '모두기다리기', '잠자기',
                # 수학 함수
                '제곱근', '거듭제곱', '올림', '내림', '반올림',
                '사인', '코사인', '탄젠트', '아크사인', '아크코사인', '아크탄젠트',
                '로그', '로그10', '파이', '자연상수', '무한대', '랜덤', '랜덤정수',
+               '배열', '영배열', '범위배열',
                # 문자열 함수
                '대문자', '소문자', '분리', '결합', '교체', '공백제거',
                '왼쪽공백제거', '오른쪽공백제거', '찾기', '시작확인', '끝확인',
-               '자르기', '반복문자', '채우기', '왼쪽채우기', '오른쪽채우기',
+               '자르기', '문자열빌더', '반복문자', '채우기', '왼쪽채우기', '오른쪽채우기',
                # 딕셔너리 함수
                '키값들', '값들', '항목들', '딕셔너리',
                # 리스트 함수
-               '삽입', '빼기', '인덱스', '개수', '복사', '비우기']
+               '삽입', '빼기', '인덱스', '개수', '복사', '비우기', '보기',
+               # 자료구조
+               '집합', '덱', '힙', '정렬된목록', '이진검색', '하한', '상한',
+               # 파일 함수
+               '파일열기', '줄들', '전체읽기', '파일쓰기', '추가쓰기', '닫기',
+               'CSV읽기', 'CSV쓰기', 'JSON읽기', 'JSON쓰기', 'JSON줄들',
+               # 정규식
+               '정규식일치', '정규식찾기모두', '정규식교체', '정규식분리', '정규식컴파일']
 
 
 class 줄번호위젯(tk.Canvas):
@@ -258,8 +268,8 @@ class 코드편집기(tk.Frame):
         for match in re.finditer(r'함수\s+(\w+)', content):
             self._apply_tag(match.start(1), match.end(1), '함수')
 
-        # 클래스 정의 강조
-        for match in re.finditer(r'클래스\s+(\w+)', content):
+        # 클래스/레코드 정의 강조
+        for match in re.finditer(r'(?:클래스|레코드)\s+(\w+)', content):
             self._apply_tag(match.start(1), match.end(1), '클래스')
 
         # 괄호 강조
@@ -367,8 +377,8 @@ class 코드편집기(tk.Frame):
             if 이름.startswith(접두사) and 이름 not in 후보들:
                 후보들.append(이름)
 
-        # 클래스 정의
-        for match in re.finditer(r'클래스\s+([가-힣a-zA-Z_][가-힣a-zA-Z0-9_]*)', 코드):
+        # 클래스/레코드 정의
+        for match in re.finditer(r'(?:클래스|레코드)\s+([가-힣a-zA-Z_][가-힣a-zA-Z0-9_]*)', 코드):
             이름 = match.group(1)
             if 이름.startswith(접두사) and 이름 not in 후보들:
                 후보들.append(이름)
@@ -1346,6 +1356,8 @@ class HanlangIDE(tk.Tk):
         self.상태바.상태설정("실행 중...")
 
         code = self.편집기.코드가져오기()
+        # 프로그램의 파일 함수는 현재 파일이 있는 폴더 안에서만 동작 (저장하지 않은 새 파일은 파일 접근 없음)
+        허용경로들 = [os.path.dirname(os.path.abspath(self.현재파일))] if self.현재파일 else None
 
         def run_code():
             try:
@@ -1367,7 +1379,8 @@ class HanlangIDE(tk.Tk):
 
                 interpreter = HanlangInterpreter(
                     output_callback=output_callback,
-                    input_callback=input_callback
+                    input_callback=input_callback,
+                    허용경로들=허용경로들
                 )
                 interpreter.run(code)
 
@@ -1412,6 +1425,8 @@ class HanlangIDE(tk.Tk):
   • 문자열: "안녕하세요", '한랭'
   • 불리언: 참, 거짓
   • 리스트: [1, 2, 3], ["a", "b"]
+  • 리스트 내포: [x * x 반복 x 안에 범위(5) 만약 x > 1]
+  • 슬라이스: a[1:3], a[:2], a[::-1], a[0:2] = [9, 9]
   • 딕셔너리: {"키": "값", "이름": "홍길동"}
   • 없음: 없음
 
@@ -1430,11 +1445,22 @@ class HanlangIDE(tk.Tk):
       # 모두 거짓일 때
   }
 
+【 선택문 】
+  선택 값 {
+      경우 1: 출력("하나")
+      경우 2, 3: 출력("둘 또는 셋")
+      기본: 출력("그 외")
+  }
+
 【 반복문 】
   반복 i = 1 : 10 {
       출력(i)
   }
 
+  반복 항목 안에 리스트 {
+      출력(항목)   # 리스트/문자열/딕셔너리 키/범위
+  }
+
   동안 조건 {
       # 조건이 참인 동안 반복
   }
@@ -1449,6 +1475,35 @@ class HanlangIDE(tk.Tk):
 
   변수 결과 = 더하기(3, 5)
 
+【 기억 함수 】
+  기억 함수 피보나치(n) {    # 인자별 결과를 기억
+      만약 n < 2 { 반환 n }
+      반환 피보나치(n - 1) + 피보나치(n - 2)
+  }
+  기억(100) 함수 제곱(x) { 반환 x * x }    # 최대 100개
+  (본문에서 출력/입력/랜덤은 쓸 수 없음)
+
+【 생성기 】
+  함수 세기(n) {
+      반복 i = 1 : n {
+          양보 i    # 값을 하나씩 내보냄
+      }
+  }
+
+  반복 x 안에 세기(3) {
+      출력(x)
+  }
+
+【 비동기 함수 】
+  비동기 함수 내려받기(초) {
+      기다리기 잠자기(초)    # 기다리는 동안 다른 작업 실행
+      반환 초
+  }
+
+  변수 작업 = 작업시작(내려받기(1))
+  출력(기다리기 작업)
+  출력(기다리기 모두기다리기([내려받기(1), 내려받기(2)]))
+
 【 람다 함수 】
   변수 제곱 = (x) => x * x
   변수 더하기 = (a, b) => a + b
@@ -1468,6 +1523,19 @@ class HanlangIDE(tk.Tk):
   변수 철수 = 사람("김철수")
   철수.인사()
 
+  # 상속 (부모.메서드()로 부모 메서드 호출)
+  클래스 학생(사람) {
+      함수 생성(이름, 학교) {
+          부모.생성(이름)
+          나.학교 = 학교
+      }
+  }
+
+【 레코드 】
+  레코드 점(x, y)        # 불변, 딕셔너리 키로 사용 가능
+  변수 p = 점(3, 4)
+  출력(p.x, p.y)
+
 【 예외 처리 】
   시도 {
       # 오류가 발생할 수 있는 코드
@@ -1493,7 +1561,8 @@ class HanlangIDE(tk.Tk):
   • 실수변환(값)   - 실수로 변환
   • 문자열변환(값) - 문자열로 변환
   • 타입(값)       - 자료형 반환
-  • 범위(시작, 끝) - 범위 리스트
+  • 범위(시작, 끝) - 정수 범위 (값을 미리 만들지 않음)
+  • 목록으로(대상) - 리스트로 변환
 
 【 내장 함수 - 수학 】
   • 제곱근(x)      - 제곱근
@@ -1506,6 +1575,8 @@ class HanlangIDE(tk.Tk):
   • 파이, 자연상수  - 상수
   • 랜덤()         - 0~1 난수
   • 랜덤정수(a, b) - 정수 난수
+  • 배열(리스트)   - 원소별 연산 배열 (a + b, a * 2, a > 0)
+  • 영배열(n), 범위배열(시작, 끝, 간격) - 배열 만들기
 
 【 내장 함수 - 문자열 】
   • 대문자(s)/소문자(s) - 대소문자 변환
@@ -1515,16 +1586,44 @@ class HanlangIDE(tk.Tk):
   • 공백제거(s)        - 양쪽 공백 제거
   • 찾기(s, 검색어)    - 위치 반환
   • 자르기(s, 시작, 끝) - 부분 문자열
+  • 문자열빌더()      - 빌더.추가(조각) 후 빌더.문자열()로 한 번에 합침
+  • 정규식일치(패턴, s) - 처음 일치한 [전체, 그룹...] (없으면 없음)
+  • 정규식찾기모두(패턴, s) - 모든 일치 목록
+  • 정규식교체(패턴, s, 바꿀것) - 일치를 문자열이나 함수 결과로 바꿈
+  • 정규식분리(패턴, s) - 패턴으로 나누기
+  • 정규식컴파일(패턴) - 반복문에서 쓸 패턴을 미리 컴파일
 
 【 내장 함수 - 리스트/딕셔너리 】
   • 추가(리스트, 값)   - 리스트에 추가
   • 제거(리스트, 값)   - 리스트에서 제거
   • 삽입(리스트, i, 값) - 위치에 삽입
-  • 정렬(리스트)       - 정렬
+  • 정렬(리스트, 키, 역순) - 정렬 (키 함수/역순 생략 가능)
+  • 맵(대상, 함수)    - 각 항목에 함수 적용
+  • 필터(대상, 함수)  - 함수가 참인 항목만
+  • 줄이기(대상, 함수, 초기값) - 항목을 하나로 합침
+  • 병렬맵(대상, 함수) - 여러 프로세스에서 맵 (바깥 변수는 바꿀 수 없음)
   • 뒤집기(대상)       - 뒤집기
   • 키값들(딕셔너리)   - 키 목록
   • 값들(딕셔너리)     - 값 목록
   • 항목들(딕셔너리)   - (키, 값) 목록
+  • 보기(리스트, 시작, 끝) - 복사 없이 원본 구간을 가리키는 보기
+  • 집합(대상)        - 중복 없는 값 모음 (+ 합집합, - 차집합)
+  • 덱(대상)          - 양쪽 끝에서 넣고 빼는 큐 (빼기(덱, 0)은 맨 앞)
+  • 힙(대상)          - 가장 작은 값부터 꺼내는 우선순위 큐
+  • 정렬된목록(대상)  - 추가/제거해도 정렬을 유지하는 목록
+  • 이진검색/하한/상한(정렬된리스트, 값) - 정렬된 리스트에서 위치 찾기
+  • 값 안에 모음      - 포함 여부 (리스트, 문자열, 딕셔너리, 집합 등)
+
+【 내장 함수 - 파일 (현재 파일이 있는 폴더 안에서만, 새 파일은 저장한 뒤) 】
+  • 파일열기(경로, 모드) - '읽기'(기본), '쓰기', '추가' 모드로 열기
+  • 줄들(파일 또는 경로) - 한 줄씩 읽는 반복자
+  • 전체읽기(파일 또는 경로) - 내용 전체
+  • 파일쓰기(경로, 값, ...) / 추가쓰기(경로, 값, ...) - 새로 쓰기 / 뒤에 붙이기
+  • 파일.쓰기(값, ...), 파일.줄읽기(), 닫기(파일) - 연 파일 다루기
+  • CSV읽기(파일, 머리줄, 구분자) - 한 행씩 (머리줄이 참이면 딕셔너리)
+  • CSV쓰기(파일, 행들, 머리줄) - 리스트/딕셔너리 행들을 CSV로
+  • JSON읽기(파일) / JSON쓰기(파일, 값, 들여쓰기) - JSON 값 읽기/쓰기
+  • JSON줄들(파일)     - JSON Lines를 한 줄씩
 
 【 주석 】
   # 한 줄 주석
@@ -1585,4 +1684,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # PyInstaller로 묶은 실행 파일에서 병렬맵 작업자 프로세스가 IDE를 다시 띄우지 않도록
+    multiprocessing.freeze_support()
     main()
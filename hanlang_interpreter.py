@@ -4,15 +4,41 @@
 AST를 실행하여 결과를 반환합니다.
 """
 
+import asyncio
+import bisect
+import copy
+import csv
+import functools
+import heapq
+import inspect
+import itertools
+import json
 import math
-from typing import Dict, List, Any, Optional, Callable
+import mmap
+import operator
+import os
+import pickle
+import re
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import fields
+from typing import Dict, List, Any, Optional, Callable, Iterator, Iterable, Tuple, Awaitable, Deque, Set
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 배열은 리스트에 담아 원소별로 계산
+    np = None
 from hanlang_lexer import HanlangLexer
 from hanlang_parser import (
     HanlangParser, ASTNode, 프로그램, 숫자리터럴, 문자열리터럴, 불리언리터럴,
-    없음리터럴, 리스트리터럴, 딕셔너리리터럴, 식별자, 이항연산, 단항연산, 변수선언, 대입문,
-    함수선언, 함수호출, 반환문, 조건문, 반복문, 동안문, 중단문, 계속문,
-    출력문, 입력문, 인덱스접근, 속성접근, 클래스선언, 시도문, 던지기문, 삼항연산, 람다식
+    없음리터럴, 리스트리터럴, 리스트내포, 딕셔너리리터럴, 식별자, 이항연산, 단항연산, 변수선언, 대입문,
+    함수선언, 함수호출, 반환문, 양보문, 기다리기식, 계산된값, 조건문, 선택문, 반복문, 항목반복문, 동안문, 중단문, 계속문,
+    출력문, 입력문, 인덱스접근, 슬라이스, 속성접근, 클래스선언, 레코드선언, 시도문, 던지기문, 삼항연산, 람다식,
+    불변식, 불변식계산, 인라인호출, 인자참조
 )
+from hanlang_optimizer import HanlangOptimizer, 최적화보고, 자식노드들, 자유이름들, 바깥변경이름들
 
 class 반환예외(Exception):
     """함수에서 반환할 때 사용하는 예외"""
@@ -37,11 +63,28 @@ class 사용자예외(Exception):
         self.값 = 값
         super().__init__(str(값))
 
+class _계산실패표시:
+    """미리 계산하다 오류가 난 불변식 표시"""
+    def __repr__(self):
+        return "<계산 실패>"
+
+_계산실패 = _계산실패표시()
+
+class _쉬기표시:
+    """비동기 실행이 이벤트 루프에 차례를 넘기도록 _블록생성이 양보하는 표시"""
+    def __repr__(self):
+        return "<쉬기>"
+
+_쉬기 = _쉬기표시()
+
 class 한랭함수:
-    """사용자 정의 함수"""
-    def __init__(self, 선언: 함수선언, 환경: 'Environment'):
+    """사용자 정의 함수 (메서드이면 부모클래스는 선언된 클래스의 부모)"""
+    def __init__(self, 선언: 함수선언, 환경: 'Environment',
+                 부모클래스: Optional['한랭클래스'] = None):
         self.선언 = 선언
         self.클로저 = 환경
+        self.부모클래스 = 부모클래스
+        self.기억: Optional[Callable] = None  # 기억 함수의 LRU 캐시 (인터프리터가 설정)
 
     def __repr__(self):
         return f"<함수 {self.선언.이름}>"
@@ -51,47 +94,1073 @@ class 한랭람다:
     def __init__(self, 선언: 람다식, 환경: 'Environment'):
         self.매개변수들 = 선언.매개변수들
         self.본문 = 선언.본문
+        self.프레임재사용 = 선언.프레임재사용
         self.클로저 = 환경
 
     def __repr__(self):
         return f"<람다 ({', '.join(self.매개변수들)})>"
 
+class _병렬함수:
+    """병렬맵이 작업자 프로세스로 보내는 함수/람다 (선언 사본과 캡처한 값)"""
+    def __init__(self, 선언: ASTNode):
+        self.선언 = 선언  # 함수선언 또는 람다식
+        self.캡처: Dict[str, Any] = {}  # 이름 -> 값 (함수 값은 _병렬함수)
+
+def _보낼사본(node: ASTNode) -> ASTNode:
+    """다른 프로세스로 보낼 AST 사본
+
+    인터프리터가 채운 캐시(compare=False 필드)는 비우고, 클로저 캡처 분석은 작업자의
+    스코프 구조와 맞지 않으므로 버려서 전체 스코프 체인을 캡처하게 한다.
+    """
+    # deepcopy는 memo에 있는 객체를 그 값으로 바꾸므로 캐시 객체를 None으로 미리 등록
+    memo: Dict[int, Any] = {}
+
+    def 캐시등록(n: ASTNode):
+        for 필드 in fields(n):
+            값 = getattr(n, 필드.name)
+            if not 필드.compare and 값 is not None and not isinstance(값, bool):
+                memo[id(값)] = None
+        for 자식 in 자식노드들(n):
+            캐시등록(자식)
+
+    def 캡처지우기(n: ASTNode):
+        if isinstance(n, (함수선언, 람다식)):
+            n.캡처 = None
+        for 자식 in 자식노드들(n):
+            캡처지우기(자식)
+
+    캐시등록(node)
+    사본 = copy.deepcopy(node, memo)
+    캡처지우기(사본)
+    return 사본
+
+class 모양:
+    """인스턴스의 필드 배치 (필드 이름 -> 칸 번호)
+
+    같은 순서로 필드가 추가된 인스턴스들은 같은 모양 객체를 공유한다.
+    """
+    __slots__ = ('칸번호', '전이들')
+
+    def __init__(self, 칸번호: Optional[Dict[str, int]] = None):
+        self.칸번호: Dict[str, int] = 칸번호 or {}
+        self.전이들: Dict[str, '모양'] = {}
+
+    def 전이(self, 이름: str) -> '모양':
+        """필드 하나를 추가한 모양"""
+        다음 = self.전이들.get(이름)
+        if 다음 is None:
+            다음 = 모양({**self.칸번호, 이름: len(self.칸번호)})
+            self.전이들[이름] = 다음
+        return 다음
+
+class 한랭생성기:
+    """양보가 있는 함수를 호출한 결과 - 반복할 때마다 다음 양보까지 실행"""
+    __slots__ = ('이름', '_실행')
+
+    def __init__(self, 이름: str, 실행: Iterator[Any]):
+        self.이름 = 이름
+        self._실행 = 실행
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._실행)
+
+    def __repr__(self):
+        return f"<생성기 {self.이름}>"
+
 class 한랭클래스:
     """사용자 정의 클래스"""
-    def __init__(self, 이름: str, 메서드들: Dict[str, 한랭함수]):
+    def __init__(self, 이름: str, 메서드들: Dict[str, 한랭함수],
+                 부모: Optional['한랭클래스'] = None):
         self.이름 = 이름
-        self.메서드들 = 메서드들
+        self.부모 = 부모
+        # 상속받은 메서드까지 펼친 조회 테이블 (클래스를 만들 때 한 번 계산)
+        self.메서드들 = {**부모.메서드들, **메서드들} if 부모 else 메서드들
+        # 생성자가 필드를 추가하는 순서대로 모양 전이가 만들어져 인스턴스들이 공유
+        self.빈모양 = 모양()
 
     def __repr__(self):
         return f"<클래스 {self.이름}>"
 
 class 한랭인스턴스:
-    """클래스의 인스턴스"""
+    """클래스의 인스턴스 (필드 값은 모양의 칸 번호 순서로 저장)"""
+    __slots__ = ('클래스', '모양', '값들')
+
     def __init__(self, 클래스: 한랭클래스):
         self.클래스 = 클래스
-        self.필드들: Dict[str, Any] = {}
+        self.모양 = 클래스.빈모양
+        self.값들: List[Any] = []
+
+    @property
+    def 필드들(self) -> Dict[str, Any]:
+        """필드 이름 -> 값 (읽기 전용 사본)"""
+        return {이름: self.값들[번호] for 이름, 번호 in self.모양.칸번호.items()}
+
+    def 필드설정(self, 이름: str, 값: Any):
+        번호 = self.모양.칸번호.get(이름)
+        if 번호 is None:
+            self.모양 = self.모양.전이(이름)
+            self.값들.append(값)
+        else:
+            self.값들[번호] = 값
 
     def __repr__(self):
         return f"<{self.클래스.이름} 인스턴스>"
 
+class 셀:
+    """스코프와 클로저가 함께 쓰는 변수 칸"""
+    __slots__ = ('값',)
+
+    def __init__(self, 값: Any = None):
+        self.값 = 값
+
+class 문자열로프:
+    """`s += 조각`으로 이어 붙이는 중인 문자열 변수의 값
+
+    조각을 리스트에 모아 두었다가 변수를 읽을 때(Environment.get) 한 번에 합친다.
+    변수 밖으로 나가지 않으므로 한랭 코드에서는 항상 문자열로 보인다.
+    """
+    __slots__ = ('조각들',)
+
+    def __init__(self, *조각들: str):
+        self.조각들 = list(조각들)
+
+    def 완성(self) -> str:
+        if len(self.조각들) != 1:
+            self.조각들 = [''.join(self.조각들)]
+        return self.조각들[0]
+
+def _이어붙인값(현재: Any, 조각: str) -> Optional[문자열로프]:
+    """문자열 변수 값 뒤에 조각을 이어 붙인 로프 (문자열이 아니면 None)"""
+    if type(현재) is 문자열로프:
+        현재.조각들.append(조각)
+        return 현재
+    if type(현재) is str:
+        return 문자열로프(현재, 조각)
+    return None
+
+class 한랭문자열빌더:
+    """문자열빌더() 결과 - 추가한 조각을 모아 두었다가 문자열()을 부를 때 한 번에 합침"""
+    __slots__ = ('조각들', '_길이')
+
+    def __init__(self, *조각들):
+        self.조각들: List[str] = []
+        self._길이 = 0
+        self.추가(*조각들)
+
+    def 추가(self, *조각들) -> '한랭문자열빌더':
+        for 조각 in 조각들:
+            조각 = str(조각)
+            self.조각들.append(조각)
+            self._길이 += len(조각)
+        return self
+
+    def 문자열(self) -> str:
+        if len(self.조각들) > 1:
+            self.조각들 = [''.join(self.조각들)]
+        return self.조각들[0] if self.조각들 else ''
+
+    def 비우기(self) -> '한랭문자열빌더':
+        self.조각들 = []
+        self._길이 = 0
+        return self
+
+    def __len__(self):
+        return self._길이
+
+    def __str__(self):
+        return self.문자열()
+
+    def __repr__(self):
+        return f"문자열빌더({self.문자열()!r})"
+
+class 한랭레코드(tuple):
+    """레코드 값 (필드 순서대로 값을 담은 불변 튜플)
+
+    레코드 선언마다 이 클래스의 하위 클래스가 하나씩 만들어진다.
+    """
+    __slots__ = ()
+    _이름: str = '레코드'
+    _필드들: tuple = ()
+    _칸번호: Dict[str, int] = {}
+
+    def __new__(cls, *값들):
+        if len(값들) != len(cls._필드들):
+            raise 런타임에러(
+                f"레코드 '{cls._이름}'은(는) {len(cls._필드들)}개의 값이 필요하지만 "
+                f"{len(값들)}개가 전달되었습니다"
+            )
+        return tuple.__new__(cls, 값들)
+
+    # 같은 값이라도 레코드 종류가 다르면 다른 값
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self._이름, tuple.__hash__(self)))
+
+    def __repr__(self):
+        return f"{self._이름}(" + ', '.join(
+            f"{필드}={값!r}" for 필드, 값 in zip(self._필드들, self)) + ")"
+
+    __str__ = __repr__
+
+def 레코드형만들기(이름: str, 필드들: List[str]) -> type:
+    """레코드 선언에 해당하는 한랭레코드 하위 클래스 생성"""
+    return type(이름, (한랭레코드,), {
+        '__slots__': (),
+        '_이름': 이름,
+        '_필드들': tuple(필드들),
+        '_칸번호': {필드: 번호 for 번호, 필드 in enumerate(필드들)},
+    })
+
+class 한랭범위:
+    """범위() 결과 - 값을 미리 만들지 않는 정수 구간
+
+    출력하거나 비교할 때는 리스트처럼 보인다. 변경하려면 목록으로()로 리스트를 만든다.
+    """
+    __slots__ = ('구간',)
+
+    def __init__(self, 구간: range):
+        self.구간 = 구간
+
+    def __iter__(self):
+        return iter(self.구간)
+
+    def __reversed__(self):
+        return reversed(self.구간)
+
+    def __len__(self):
+        return len(self.구간)
+
+    def __contains__(self, 값):
+        return 값 in self.구간
+
+    def __getitem__(self, 인덱스):
+        if isinstance(인덱스, slice):
+            return 한랭범위(self.구간[인덱스])
+        return self.구간[인덱스]
+
+    def __eq__(self, other):
+        if isinstance(other, 한랭범위):
+            return self.구간 == other.구간
+        if isinstance(other, list):
+            return len(other) == len(self.구간) and list(self.구간) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.구간)
+
+    def index(self, 값):
+        return self.구간.index(값)
+
+    def count(self, 값):
+        return self.구간.count(값)
+
+    def __repr__(self):
+        return repr(list(self.구간))
+
+class 한랭보기:
+    """보기() 결과 - 리스트나 문자열의 연속 구간을 복사하지 않고 가리키는 값
+
+    읽기와 쓰기는 원본에 그대로 반영된다. 보기를 다시 자르면 같은 원본을 가리키는 보기가 된다.
+    """
+    __slots__ = ('원본', '시작', '길이')
+
+    def __init__(self, 원본, 시작: int = 0, 끝: Optional[int] = None):
+        if isinstance(원본, 한랭보기):
+            구간 = 원본._구간()[시작:끝]
+            원본 = 원본.원본
+        else:
+            구간 = range(len(원본))[시작:끝]
+        self.원본 = 원본
+        self.시작 = 구간.start
+        self.길이 = len(구간)
+
+    def _구간(self) -> range:
+        return range(self.시작, self.시작 + self.길이)
+
+    def _위치(self, 인덱스: int) -> int:
+        """보기 안의 인덱스(음수 허용)를 원본 인덱스로 변환"""
+        if 인덱스 < 0:
+            인덱스 += self.길이
+        if not 0 <= 인덱스 < self.길이:
+            raise IndexError("보기 인덱스가 범위를 벗어났습니다")
+        return self.시작 + 인덱스
+
+    def _복사(self):
+        return self.원본[self.시작:self.시작 + self.길이]
+
+    def __len__(self):
+        return self.길이
+
+    def __iter__(self):
+        return map(self.원본.__getitem__, self._구간())
+
+    def __reversed__(self):
+        return map(self.원본.__getitem__, reversed(self._구간()))
+
+    def __contains__(self, 값):
+        return any(항목 == 값 for 항목 in self)
+
+    def __getitem__(self, 인덱스):
+        if isinstance(인덱스, slice):
+            구간 = self._구간()[인덱스]
+            if 구간.step == 1:
+                보기 = 한랭보기.__new__(한랭보기)
+                보기.원본, 보기.시작, 보기.길이 = self.원본, 구간.start, len(구간)
+                return 보기
+            return [self.원본[i] for i in 구간]
+        return self.원본[self._위치(인덱스)]
+
+    def __setitem__(self, 인덱스, 값):
+        if isinstance(인덱스, slice):
+            구간 = self._구간()[인덱스]
+            값들 = list(값)
+            if len(값들) != len(구간):
+                raise ValueError(f"보기의 길이는 바꿀 수 없습니다 ({len(구간)}개 자리에 {len(값들)}개)")
+            for i, 항목 in zip(구간, 값들):
+                self.원본[i] = 항목
+        else:
+            self.원본[self._위치(인덱스)] = 값
+
+    def __eq__(self, other):
+        if isinstance(other, 한랭보기):
+            return self._복사() == other._복사()
+        if isinstance(other, (list, str)):
+            return self._복사() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def index(self, 값):
+        for 위치, 항목 in enumerate(self):
+            if 항목 == 값:
+                return 위치
+        raise ValueError(f"{값!r}이(가) 보기에 없습니다")
+
+    def count(self, 값):
+        return sum(1 for 항목 in self if 항목 == 값)
+
+    def __str__(self):
+        return str(self._복사())
+
+    def __repr__(self):
+        return repr(self._복사())
+
+def _정렬시도(항목들) -> list:
+    """출력을 일정하게 하기 위해 정렬 (비교할 수 없는 값이 섞이면 그대로)"""
+    try:
+        return sorted(항목들)
+    except TypeError:
+        return list(항목들)
+
+class 한랭집합(set):
+    """집합() 결과 - 중복 없는 값 모음 (추가, 제거, 포함 확인이 평균 O(1))
+
+    + 는 합집합, - 는 차집합을 만든다.
+    """
+    __slots__ = ()
+
+    def 추가(self, 값):
+        self.add(값)
+
+    def 제거(self, 값):
+        if 값 not in self:
+            raise ValueError(f"집합에 없는 값입니다: {값!r}")
+        self.remove(값)
+
+    def 빼기(self):
+        if not self:
+            raise ValueError("빈 집합에서 뺄 수 없습니다")
+        return self.pop()
+
+    def 포함(self, 값) -> bool:
+        return 값 in self
+
+    def 합집합(self, 다른) -> '한랭집합':
+        return 한랭집합(set.union(self, 다른))
+
+    def 교집합(self, 다른) -> '한랭집합':
+        return 한랭집합(set.intersection(self, 다른))
+
+    def 차집합(self, 다른) -> '한랭집합':
+        return 한랭집합(set.difference(self, 다른))
+
+    def 부분집합(self, 다른) -> bool:
+        return self.issubset(다른)
+
+    def 비우기(self):
+        self.clear()
+
+    def copy(self) -> '한랭집합':
+        return 한랭집합(self)
+
+    def __add__(self, 다른):
+        if not isinstance(다른, (set, frozenset)):
+            return NotImplemented
+        return self.합집합(다른)
+
+    def __sub__(self, 다른):
+        if not isinstance(다른, (set, frozenset)):
+            return NotImplemented
+        return self.차집합(다른)
+
+    def __repr__(self):
+        if not self:
+            return "집합()"
+        return f"집합({_정렬시도(self)!r})"
+
+class 한랭덱(deque):
+    """덱() 결과 - 맨 앞과 맨 뒤에서 O(1)로 넣고 빼는 큐"""
+    __slots__ = ()
+
+    def 추가(self, 값):
+        self.append(값)
+
+    def 앞에추가(self, 값):
+        self.appendleft(값)
+
+    def 빼기(self, 위치: int = -1):
+        """맨 뒤(-1, 기본) 또는 맨 앞(0)의 값을 빼서 반환"""
+        if not self:
+            raise IndexError("빈 덱에서 뺄 수 없습니다")
+        if 위치 == -1:
+            return self.pop()
+        if 위치 == 0:
+            return self.popleft()
+        raise IndexError("덱은 맨 앞(0)이나 맨 뒤(-1)에서만 뺄 수 있습니다")
+
+    def 앞에서빼기(self):
+        return self.빼기(0)
+
+    def 제거(self, 값):
+        if 값 not in self:
+            raise ValueError(f"덱에 없는 값입니다: {값!r}")
+        self.remove(값)
+
+    def 앞(self):
+        if not self:
+            raise IndexError("빈 덱입니다")
+        return self[0]
+
+    def 뒤(self):
+        if not self:
+            raise IndexError("빈 덱입니다")
+        return self[-1]
+
+    def 포함(self, 값) -> bool:
+        return 값 in self
+
+    def 비우기(self):
+        self.clear()
+
+    def __repr__(self):
+        return f"덱({list(self)!r})"
+
+class 한랭힙:
+    """힙() 결과 - 가장 작은 값을 O(log n)에 넣고 빼는 우선순위 큐
+
+    [우선순위, 값] 리스트를 넣으면 우선순위 순서로 나온다.
+    반복하면 작은 값부터 차례로 나오며 힙은 바뀌지 않는다.
+    """
+    __slots__ = ('항목들',)
+
+    def __init__(self, 항목들=()):
+        self.항목들 = list(항목들)
+        heapq.heapify(self.항목들)
+
+    def 추가(self, 값):
+        heapq.heappush(self.항목들, 값)
+
+    def 빼기(self):
+        if not self.항목들:
+            raise IndexError("빈 힙에서 뺄 수 없습니다")
+        return heapq.heappop(self.항목들)
+
+    def 최소(self):
+        if not self.항목들:
+            raise IndexError("빈 힙입니다")
+        return self.항목들[0]
+
+    def 제거(self, 값):
+        if 값 not in self.항목들:
+            raise ValueError(f"힙에 없는 값입니다: {값!r}")
+        self.항목들.remove(값)
+        heapq.heapify(self.항목들)
+
+    def 포함(self, 값) -> bool:
+        return 값 in self.항목들
+
+    def 비우기(self):
+        self.항목들.clear()
+
+    def copy(self) -> '한랭힙':
+        return 한랭힙(self.항목들)
+
+    def __len__(self):
+        return len(self.항목들)
+
+    def __contains__(self, 값):
+        return 값 in self.항목들
+
+    def __iter__(self):
+        return iter(sorted(self.항목들))
+
+    def __repr__(self):
+        return f"힙({sorted(self.항목들)!r})"
+
+class 한랭정렬된목록:
+    """정렬된목록() 결과 - 넣고 빼도 항상 정렬 상태를 유지하는 목록
+
+    값을 최대 2 * 버킷크기개씩 정렬된 버킷에 나누어 담고 버킷별 최댓값을 따로 두어,
+    넣기/빼기/찾기가 이진 검색 두 번과 버킷 하나 안의 이동으로 끝난다.
+    """
+    __slots__ = ('버킷들', '최대값들', '_길이')
+    버킷크기 = 500
+
+    def __init__(self, 항목들=()):
+        값들 = sorted(항목들)
+        크기 = self.버킷크기
+        self.버킷들 = [값들[i:i + 크기] for i in range(0, len(값들), 크기)]
+        self.최대값들 = [버킷[-1] for 버킷 in self.버킷들]
+        self._길이 = len(값들)
+
+    def 추가(self, 값):
+        if not self.버킷들:
+            self.버킷들.append([값])
+            self.최대값들.append(값)
+            self._길이 = 1
+            return
+        i = bisect.bisect_right(self.최대값들, 값)
+        if i == len(self.버킷들):
+            i -= 1
+        버킷 = self.버킷들[i]
+        bisect.insort_right(버킷, 값)
+        self.최대값들[i] = 버킷[-1]
+        self._길이 += 1
+        if len(버킷) > 2 * self.버킷크기:
+            # 너무 커진 버킷은 반으로 나눔
+            self.버킷들[i:i + 1] = [버킷[:self.버킷크기], 버킷[self.버킷크기:]]
+            self.최대값들[i:i + 1] = [버킷[self.버킷크기 - 1], 버킷[-1]]
+
+    def 제거(self, 값):
+        i = bisect.bisect_left(self.최대값들, 값)
+        if i < len(self.버킷들):
+            버킷 = self.버킷들[i]
+            j = bisect.bisect_left(버킷, 값)
+            if 버킷[j] == 값:
+                self._칸삭제(i, j)
+                return
+        raise ValueError(f"정렬된목록에 없는 값입니다: {값!r}")
+
+    def 빼기(self, 위치: int = -1):
+        """위치(기본은 맨 뒤, 가장 큰 값)의 값을 빼서 반환"""
+        if not self._길이:
+            raise IndexError("빈 정렬된목록에서 뺄 수 없습니다")
+        i, j = self._칸(위치)
+        값 = self.버킷들[i][j]
+        self._칸삭제(i, j)
+        return 값
+
+    def 하한(self, 값) -> int:
+        """값 이상인 첫 항목의 위치"""
+        i = bisect.bisect_left(self.최대값들, 값)
+        if i == len(self.버킷들):
+            return self._길이
+        return self._앞길이(i) + bisect.bisect_left(self.버킷들[i], 값)
+
+    def 상한(self, 값) -> int:
+        """값보다 큰 첫 항목의 위치"""
+        i = bisect.bisect_right(self.최대값들, 값)
+        if i == len(self.버킷들):
+            return self._길이
+        return self._앞길이(i) + bisect.bisect_right(self.버킷들[i], 값)
+
+    def 구간(self, 최소, 최대) -> list:
+        """최소 이상 최대 미만인 값들"""
+        return self[self.하한(최소):self.하한(최대)]
+
+    def 포함(self, 값) -> bool:
+        return 값 in self
+
+    def 비우기(self):
+        self.버킷들: List[list] = []
+        self.최대값들: list = []
+        self._길이 = 0
+
+    def copy(self) -> '한랭정렬된목록':
+        return 한랭정렬된목록(self)
+
+    def index(self, 값) -> int:
+        위치 = self.하한(값)
+        if 위치 < self._길이 and self[위치] == 값:
+            return 위치
+        raise ValueError(f"정렬된목록에 없는 값입니다: {값!r}")
+
+    def count(self, 값) -> int:
+        return self.상한(값) - self.하한(값)
+
+    def _앞길이(self, 버킷번호: int) -> int:
+        return sum(len(버킷) for 버킷 in self.버킷들[:버킷번호])
+
+    def _칸(self, 위치: int):
+        """전체 위치(음수 허용)를 (버킷 번호, 버킷 안 위치)로 변환"""
+        if 위치 < 0:
+            위치 += self._길이
+        if not 0 <= 위치 < self._길이:
+            raise IndexError("정렬된목록 인덱스가 범위를 벗어났습니다")
+        for i, 버킷 in enumerate(self.버킷들):
+            if 위치 < len(버킷):
+                return i, 위치
+            위치 -= len(버킷)
+
+    def _칸삭제(self, i: int, j: int):
+        버킷 = self.버킷들[i]
+        del 버킷[j]
+        self._길이 -= 1
+        if 버킷:
+            self.최대값들[i] = 버킷[-1]
+        else:
+            del self.버킷들[i]
+            del self.최대값들[i]
+
+    def __len__(self):
+        return self._길이
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.버킷들)
+
+    def __reversed__(self):
+        return itertools.chain.from_iterable(map(reversed, reversed(self.버킷들)))
+
+    def __contains__(self, 값):
+        i = bisect.bisect_left(self.최대값들, 값)
+        if i == len(self.버킷들):
+            return False
+        버킷 = self.버킷들[i]
+        return 버킷[bisect.bisect_left(버킷, 값)] == 값
+
+    def __getitem__(self, 인덱스):
+        if isinstance(인덱스, slice):
+            return list(self)[인덱스]
+        i, j = self._칸(인덱스)
+        return self.버킷들[i][j]
+
+    def __eq__(self, other):
+        if isinstance(other, (한랭정렬된목록, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"정렬된목록({list(self)!r})"
+
+def _이진검색(목록, 값) -> int:
+    """정렬된 목록에서 값의 위치 (없으면 -1)"""
+    위치 = _하한(목록, 값)
+    return 위치 if 위치 < len(목록) and 목록[위치] == 값 else -1
+
+def _하한(목록, 값) -> int:
+    if isinstance(목록, 한랭정렬된목록):
+        return 목록.하한(값)
+    return bisect.bisect_left(목록, 값)
+
+def _상한(목록, 값) -> int:
+    if isinstance(목록, 한랭정렬된목록):
+        return 목록.상한(값)
+    return bisect.bisect_right(목록, 값)
+
+class 한랭배열:
+    """배열() 결과 - 수를 담아 +, -, *, /, **, 비교를 원소별로 한 번에 계산하는 배열
+
+    NumPy가 설치되어 있으면 numpy 배열에, 없으면 파이썬 리스트에 값을 담는다.
+    어느 쪽이든 한랭 코드에서 보이는 동작과 출력은 같다.
+    """
+    __slots__ = ('값',)
+
+    def __init__(self, 값):
+        self.값 = 값  # numpy 배열 또는 리스트
+
+    @staticmethod
+    def 만들기(항목들) -> '한랭배열':
+        값들 = list(항목들.목록() if isinstance(항목들, 한랭배열) else 항목들)
+        return 한랭배열(np.array(값들) if np is not None else 값들)
+
+    @staticmethod
+    def 영(개수: int) -> '한랭배열':
+        개수 = int(개수)
+        return 한랭배열(np.zeros(개수) if np is not None else [0.0] * 개수)
+
+    @staticmethod
+    def 범위(시작, 끝=None, 간격=1) -> '한랭배열':
+        if 끝 is None:
+            시작, 끝 = 0, 시작
+        if np is not None:
+            return 한랭배열(np.arange(시작, 끝, 간격))
+        if all(isinstance(값, int) for 값 in (시작, 끝, 간격)):
+            return 한랭배열(list(range(시작, 끝, 간격)))
+        개수 = max(0, math.ceil((끝 - 시작) / 간격))
+        return 한랭배열([시작 + i * 간격 for i in range(개수)])
+
+    def 목록(self) -> list:
+        return self.값.tolist() if np is not None else list(self.값)
+
+    def _연산(self, 다른, 연산: Callable) -> '한랭배열':
+        if isinstance(다른, (한랭배열, list)):
+            오른쪽 = 다른.값 if isinstance(다른, 한랭배열) else 다른
+            if len(오른쪽) != len(self.값):
+                raise 런타임에러(f"배열 길이가 다릅니다: {len(self.값)}, {len(오른쪽)}")
+            if np is not None:
+                return 한랭배열(연산(self.값, np.asarray(오른쪽)))
+            return 한랭배열([연산(a, b) for a, b in zip(self.값, 오른쪽)])
+        if np is not None:
+            return 한랭배열(연산(self.값, 다른))
+        return 한랭배열([연산(a, 다른) for a in self.값])
+
+    def _반대연산(self, 다른, 연산: Callable) -> '한랭배열':
+        return self._연산(다른, lambda a, b: 연산(b, a))
+
+    def __add__(self, 다른): return self._연산(다른, operator.add)
+    def __radd__(self, 다른): return self._반대연산(다른, operator.add)
+    def __sub__(self, 다른): return self._연산(다른, operator.sub)
+    def __rsub__(self, 다른): return self._반대연산(다른, operator.sub)
+    def __mul__(self, 다른): return self._연산(다른, operator.mul)
+    def __rmul__(self, 다른): return self._반대연산(다른, operator.mul)
+    def __mod__(self, 다른): return self._연산(다른, operator.mod)
+    def __pow__(self, 다른): return self._연산(다른, operator.pow)
+    def __rpow__(self, 다른): return self._반대연산(다른, operator.pow)
+    def __eq__(self, 다른): return self._연산(다른, operator.eq)
+    def __ne__(self, 다른): return self._연산(다른, operator.ne)
+    def __lt__(self, 다른): return self._연산(다른, operator.lt)
+    def __le__(self, 다른): return self._연산(다른, operator.le)
+    def __gt__(self, 다른): return self._연산(다른, operator.gt)
+    def __ge__(self, 다른): return self._연산(다른, operator.ge)
+
+    def __truediv__(self, 다른):
+        self._영확인(다른)
+        return self._연산(다른, operator.truediv)
+
+    def __rtruediv__(self, 다른):
+        self._영확인(self)
+        return self._반대연산(다른, operator.truediv)
+
+    @staticmethod
+    def _영확인(나누는수):
+        """스칼라 나눗셈처럼 0으로 나누면 오류 (NumPy의 inf 대신)"""
+        if isinstance(나누는수, 한랭배열):
+            있음 = bool((나누는수.값 == 0).any()) if np is not None else 0 in 나누는수.값
+        elif isinstance(나누는수, list):
+            있음 = 0 in 나누는수
+        else:
+            있음 = 나누는수 == 0
+        if 있음:
+            raise 런타임에러("0으로 나눌 수 없습니다")
+
+    def __neg__(self):
+        return 한랭배열(-self.값 if np is not None else [-a for a in self.값])
+
+    __hash__ = None
+
+    def __bool__(self):
+        if len(self.값) > 1:
+            raise 런타임에러("원소가 여러 개인 배열은 참/거짓으로 쓸 수 없습니다")
+        return bool(len(self.값)) and bool(self.값[0])
+
+    def __len__(self):
+        return len(self.값)
+
+    def __iter__(self):
+        return iter(self.목록())
+
+    def __contains__(self, 값):
+        return 값 in self.목록()
+
+    def __getitem__(self, 인덱스):
+        if isinstance(인덱스, slice):
+            # NumPy에서는 복사 없이 같은 메모리를 가리킴
+            return 한랭배열(self.값[인덱스])
+        값 = self.값[인덱스]
+        return 값.item() if np is not None else 값
+
+    def __setitem__(self, 인덱스, 값):
+        if isinstance(인덱스, slice):
+            값 = list(값)
+        self.값[인덱스] = 값
+
+    # 합계/최대값/최소값/정렬/제곱근 내장 함수가 배열에 쓰는 원소별 버전
+    def 합계(self):
+        return self.값.sum().item() if np is not None else sum(self.값)
+
+    def 최대(self):
+        if not len(self.값):
+            raise 런타임에러("빈 배열의 최대값은 없습니다")
+        return self.값.max().item() if np is not None else max(self.값)
+
+    def 최소(self):
+        if not len(self.값):
+            raise 런타임에러("빈 배열의 최소값은 없습니다")
+        return self.값.min().item() if np is not None else min(self.값)
+
+    def 정렬(self, 역순: bool = False) -> '한랭배열':
+        if np is not None:
+            정렬됨 = np.sort(self.값)
+            return 한랭배열(정렬됨[::-1] if 역순 else 정렬됨)
+        return 한랭배열(sorted(self.값, reverse=역순))
+
+    def 제곱근(self) -> '한랭배열':
+        if np is not None:
+            if (self.값 < 0).any():
+                raise 런타임에러("음수의 제곱근은 계산할 수 없습니다")
+            return 한랭배열(np.sqrt(self.값))
+        return 한랭배열([math.sqrt(a) for a in self.값])
+
+    def __repr__(self):
+        return f"배열({self.목록()!r})"
+
+class 한랭파일:
+    """파일열기() 결과 - '읽기', '쓰기', '추가' 모드로 연 파일
+
+    읽기 모드는 바이트로 읽어 줄마다 UTF-8로 바꾸며, 큰 파일은 mmap으로 열어
+    운영체제 페이지 캐시에서 바로 읽는다. 쓰기/추가 모드는 버퍼에 모았다가 버퍼가 차거나 닫을 때 기록한다.
+    """
+    __slots__ = ('경로', '모드', '_파일', '_원본', '_닫을때')
+
+    _모드들 = {'읽기': 'rb', '쓰기': 'w', '추가': 'a'}
+
+    def __init__(self, 경로: str, 모드: str, 버퍼크기: int, mmap최소크기: int,
+                 실제경로: Optional[str] = None, 닫을때: Optional[Callable[['한랭파일'], None]] = None):
+        실제경로 = 실제경로 or 경로  # 경로는 오류 메시지에 쓰는 프로그램이 적은 경로
+        if 모드 not in self._모드들:
+            raise 런타임에러(f"알 수 없는 파일 모드: {모드} ('읽기', '쓰기', '추가' 중 하나)")
+        self.경로 = 경로
+        self.모드 = 모드
+        self._닫을때 = 닫을때
+        try:
+            if 모드 == '읽기':
+                self._파일 = open(실제경로, 'rb', buffering=버퍼크기)
+                self._원본 = self._파일
+                if os.fstat(self._파일.fileno()).st_size >= max(mmap최소크기, 1):
+                    self._원본 = mmap.mmap(self._파일.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._파일 = open(실제경로, self._모드들[모드], encoding='utf-8', buffering=버퍼크기)
+                self._원본 = self._파일
+        except OSError as e:
+            raise 런타임에러(f"파일을 열 수 없습니다: {경로} ({e.strerror})")
+
+    def _모드확인(self, *모드들: str):
+        if self._파일.closed:
+            raise 런타임에러(f"닫힌 파일입니다: {self.경로}")
+        if self.모드 not in 모드들:
+            raise 런타임에러(f"'{self.모드}' 모드로 연 파일입니다: {self.경로}")
+
+    def _문자열(self, 바이트: bytes) -> str:
+        try:
+            return 바이트.decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise 런타임에러(f"UTF-8 파일이 아닙니다: {self.경로} ({e.reason})")
+
+    def 읽기(self) -> str:
+        """남은 내용 전체 (줄바꿈은 줄읽기처럼 \\n으로 통일)"""
+        self._모드확인('읽기')
+        내용 = self._원본.read()
+        if b'\r\n' in 내용:
+            내용 = 내용.replace(b'\r\n', b'\n')
+        return self._문자열(내용)
+
+    def 줄읽기(self) -> Optional[str]:
+        """다음 한 줄 (줄바꿈 제외, 파일 끝이면 없음)"""
+        self._모드확인('읽기')
+        줄 = self._원본.readline()
+        if not 줄:
+            return None
+        if 줄.endswith(b'\n'):
+            줄 = 줄[:-2] if 줄.endswith(b'\r\n') else 줄[:-1]
+        return self._문자열(줄)
+
+    def _원줄들(self) -> Iterator[str]:
+        """줄바꿈을 남긴 줄들 (따옴표 안 줄바꿈을 직접 다루는 CSV 파서용)"""
+        self._모드확인('읽기')
+        for 줄 in iter(self._원본.readline, b''):
+            yield self._문자열(줄)
+
+    def _쓰기대상(self):
+        """csv/json 모듈이 직접 쓰는 텍스트 스트림"""
+        self._모드확인('쓰기', '추가')
+        return self._파일
+
+    def 쓰기(self, *값들) -> '한랭파일':
+        self._모드확인('쓰기', '추가')
+        for 값 in 값들:
+            self._파일.write(str(값))
+        return self
+
+    def 닫기(self) -> None:
+        if self._원본 is not self._파일:
+            self._원본.close()
+        self._파일.close()
+        if self._닫을때 is not None:
+            self._닫을때(self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        줄 = self.줄읽기()
+        if 줄 is None:
+            raise StopIteration
+        return 줄
+
+    def __repr__(self):
+        return f"<파일 {self.경로} ({self.모드}{', 닫힘' if self._파일.closed else ''})>"
+
+class 한랭정규식:
+    """정규식컴파일() 결과 - 컴파일한 정규식 (정규식 함수의 패턴 자리에 그대로 넘김)"""
+    __slots__ = ('패턴',)
+
+    def __init__(self, 패턴: 're.Pattern'):
+        self.패턴 = 패턴
+
+    def 일치(self, 문자열: str) -> Optional[list]:
+        """처음 일치한 [전체, 그룹1, 그룹2, ...] (없으면 없음)"""
+        return _일치목록(self.패턴.search(문자열))
+
+    def 찾기모두(self, 문자열: str) -> list:
+        """겹치지 않는 모든 일치 (그룹이 둘 이상이면 일치마다 그룹 리스트)"""
+        return [list(값) if isinstance(값, tuple) else 값 for 값 in self.패턴.findall(문자열)]
+
+    def 교체(self, 문자열: str, 바꿀것, 횟수: int = 0) -> str:
+        return self.패턴.sub(바꿀것, 문자열, count=횟수)
+
+    def 분리(self, 문자열: str, 횟수: int = 0) -> list:
+        return self.패턴.split(문자열, maxsplit=횟수)
+
+    def __repr__(self):
+        return f"정규식({self.패턴.pattern!r})"
+
+def _일치목록(일치: Optional['re.Match']) -> Optional[list]:
+    if 일치 is None:
+        return None
+    return [일치.group(0), *일치.groups()]
+
+def _정규식컴파일(패턴: str) -> 한랭정규식:
+    if not isinstance(패턴, str):
+        raise 런타임에러(f"정규식 패턴은 문자열이어야 합니다: {패턴}")
+    try:
+        return 한랭정규식(re.compile(패턴))
+    except re.error as e:
+        raise 런타임에러(f"정규식 오류: {패턴!r} ({e})")
+
+def _CSV행들(파일: 한랭파일, 머리줄: bool, 구분자: str) -> Iterator[Any]:
+    """CSV 행을 하나씩 (머리줄이 있으면 첫 행을 키로 하는 딕셔너리, 없으면 문자열 리스트)"""
+    읽기 = (csv.DictReader if 머리줄 else csv.reader)(파일._원줄들(), delimiter=구분자)
+    try:
+        yield from 읽기
+    except csv.Error as e:
+        raise 런타임에러(f"CSV 오류 ({파일.경로} {읽기.line_num}번째 줄): {e}")
+
+def _CSV쓰기(파일: 한랭파일, 행들, 머리줄=None) -> None:
+    """행들을 CSV로 씀 (딕셔너리 행은 머리줄 또는 첫 행의 키 순서로, 레코드 행은 필드 순서로)"""
+    행들 = iter(행들)
+    첫행 = next(행들, None)
+    if 첫행 is None:
+        if 머리줄 is not None:
+            csv.writer(파일._쓰기대상(), lineterminator='\n').writerow(머리줄)
+        return
+    행들 = itertools.chain((첫행,), 행들)
+    if isinstance(첫행, dict):
+        쓰기 = csv.DictWriter(파일._쓰기대상(), list(머리줄 or 첫행), lineterminator='\n')
+        쓰기.writeheader()
+    else:
+        쓰기 = csv.writer(파일._쓰기대상(), lineterminator='\n')
+        if 머리줄 is None and isinstance(첫행, 한랭레코드):
+            머리줄 = 첫행._필드들  # 딕셔너리 행처럼 필드 이름을 머리줄로
+        if 머리줄 is not None:
+            쓰기.writerow(머리줄)
+    쓰기.writerows(행들)
+
+def _JSON값(파일: 한랭파일) -> Any:
+    try:
+        return json.loads(파일.읽기())
+    except json.JSONDecodeError as e:
+        raise 런타임에러(f"JSON 오류 ({파일.경로}): {e}")
+
+def _JSON줄값들(파일: 한랭파일) -> Iterator[Any]:
+    """JSON Lines 파일의 값을 한 줄씩 (빈 줄은 건너뜀)"""
+    for 번호, 줄 in enumerate(파일, 1):
+        if not 줄.strip():
+            continue
+        try:
+            yield json.loads(줄)
+        except json.JSONDecodeError as e:
+            raise 런타임에러(f"JSON 오류 ({파일.경로} {번호}번째 줄): {e}")
+
+def _JSON기본값(값: Any) -> Any:
+    """json 모듈이 모르는 한랭 값 변환 (인스턴스는 필드 딕셔너리, 모음은 리스트)"""
+    if isinstance(값, 한랭인스턴스):
+        return _레코드풀기(값.필드들)
+    if isinstance(값, 한랭배열):
+        return 값.목록()
+    if isinstance(값, (한랭범위, 한랭보기, 한랭집합, 한랭덱, 한랭힙, 한랭정렬된목록)):
+        return _레코드풀기(list(값))
+    raise TypeError(f"JSON으로 바꿀 수 없는 값입니다: {type(값).__name__}")
+
+def _레코드풀기(값: Any) -> Any:
+    """레코드를 필드 딕셔너리로 바꾼 값
+
+    json 모듈은 튜플 하위 클래스인 레코드를 default를 부르지 않고 배열로 쓰므로 미리 바꾼다.
+    """
+    if isinstance(값, 한랭레코드):
+        return {필드: _레코드풀기(항목) for 필드, 항목 in zip(값._필드들, 값)}
+    if isinstance(값, (list, tuple)):
+        return [_레코드풀기(항목) for 항목 in 값]
+    if isinstance(값, dict):
+        return {키: _레코드풀기(항목) for 키, 항목 in 값.items()}
+    return 값
+
+def _JSON쓰기(파일: 한랭파일, 값: Any, 들여쓰기: Optional[int] = None) -> None:
+    if 한랭레코드.__subclasses__():  # 레코드형이 하나라도 있을 때만 값 전체를 훑음
+        값 = _레코드풀기(값)
+    # dumps는 들여쓰기가 없으면 C 인코더로 한 번에 만든다 (dump는 조각마다 파이썬에서 씀)
+    파일._쓰기대상().write(json.dumps(값, ensure_ascii=False, indent=들여쓰기, default=_JSON기본값))
+
 class Environment:
     """변수 환경 (스코프)"""
+    __slots__ = ('variables', 'constants', 'parent', 'cells')
+
     def __init__(self, parent: Optional['Environment'] = None):
         self.variables: Dict[str, Any] = {}
         self.constants: set = set()
         self.parent = parent
+        # 클로저가 캡처한 변수는 variables 대신 셀에 보관
+        self.cells: Optional[Dict[str, 셀]] = None
 
     def define(self, name: str, value: Any, is_constant: bool = False):
-        self.variables[name] = value
+        if self.cells is not None and name in self.cells:
+            self.cells[name].값 = value
+        else:
+            self.variables[name] = value
         if is_constant:
             self.constants.add(name)
 
     def get(self, name: str) -> Any:
         if name in self.variables:
-            return self.variables[name]
-        if self.parent:
+            값 = self.variables[name]
+        elif self.cells is not None and name in self.cells:
+            값 = self.cells[name].값
+        elif self.parent:
             return self.parent.get(name)
-        raise 런타임에러(f"정의되지 않은 변수: {name}")
+        else:
+            raise 런타임에러(f"정의되지 않은 변수: {name}")
+        if type(값) is 문자열로프:
+            return 값.완성()
+        return 값
 
     def set(self, name: str, value: Any):
         if name in self.variables:
@@ -99,29 +1168,159 @@ class Environment:
                 raise 런타임에러(f"상수는 변경할 수 없습니다: {name}")
             self.variables[name] = value
             return
+        if self.cells is not None and name in self.cells:
+            if name in self.constants:
+                raise 런타임에러(f"상수는 변경할 수 없습니다: {name}")
+            self.cells[name].값 = value
+            return
         if self.parent:
             self.parent.set(name, value)
             return
         raise 런타임에러(f"정의되지 않은 변수: {name}")
 
+    def append_str(self, name: str, value: str) -> bool:
+        """문자열 변수 뒤에 value를 복사 없이 이어 붙임 (변수가 문자열이 아니면 False)"""
+        if name in self.variables:
+            if name in self.constants:
+                raise 런타임에러(f"상수는 변경할 수 없습니다: {name}")
+            새값 = _이어붙인값(self.variables[name], value)
+            if 새값 is None:
+                return False
+            self.variables[name] = 새값
+            return True
+        if self.cells is not None and name in self.cells:
+            if name in self.constants:
+                raise 런타임에러(f"상수는 변경할 수 없습니다: {name}")
+            새값 = _이어붙인값(self.cells[name].값, value)
+            if 새값 is None:
+                return False
+            self.cells[name].값 = 새값
+            return True
+        if self.parent:
+            return self.parent.append_str(name, value)
+        raise 런타임에러(f"정의되지 않은 변수: {name}")
+
     def exists(self, name: str) -> bool:
         if name in self.variables:
             return True
+        if self.cells is not None and name in self.cells:
+            return True
         if self.parent:
             return self.parent.exists(name)
         return False
 
+    def capture(self, name: str, create: bool = False) -> Optional[셀]:
+        """이 스코프에 있는 변수를 셀로 옮겨 반환 (없으면 None, create면 빈 셀 생성)"""
+        if self.cells is not None and name in self.cells:
+            return self.cells[name]
+        if name in self.variables:
+            칸 = 셀(self.variables.pop(name))
+        elif create:
+            칸 = 셀()
+        else:
+            return None
+        if self.cells is None:
+            self.cells = {}
+        self.cells[name] = 칸
+        return 칸
+
+
+# 속성접근으로 꺼낼 수 없는 파이썬 내장 속성 (형식 문자열로 내부 속성에 닿을 수 있음)
+_숨긴속성들 = frozenset({'format', 'format_map'})
+
+# 타입()이 내부 구현 클래스 이름 대신 돌려줄 이름 (만드는 내장 함수 이름)
+# 범위는 원래 리스트를 만들었으므로 계속 list로 보인다.
+_타입이름들 = {
+    한랭범위: 'list', 한랭보기: '보기', 한랭문자열빌더: '문자열빌더', 한랭집합: '집합', 한랭덱: '덱',
+    한랭힙: '힙', 한랭정렬된목록: '정렬된목록', 한랭배열: '배열', 한랭파일: '파일', 한랭정규식: '정규식',
+    한랭생성기: '생성기',
+}
+
 
 class HanlangInterpreter:
     """한랭 인터프리터"""
 
+    # 최적화기가 사용하는 내장 함수 순도 정보
+    # '순수': 부작용이 없고 스칼라 인자만 읽으며 스칼라를 반환
+    # '읽기': 부작용은 없지만 인자로 받은 컬렉션의 내용을 읽음
+    # '변경': 첫 번째 인자(컬렉션)를 변경함
+    내장함수순도: Dict[str, str] = {
+        '길이': '읽기', '정수변환': '순수', '실수변환': '순수', '문자열변환': '읽기',
+        '타입': '순수', '절대값': '순수', '합계': '읽기', '포함': '읽기',
+        '제곱근': '읽기', '거듭제곱': '순수', '올림': '순수', '내림': '순수', '반올림': '순수',
+        '사인': '순수', '코사인': '순수', '탄젠트': '순수',
+        '아크사인': '순수', '아크코사인': '순수', '아크탄젠트': '순수',
+        '로그': '순수', '로그10': '순수',
+        '대문자': '순수', '소문자': '순수', '결합': '읽기', '교체': '순수',
+        '공백제거': '순수', '왼쪽공백제거': '순수', '오른쪽공백제거': '순수',
+        '찾기': '순수', '시작확인': '순수', '끝확인': '순수',
+        '채우기': '순수', '왼쪽채우기': '순수', '오른쪽채우기': '순수',
+        '인덱스': '읽기', '개수': '읽기', '이진검색': '읽기', '하한': '읽기', '상한': '읽기',
+        '추가': '변경', '제거': '변경', '삽입': '변경', '빼기': '변경', '비우기': '변경',
+    }
+
+    # 식 컴파일에 쓰는 연산자 (execute_이항연산과 같은 의미인 것만)
+    컴파일연산자들: Dict[str, Callable[[Any, Any], Any]] = {
+        '+': operator.add, '-': operator.sub, '*': operator.mul,
+        '%': operator.mod, '**': operator.pow,
+        '==': operator.eq, '!=': operator.ne, '<': operator.lt, '>': operator.gt,
+        '<=': operator.le, '>=': operator.ge, '안에': lambda a, b: a in b,
+    }
+
+    # 재사용을 위해 보관하는 Environment의 최대 개수
+    환경풀_최대크기 = 256
+
+    # 크기를 적지 않은 기억 함수가 기억하는 결과의 최대 개수
+    기억_기본크기 = 1024
+
+    # 병렬맵 작업자 프로세스 수 (None이면 CPU 개수)
+    병렬_작업자수: Optional[int] = None
+
+    # 비동기 실행이 이벤트 루프에 차례를 넘기기 전까지 연달아 실행하는 문장 수
+    비동기_쉬기간격 = 1000
+
+    # 파일 읽기/쓰기 버퍼 크기와, 이 크기 이상인 파일은 mmap으로 읽음
+    파일_버퍼크기 = 1 << 16
+    파일_mmap최소크기 = 1 << 20
+
+    # 인터프리터마다 컴파일한 정규식을 보관하는 LRU 캐시 크기
+    정규식_캐시크기 = 256
+
     def __init__(self, output_callback: Callable[[str], None] = None,
-                 input_callback: Callable[[str], str] = None):
+                 input_callback: Callable[[str], str] = None,
+                 최적화: bool = True,
+                 async_input_callback: Callable[[str], Awaitable[str]] = None,
+                 async_output_callback: Callable[[str], Awaitable[None]] = None,
+                 허용경로들: Optional[Iterable[str]] = None):
         self.global_env = Environment()
         self.output_callback = output_callback or print
         self.input_callback = input_callback or input
+        # 비동기 입출력을 주면 프로그램은 항상 이벤트 루프에서 실행되고 동기 콜백 대신 쓰인다.
+        # 출력은 대기열에 모았다가 실행이 멈출 때마다 순서대로 보낸다.
+        self.async_input_callback = async_input_callback
+        self.async_output_callback = async_output_callback
+        self._출력대기열: Deque[str] = deque()
+        self._출력잠금: Optional[asyncio.Lock] = None
+        self._쉬기까지 = self.비동기_쉬기간격
+        self._쉬기허용 = False  # _코루틴실행이 실행 생성기를 진행시키는 동안만 참
+        if async_output_callback is not None:
+            self.output_callback = self._출력대기열.append
+        if async_input_callback is not None:
+            self.input_callback = self._동기입력불가
         self.output_buffer: List[str] = []
+        self.최적화 = 최적화
+        self.최적화보고 = 최적화보고()
+        self._환경풀: List[Environment] = []
+        # 살아 있는 기억 함수의 약한 참조 -> (이름, 캐시), 사라진 함수의 이름별 (적중, 실패) 합계
+        self._기억함수들: Dict[weakref.ref, Tuple[str, Callable]] = {}
+        self._사라진기억통계: Dict[str, List[int]] = {}
+        # 파일 함수는 호스트가 허용한 디렉터리 안에서만 쓸 수 있음 (상대 경로는 첫 디렉터리 기준)
+        self.허용경로들: Tuple[str, ...] = tuple(os.path.realpath(경로) for 경로 in 허용경로들 or ())
+        self._열린파일들: Set[한랭파일] = set()
+        self._정규식캐시 = functools.lru_cache(maxsize=self.정규식_캐시크기)(_정규식컴파일)
         self._setup_builtins()
+        # 작업자 프로세스에도 있으므로 병렬맵이 보내지 않는 내장 값들
+        self._내장값들 = dict(self.global_env.variables)
 
     def _setup_builtins(self):
         """내장 함수 설정"""
@@ -130,20 +1329,40 @@ class HanlangInterpreter:
         self.global_env.define('정수변환', lambda x: int(x))
         self.global_env.define('실수변환', lambda x: float(x))
         self.global_env.define('문자열변환', lambda x: str(x))
-        self.global_env.define('타입', lambda x: type(x).__name__)
-        self.global_env.define('범위', lambda *args: list(range(*args)))
+        self.global_env.define('타입', lambda x: _타입이름들.get(type(x), type(x).__name__))
+        self.global_env.define('범위', lambda *args: 한랭범위(range(*args)))
+        self.global_env.define('목록으로', lambda x: list(x))
+        self.global_env.define('보기', lambda x, start=0, end=None: 한랭보기(x, start, end))
         self.global_env.define('절대값', lambda x: abs(x))
-        self.global_env.define('최대값', lambda *args: max(args) if len(args) > 1 else max(args[0]))
-        self.global_env.define('최소값', lambda *args: min(args) if len(args) > 1 else min(args[0]))
-        self.global_env.define('합계', lambda x: sum(x))
-        self.global_env.define('정렬', lambda x: sorted(x))
+        self.global_env.define('최대값', lambda *args: self._키로고르기(max, args))
+        self.global_env.define('최소값', lambda *args: self._키로고르기(min, args))
+        self.global_env.define('합계', lambda x: x.합계() if isinstance(x, 한랭배열) else sum(x))
+        self.global_env.define('정렬', lambda x, key=None, reverse=False: (
+            x.정렬(bool(reverse)) if isinstance(x, 한랭배열) and key is None else sorted(
+                x, key=None if key is None else self._파이썬함수(key, 1), reverse=bool(reverse))))
+
+        # 고차 함수 (한랭 함수/람다를 인자로 받음)
+        self.global_env.define('맵', lambda x, f: list(map(self._파이썬함수(f, 1), x)))
+        self.global_env.define('필터', lambda x, f: list(filter(self._파이썬함수(f, 1), x)))
+        self.global_env.define('줄이기', lambda x, f, *초기값: functools.reduce(
+            self._파이썬함수(f, 2), x, *초기값))
+        self.global_env.define('병렬맵', lambda x, f, 묶음크기=None: self._병렬맵(x, f, 묶음크기))
+
+        # 비동기 (비동기 함수 안이나 기다리기를 쓰는 프로그램에서 사용)
+        self.global_env.define('작업시작', lambda 대상: asyncio.ensure_future(
+            대상, loop=self._실행중루프('작업시작')))
+        self.global_env.define('모두기다리기', lambda 대상들: (
+            self._실행중루프('모두기다리기') and asyncio.gather(*대상들)))
+        self.global_env.define('잠자기', lambda 초: asyncio.sleep(초))
         self.global_env.define('뒤집기', lambda x: list(reversed(x)) if isinstance(x, list) else x[::-1])
-        self.global_env.define('추가', lambda lst, item: lst.append(item) or lst)
-        self.global_env.define('제거', lambda lst, item: lst.remove(item) or lst)
+        self.global_env.define('추가', lambda lst, item: (
+            lst.append(item) if isinstance(lst, list) else lst.추가(item)) or lst)
+        self.global_env.define('제거', lambda lst, item: (
+            lst.remove(item) if isinstance(lst, list) else lst.제거(item)) or lst)
         self.global_env.define('포함', lambda container, item: item in container)
 
         # 수학 함수
-        self.global_env.define('제곱근', lambda x: math.sqrt(x))
+        self.global_env.define('제곱근', lambda x: x.제곱근() if isinstance(x, 한랭배열) else math.sqrt(x))
         self.global_env.define('거듭제곱', lambda x, y: math.pow(x, y))
         self.global_env.define('올림', lambda x: math.ceil(x))
         self.global_env.define('내림', lambda x: math.floor(x))
@@ -174,7 +1393,8 @@ class HanlangInterpreter:
         self.global_env.define('찾기', lambda s, sub: s.find(sub))
         self.global_env.define('시작확인', lambda s, prefix: s.startswith(prefix))
         self.global_env.define('끝확인', lambda s, suffix: s.endswith(suffix))
-        self.global_env.define('자르기', lambda s, start=0, end=None: s[start:end] if end else s[start:])
+        self.global_env.define('문자열빌더', lambda *조각들: 한랭문자열빌더(*조각들))
+        self.global_env.define('자르기', lambda s, start=0, end=None: s[start:end])
         self.global_env.define('반복문자', lambda s, n: s * n)
         self.global_env.define('채우기', lambda s, width, char=' ': s.center(width, char))
         self.global_env.define('왼쪽채우기', lambda s, width, char=' ': s.ljust(width, char))
@@ -188,15 +1408,106 @@ class HanlangInterpreter:
 
         # 리스트 함수 추가
         self.global_env.define('삽입', lambda lst, i, item: lst.insert(i, item) or lst)
-        self.global_env.define('빼기', lambda lst, i=-1: lst.pop(i))
+        # 리스트와 딕셔너리(빼기(딕셔너리, 키))는 pop, 집합/덱/힙/정렬된목록은 각자의 빼기
+        self.global_env.define('빼기', lambda lst, *위치: (
+            lst.빼기(*위치) if isinstance(lst, (한랭집합, 한랭덱, 한랭힙, 한랭정렬된목록)) else lst.pop(*위치)))
         self.global_env.define('인덱스', lambda lst, item: lst.index(item))
         self.global_env.define('개수', lambda lst, item: lst.count(item))
         self.global_env.define('복사', lambda x: x.copy() if hasattr(x, 'copy') else list(x))
-        self.global_env.define('비우기', lambda lst: lst.clear() or lst)
+        self.global_env.define('비우기', lambda lst: (
+            lst.clear() if isinstance(lst, (list, dict)) else lst.비우기()) or lst)
+
+        # 자료구조
+        self.global_env.define('집합', lambda x=(): 한랭집합(x))
+        self.global_env.define('덱', lambda x=(): 한랭덱(x))
+        self.global_env.define('힙', lambda x=(): 한랭힙(x))
+        self.global_env.define('정렬된목록', lambda x=(): 한랭정렬된목록(x))
+        self.global_env.define('배열', lambda x=(): 한랭배열.만들기(x))
+        self.global_env.define('영배열', 한랭배열.영)
+        self.global_env.define('범위배열', 한랭배열.범위)
+        self.global_env.define('이진검색', _이진검색)
+        self.global_env.define('하한', _하한)
+        self.global_env.define('상한', _상한)
+
+        # 파일 (허용경로들 안에서만)
+        self.global_env.define('파일열기', lambda 경로, 모드='읽기': self._파일열기(경로, 모드))
+        self.global_env.define('줄들', lambda 대상: self._파일반복('줄들', 대상, iter))
+        self.global_env.define('전체읽기', lambda 대상: self._파일로(대상, '읽기', 한랭파일.읽기))
+        self.global_env.define('파일쓰기', lambda 대상, *값들: self._파일로(대상, '쓰기', 한랭파일.쓰기, 값들))
+        self.global_env.define('추가쓰기', lambda 대상, *값들: self._파일로(대상, '추가', 한랭파일.쓰기, 값들))
+        self.global_env.define('닫기', lambda 파일: 파일.닫기())
+
+        # CSV / JSON (파싱은 표준 라이브러리의 C 구현이 함)
+        self.global_env.define('CSV읽기', lambda 대상, 머리줄=False, 구분자=',': self._파일반복(
+            'CSV읽기', 대상, lambda 파일: _CSV행들(파일, bool(머리줄), 구분자)))
+        self.global_env.define('CSV쓰기', lambda 대상, 행들, 머리줄=None: self._파일로(
+            대상, '쓰기', _CSV쓰기, (행들, 머리줄)))
+        self.global_env.define('JSON읽기', lambda 대상: self._파일로(대상, '읽기', _JSON값))
+        self.global_env.define('JSON쓰기', lambda 대상, 값, 들여쓰기=None: self._파일로(
+            대상, '쓰기', _JSON쓰기, (값, 들여쓰기)))
+        self.global_env.define('JSON줄들', lambda 대상: self._파일반복('JSON줄들', 대상, _JSON줄값들))
+
+        # 정규식 (패턴 문자열은 컴파일 결과를 캐시에서 찾고, 정규식컴파일 결과는 그대로 사용)
+        self.global_env.define('정규식컴파일', lambda 패턴: self._정규식(패턴))
+        self.global_env.define('정규식일치', lambda 패턴, 문자열: self._정규식(패턴).일치(문자열))
+        self.global_env.define('정규식찾기모두', lambda 패턴, 문자열: self._정규식(패턴).찾기모두(문자열))
+        self.global_env.define('정규식교체', lambda 패턴, 문자열, 바꿀것, 횟수=0: self._정규식(패턴).교체(
+            문자열, 바꿀것 if isinstance(바꿀것, str) else self._일치함수(바꿀것), 횟수))
+        self.global_env.define('정규식분리', lambda 패턴, 문자열, 횟수=0: self._정규식(패턴).분리(문자열, 횟수))
 
     def run(self, source: str) -> Any:
-        """소스 코드 실행"""
+        """소스 코드 실행 (최상위에 기다리기가 있거나 비동기 입출력을 쓰면 새 이벤트 루프에서 실행)"""
+        ast = self._준비(source, self._비동기입출력())
+        try:
+            if not (ast.비동기 or self._비동기입출력()):
+                return self.execute(ast, self.global_env)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._비동기실행(ast))
+            raise 런타임에러("이벤트 루프가 실행 중일 때는 run_async로 실행해야 합니다")
+        finally:
+            self._파일정리()
+
+    async def run_async(self, source: str) -> Any:
+        """실행 중인 이벤트 루프에서 소스 코드 실행
+
+        프로그램 최상위도 비동기 함수처럼 실행되므로 기다리는 동안 다른 작업이 실행된다.
+        비동기_쉬기간격 문장마다 (일반 함수와 메서드 본문 안에서도) 이벤트 루프에 차례를 넘기고,
+        async_input_callback이 있으면
+        최상위와 비동기 함수 안의 입력은 그 결과를 기다린다. 한 이벤트 루프에서 인터프리터를
+        여러 개 만들어 run_async를 함께 실행하면 스레드 없이 여러 프로그램을 동시에 돌릴 수 있다.
+        """
+        ast = self._준비(source, True)
+        try:
+            return await self._비동기실행(ast)
+        finally:
+            self._파일정리()
+
+    async def _비동기실행(self, ast: 프로그램) -> Any:
+        """프로그램 최상위를 비동기로 실행하고 남은 출력을 모두 보냄"""
+        self._출력잠금 = asyncio.Lock()
+        self._쉬기까지 = self.비동기_쉬기간격
+        try:
+            return await self._코루틴실행(self._비동기본문(ast.문장들, self.global_env))
+        finally:
+            await self._출력보내기()
+
+    def _파일정리(self):
+        """프로그램이 닫지 않은 파일을 닫음 (쓰기 버퍼도 이때 기록됨)"""
+        for 파일 in list(self._열린파일들):
+            파일.닫기()
+
+    def _비동기입출력(self) -> bool:
+        return self.async_input_callback is not None or self.async_output_callback is not None
+
+    def _준비(self, source: str, 비동기호스트: bool = False) -> 프로그램:
+        """구문 검사, 파싱, 최적화를 거쳐 실행할 AST를 만듦
+
+        비동기호스트이면 사용자 함수 호출에도 대기 표시를 해서 함수 본문도 쉬기 표시를 양보하게 한다.
+        """
         self.output_buffer = []
+        self._출력대기열.clear()
 
         # 한랭 필수 구문 검사
         self._validate_hanlang_syntax(source)
@@ -205,7 +1516,110 @@ class HanlangInterpreter:
         tokens = lexer.tokenize()
         parser = HanlangParser(tokens)
         ast = parser.parse()
-        return self.execute(ast, self.global_env)
+
+        if self.최적화:
+            최적화기 = HanlangOptimizer(self.내장함수순도, 입력대기=self.async_input_callback is not None,
+                                    비동기호스트=비동기호스트)
+            ast = 최적화기.optimize(ast)
+            self.최적화보고 = 최적화기.보고
+
+        self._대기표시(ast, self.async_input_callback is not None, 비동기호스트 or ast.비동기)
+        return ast
+
+    # 파일
+    def _파일경로(self, 경로: Any) -> str:
+        """허용된 디렉터리 안의 실제 경로 (심볼릭 링크를 따라간 뒤 검사)"""
+        if not self.허용경로들:
+            raise 런타임에러("파일 접근이 허용되지 않았습니다 (호스트가 허용경로들을 지정해야 합니다)")
+        if not isinstance(경로, str):
+            raise 런타임에러(f"파일 경로는 문자열이어야 합니다: {경로}")
+        실제경로 = os.path.realpath(os.path.join(self.허용경로들[0], 경로))
+        for 허용 in self.허용경로들:
+            try:
+                if os.path.commonpath((허용, 실제경로)) == 허용:
+                    return 실제경로
+            except ValueError:  # Windows에서 드라이브가 다르면 비교할 수 없음
+                continue
+        raise 런타임에러(f"허용되지 않은 경로입니다: {경로}")
+
+    def _파일열기(self, 경로: Any, 모드: str) -> 한랭파일:
+        파일 = 한랭파일(경로, 모드, self.파일_버퍼크기, self.파일_mmap최소크기,
+                   self._파일경로(경로), self._열린파일들.discard)
+        self._열린파일들.add(파일)
+        return 파일
+
+    def _파일로(self, 대상: Any, 모드: str, 동작: Callable, 값들: tuple = ()) -> Any:
+        """열린 파일이면 그대로, 경로면 파일을 열어 동작을 실행하고 닫음"""
+        if isinstance(대상, 한랭파일):
+            return 동작(대상, *값들)
+        파일 = self._파일열기(대상, 모드)
+        try:
+            결과 = 동작(파일, *값들)
+        finally:
+            파일.닫기()
+        return None if 결과 is 파일 else 결과
+
+    def _파일반복(self, 이름: str, 대상: Any, 반복만들기: Callable[[한랭파일], Iterator[Any]]) -> 한랭생성기:
+        """파일을 하나씩 읽는 반복자 (경로면 바로 열고 다 읽으면 닫음)"""
+        if isinstance(대상, 한랭파일):
+            return 한랭생성기(이름, 반복만들기(대상))
+        파일 = self._파일열기(대상, '읽기')
+        return 한랭생성기(이름, self._다읽고닫기(파일, 반복만들기(파일)))
+
+    @staticmethod
+    def _다읽고닫기(파일: 한랭파일, 반복자: Iterator[Any]) -> Iterator[Any]:
+        try:
+            yield from 반복자
+        finally:
+            파일.닫기()
+
+    # 정규식
+    def _정규식(self, 패턴: Any) -> 한랭정규식:
+        if isinstance(패턴, 한랭정규식):
+            return 패턴
+        if not isinstance(패턴, str):
+            raise 런타임에러(f"정규식 패턴은 문자열이어야 합니다: {패턴}")
+        return self._정규식캐시(패턴)
+
+    def _일치함수(self, 함수: Any) -> Callable[['re.Match'], str]:
+        """일치 목록 [전체, 그룹...]을 받아 바꿀 문자열을 돌려주는 한랭 함수를 re.sub용으로 변환"""
+        호출 = self._파이썬함수(함수, 1)
+        return lambda 일치: str(호출(_일치목록(일치)))
+
+    def 정규식통계(self) -> Dict[str, int]:
+        """정규식 캐시 통계
+
+        반환값: {'적중': .., '실패': .., '크기': .., '최대크기': ..}
+        """
+        정보 = self._정규식캐시.cache_info()
+        return {'적중': 정보.hits, '실패': 정보.misses, '크기': 정보.currsize, '최대크기': 정보.maxsize}
+
+    def 기억통계(self) -> Dict[str, Dict[str, int]]:
+        """기억 함수별 캐시 통계 (같은 이름으로 여러 번 선언된 함수는 합산)
+
+        반환값: {함수이름: {'적중': .., '실패': .., '크기': .., '최대크기': ..}}
+        """
+        통계: Dict[str, Dict[str, int]] = {}
+        for 이름, 캐시 in list(self._기억함수들.values()):
+            정보 = 캐시.cache_info()
+            항목 = 통계.setdefault(이름, {
+                '적중': 0, '실패': 0, '크기': 0, '최대크기': 정보.maxsize})
+            항목['적중'] += 정보.hits
+            항목['실패'] += 정보.misses
+            항목['크기'] += 정보.currsize
+        for 이름, (적중, 실패, 최대크기) in self._사라진기억통계.items():
+            항목 = 통계.setdefault(이름, {'적중': 0, '실패': 0, '크기': 0, '최대크기': 최대크기})
+            항목['적중'] += 적중
+            항목['실패'] += 실패
+        return 통계
+
+    def _기억함수사라짐(self, 참조: weakref.ref):
+        """사라진 기억 함수의 횟수를 이름별 합계로 옮기고 캐시를 놓음"""
+        이름, 캐시 = self._기억함수들.pop(참조)
+        정보 = 캐시.cache_info()
+        합계 = self._사라진기억통계.setdefault(이름, [0, 0, 정보.maxsize])
+        합계[0] += 정보.hits
+        합계[1] += 정보.misses
 
     def _validate_hanlang_syntax(self, source: str):
         """한랭 필수 구문 검사 (시작/끝 문구)"""
@@ -230,6 +1644,52 @@ class HanlangInterpreter:
                 f"현재 마지막 줄: '{lines[-1]}'"
             )
 
+    def _환경만들기(self, parent: Environment, 재사용: bool) -> Environment:
+        """새 스코프 생성 (탈출하지 않는 스코프는 반납된 Environment를 다시 씀)"""
+        if 재사용 and self._환경풀:
+            환경 = self._환경풀.pop()
+            환경.parent = parent
+            return 환경
+        return Environment(parent)
+
+    def _환경반납(self, 환경: Environment):
+        if len(self._환경풀) < self.환경풀_최대크기:
+            환경.variables.clear()
+            if 환경.constants:
+                환경.constants.clear()
+            환경.parent = None
+            환경.cells = None
+            self._환경풀.append(환경)
+
+    def _클로저환경(self, 캡처: Optional[list], env: Environment) -> Environment:
+        """캡처 목록에 있는 변수의 셀만 담은 클로저 환경 생성
+
+        실행 중인 스코프 구조가 분석과 다르면 (아직 선언되지 않은 변수 등)
+        전체 스코프 체인을 그대로 캡처한다.
+        """
+        if 캡처 is None:
+            return env
+        if not 캡처:
+            return self.global_env
+        클로저 = Environment(self.global_env)
+        for 이름, 거리, 선언예정 in 캡처:
+            소유자 = env
+            for _ in range(거리):
+                소유자 = 소유자.parent
+                if 소유자 is None:
+                    return env
+            if 소유자 is self.global_env:
+                return env
+            칸 = 소유자.capture(이름, 선언예정)
+            if 칸 is None:
+                return env
+            if 클로저.cells is None:
+                클로저.cells = {}
+            클로저.cells[이름] = 칸
+            if 이름 in 소유자.constants:
+                클로저.constants.add(이름)
+        return 클로저
+
     def execute(self, node: ASTNode, env: Environment) -> Any:
         """AST 노드 실행"""
         method_name = f'execute_{type(node).__name__}'
@@ -259,6 +1719,75 @@ class HanlangInterpreter:
     def execute_리스트리터럴(self, node: 리스트리터럴, env: Environment) -> list:
         return [self.execute(요소, env) for 요소 in node.요소들]
 
+    def execute_리스트내포(self, node: 리스트내포, env: Environment) -> list:
+        반복자 = self._반복자(self.execute(node.대상, env))
+        if node.컴파일 is None:
+            node.컴파일 = (self._식컴파일(node.식),
+                         self._식컴파일(node.조건) if node.조건 is not None else None)
+        식, 조건 = node.컴파일
+        변수 = node.변수
+        내포_env = self._환경만들기(env, node.프레임재사용)
+        define = 내포_env.define
+
+        # 원소마다 문장/내장 함수 호출을 거치지 않고 한 스코프에서 컴파일된 식만 계산
+        try:
+            if 조건 is None:
+                결과 = []
+                for 항목 in 반복자:
+                    define(변수, 항목)
+                    결과.append(식(내포_env))
+                return 결과
+            결과 = []
+            for 항목 in 반복자:
+                define(변수, 항목)
+                if 조건(내포_env):
+                    결과.append(식(내포_env))
+            return 결과
+        finally:
+            if node.프레임재사용:
+                self._환경반납(내포_env)
+
+    def _식컴파일(self, node: ASTNode) -> Callable[[Environment], Any]:
+        """식을 환경을 받아 값을 계산하는 파이썬 함수로 변환
+
+        노드마다 execute 분기를 거치지 않도록 자주 쓰는 식만 직접 변환하고,
+        나머지는 execute로 계산하는 함수로 감싼다. 계산 순서와 결과는 execute_와 같다.
+        """
+        if isinstance(node, (숫자리터럴, 문자열리터럴, 불리언리터럴)):
+            값 = node.값
+            return lambda env: 값
+        if isinstance(node, 식별자):
+            이름 = node.이름
+            return lambda env: env.get(이름)
+        if isinstance(node, 이항연산):
+            왼쪽 = self._식컴파일(node.왼쪽)
+            오른쪽 = self._식컴파일(node.오른쪽)
+            연산 = self.컴파일연산자들.get(node.연산자)
+            if 연산 is not None:
+                return lambda env: 연산(왼쪽(env), 오른쪽(env))
+        elif isinstance(node, 단항연산) and node.연산자 in ('-', '아님'):
+            피연산자 = self._식컴파일(node.피연산자)
+            if node.연산자 == '-':
+                return lambda env: -피연산자(env)
+            return lambda env: not 피연산자(env)
+        elif isinstance(node, 삼항연산):
+            조건 = self._식컴파일(node.조건)
+            참값 = self._식컴파일(node.참값)
+            거짓값 = self._식컴파일(node.거짓값)
+            return lambda env: 참값(env) if 조건(env) else 거짓값(env)
+        elif isinstance(node, 속성접근):
+            대상 = self._식컴파일(node.대상)
+            속성값 = self._속성값
+            return lambda env: 속성값(대상(env), node, env)
+        elif isinstance(node, 인덱스접근):
+            대상 = self._식컴파일(node.대상)
+            인덱스 = self._식컴파일(node.인덱스)
+            인덱스값 = self._인덱스값
+            return lambda env: 인덱스값(대상(env), 인덱스(env))
+
+        execute = self.execute
+        return lambda env: execute(node, env)
+
     def execute_딕셔너리리터럴(self, node: 딕셔너리리터럴, env: Environment) -> dict:
         return {self.execute(키, env): self.execute(값, env) for 키, 값 in node.쌍들}
 
@@ -277,7 +1806,7 @@ class HanlangInterpreter:
         elif op == '*':
             return left * right
         elif op == '/':
-            if right == 0:
+            if not isinstance(right, 한랭배열) and right == 0:
                 raise 런타임에러("0으로 나눌 수 없습니다")
             return left / right
         elif op == '%':
@@ -296,6 +1825,8 @@ class HanlangInterpreter:
             return left <= right
         elif op == '>=':
             return left >= right
+        elif op == '안에':
+            return left in right
         elif op == '그리고':
             return left and right
         elif op == '또는':
@@ -321,6 +1852,18 @@ class HanlangInterpreter:
         env.define(node.이름, 초기값, node.상수여부)
 
     def execute_대입문(self, node: 대입문, env: Environment) -> Any:
+        if node.이어붙이기 is None:
+            node.이어붙이기 = self._이어붙이기판단(node)
+        if node.이어붙이기:
+            # 문자열 변수에 더하면 매번 복사하지 않고 로프에 조각을 모음
+            이름 = node.대상.이름
+            값 = self.execute(node.값 if node.연산자 == '+=' else node.값.오른쪽, env)
+            if type(값) is str and env.append_str(이름, 값):
+                return None
+            값 = env.get(이름) + 값
+            env.set(이름, 값)
+            return 값
+
         값 = self.execute(node.값, env)
 
         if node.연산자 == '=':
@@ -345,12 +1888,19 @@ class HanlangInterpreter:
             인덱스 = self.execute(node.대상.인덱스, env)
             if isinstance(대상, dict):
                 대상[인덱스] = 값  # 딕셔너리는 키를 그대로 사용
+            elif isinstance(인덱스, slice):
+                try:
+                    대상[인덱스] = 값
+                except (TypeError, ValueError) as e:
+                    raise 런타임에러(f"슬라이스 대입 오류: {e}")
             else:
                 대상[int(인덱스)] = 값  # 리스트는 정수 인덱스
         elif isinstance(node.대상, 속성접근):
             대상 = self.execute(node.대상.대상, env)
             if isinstance(대상, 한랭인스턴스):
-                대상.필드들[node.대상.속성] = 값
+                대상.필드설정(node.대상.속성, 값)
+            elif isinstance(대상, 한랭레코드):
+                raise 런타임에러(f"레코드는 변경할 수 없습니다: {대상._이름}.{node.대상.속성}")
             else:
                 raise 런타임에러("속성에 값을 할당할 수 없습니다")
         else:
@@ -358,18 +1908,61 @@ class HanlangInterpreter:
 
         return 값
 
+    def _이어붙이기판단(self, node: 대입문) -> bool:
+        """`x += 식` 또는 `x = x + 식`처럼 변수 자신에 더하는 대입인지
+
+        `x = x + 식`은 식을 먼저 계산해도 결과가 같도록 식에 호출이 없을 때만 해당한다.
+        """
+        if not isinstance(node.대상, 식별자):
+            return False
+        if node.연산자 == '+=':
+            return True
+        값 = node.값
+        return (node.연산자 == '=' and isinstance(값, 이항연산) and 값.연산자 == '+'
+                and isinstance(값.왼쪽, 식별자) and 값.왼쪽.이름 == node.대상.이름
+                and not self._호출포함(값.오른쪽))
+
+    def _호출포함(self, node: ASTNode) -> bool:
+        if isinstance(node, (함수호출, 인라인호출)):
+            return True
+        return any(self._호출포함(자식) for 자식 in 자식노드들(node))
+
     def execute_함수선언(self, node: 함수선언, env: Environment) -> None:
-        함수 = 한랭함수(node, env)
-        env.define(node.이름, 함수)
+        env.define(node.이름, self._함수만들기(node, self._클로저환경(node.캡처, env)))
+
+    def _함수만들기(self, node: 함수선언, 클로저: Environment) -> 한랭함수:
+        함수 = 한랭함수(node, 클로저)
+        if node.기억:
+            # typed=True: 1, 1.0, 참처럼 같다고 비교되는 값도 따로 기억
+            크기 = node.기억크기 or self.기억_기본크기
+            # 캐시는 함수를 약하게만 참조하므로, 다른 함수 안에서 선언된 기억 함수는
+            # 바깥 호출이 끝나면 캐시와 함께 사라지고 통계만 이름별 합계로 남는다
+            참조 = weakref.ref(함수, self._기억함수사라짐)
+            함수.기억 = functools.lru_cache(maxsize=크기, typed=True)(
+                lambda *인자들: self._본문실행(참조(), 인자들))
+            self._기억함수들[참조] = (node.이름, 함수.기억)
+        return 함수
 
     def execute_함수호출(self, node: 함수호출, env: Environment) -> Any:
-        함수 = self.execute(node.함수, env)
+        if self.최적화 and isinstance(node.함수, 속성접근):
+            # 메서드 호출은 바인딩된 메서드를 만들지 않고 바로 실행
+            대상 = self.execute(node.함수.대상, env)
+            메서드 = self._메서드찾기(대상, node.함수)
+            if 메서드 is not None:
+                인자들 = [self.execute(인자, env) for 인자 in node.인자들]
+                return self._call_method(대상, 메서드, 인자들)
+            함수 = self._속성값(대상, node.함수, env)
+        else:
+            함수 = self.execute(node.함수, env)
         인자들 = [self.execute(인자, env) for 인자 in node.인자들]
 
         if callable(함수) and not isinstance(함수, (한랭함수, 한랭람다)):
             # 내장 함수
             try:
                 return 함수(*인자들)
+            except (사용자예외, 런타임에러):
+                # 바인딩된 메서드 안에서 난 한랭 오류는 그대로 전달
+                raise
             except Exception as e:
                 raise 런타임에러(f"내장 함수 실행 오류: {e}")
 
@@ -380,49 +1973,259 @@ class HanlangInterpreter:
                     f"{len(인자들)}개가 전달되었습니다"
                 )
 
-            람다_env = Environment(함수.클로저)
+            람다_env = self._환경만들기(함수.클로저, 함수.프레임재사용)
             for 이름, 값 in zip(함수.매개변수들, 인자들):
                 람다_env.define(이름, 값)
 
-            return self.execute(함수.본문, 람다_env)
+            try:
+                return self.execute(함수.본문, 람다_env)
+            finally:
+                if 함수.프레임재사용:
+                    self._환경반납(람다_env)
 
         if isinstance(함수, 한랭함수):
-            if len(인자들) != len(함수.선언.매개변수들):
+            선언 = 함수.선언
+            if len(인자들) != len(선언.매개변수들):
                 raise 런타임에러(
-                    f"함수 '{함수.선언.이름}'은(는) {len(함수.선언.매개변수들)}개의 "
+                    f"함수 '{선언.이름}'은(는) {len(선언.매개변수들)}개의 "
                     f"인자가 필요하지만 {len(인자들)}개가 전달되었습니다"
                 )
-
-            함수_env = Environment(함수.클로저)
-            for 이름, 값 in zip(함수.선언.매개변수들, 인자들):
+            if 함수.기억 is not None:
+                인자들 = tuple(인자들)
+                try:
+                    hash(인자들)
+                except TypeError:
+                    pass  # 목록처럼 해시할 수 없는 인자가 있으면 기억하지 않고 실행
+                else:
+                    return 함수.기억(*인자들)
+
+            # 본문은 _본문실행과 같지만, 재귀 호출마다 파이썬 프레임이 늘지 않도록 여기서 바로 실행
+            함수_env = self._환경만들기(함수.클로저, 선언.프레임재사용)
+            for 이름, 값 in zip(선언.매개변수들, 인자들):
                 함수_env.define(이름, 값)
 
+            if 선언.생성기:
+                return 한랭생성기(선언.이름, self._생성기실행(선언.본문, 함수_env))
+            if 선언.비동기:
+                return self._코루틴실행(self._비동기본문(선언.본문, 함수_env))
+
             try:
-                for 문장 in 함수.선언.본문:
+                for 문장 in 선언.본문:
                     self.execute(문장, 함수_env)
             except 반환예외 as e:
                 return e.값
+            finally:
+                if 선언.프레임재사용:
+                    self._환경반납(함수_env)
 
             return None
 
         if isinstance(함수, 한랭클래스):
-            인스턴스 = 한랭인스턴스(함수)
-            # 생성자 호출
-            if '생성' in 함수.메서드들:
-                생성자 = 함수.메서드들['생성']
-                함수_env = Environment(생성자.클로저)
-                함수_env.define('나', 인스턴스)
-                for 이름, 값 in zip(생성자.선언.매개변수들, 인자들):
-                    함수_env.define(이름, 값)
-                try:
-                    for 문장 in 생성자.선언.본문:
-                        self.execute(문장, 함수_env)
-                except 반환예외:
-                    pass
-            return 인스턴스
+            return self._인스턴스생성(함수, 인자들)
+
+        raise 런타임에러(f"호출할 수 없는 객체: {함수}")
+
+    def _함수실행(self, 함수: 한랭함수, 인자들) -> Any:
+        """인자 개수를 확인한 사용자 함수 실행 (기억 함수는 캐시를 먼저 확인)
+
+        고차 내장 함수가 쓴다. 보통 호출은 execute_함수호출이 캐시 확인과 본문 실행을 바로 한다.
+        """
+        if 함수.기억 is not None:
+            인자들 = tuple(인자들)
+            try:
+                hash(인자들)
+            except TypeError:
+                pass  # 목록처럼 해시할 수 없는 인자가 있으면 기억하지 않고 실행
+            else:
+                return 함수.기억(*인자들)
+        return self._본문실행(함수, 인자들)
+
+    def _본문실행(self, 함수: 한랭함수, 인자들) -> Any:
+        함수_env = self._환경만들기(함수.클로저, 함수.선언.프레임재사용)
+        for 이름, 값 in zip(함수.선언.매개변수들, 인자들):
+            함수_env.define(이름, 값)
+
+        if 함수.선언.생성기:
+            return 한랭생성기(함수.선언.이름, self._생성기실행(함수.선언.본문, 함수_env))
+        if 함수.선언.비동기:
+            return self._코루틴실행(self._비동기본문(함수.선언.본문, 함수_env))
+
+        try:
+            for 문장 in 함수.선언.본문:
+                self.execute(문장, 함수_env)
+        except 반환예외 as e:
+            return e.값
+        finally:
+            if 함수.선언.프레임재사용:
+                self._환경반납(함수_env)
+
+        return None
+
+    def _인스턴스생성(self, 클래스: 한랭클래스, 인자들) -> 한랭인스턴스:
+        인스턴스 = 한랭인스턴스(클래스)
+        # 생성자 호출 (부모 클래스의 생성자도 상속됨)
+        if '생성' in 클래스.메서드들:
+            self._call_method(인스턴스, 클래스.메서드들['생성'], 인자들)
+        return 인스턴스
+
+    def _키로고르기(self, 고르기: Callable, 인자들: tuple) -> Any:
+        """최대값/최소값: 값 여러 개, 모음 하나, 또는 (모음, 키 함수)"""
+        if len(인자들) == 2 and isinstance(인자들[1], (한랭함수, 한랭람다)):
+            return 고르기(인자들[0], key=self._파이썬함수(인자들[1], 1))
+        if len(인자들) == 1 and isinstance(인자들[0], 한랭배열):
+            return 인자들[0].최대() if 고르기 is max else 인자들[0].최소()
+        return 고르기(인자들) if len(인자들) > 1 else 고르기(인자들[0])
+
+    def _파이썬함수(self, 함수: Any, 인자수: int) -> Callable:
+        """한랭 함수/람다를 내장 함수가 바로 부를 수 있는 파이썬 함수로 변환
+
+        인자 개수는 여기서 한 번만 확인한다. 람다 본문은 미리 식 컴파일하고,
+        클로저를 만들지 않는 람다는 환경 하나를 만들어 모든 호출에 다시 쓴다.
+        """
+        if isinstance(함수, 한랭람다):
+            매개변수들 = 함수.매개변수들
+            if len(매개변수들) != 인자수:
+                raise 런타임에러(
+                    f"람다 함수는 {len(매개변수들)}개의 인자가 필요하지만 "
+                    f"{인자수}개가 전달됩니다"
+                )
+            본문 = self._식컴파일(함수.본문)
+            클로저 = 함수.클로저
+            if not 함수.프레임재사용:
+                def 호출(*값들):
+                    람다_env = Environment(클로저)
+                    for 이름, 값 in zip(매개변수들, 값들):
+                        람다_env.define(이름, 값)
+                    return 본문(람다_env)
+                return 호출
+
+            람다_env = Environment(클로저)
+            변수들 = 람다_env.variables
+            if 인자수 == 1:
+                이름 = 매개변수들[0]
+
+                def 호출(값):
+                    변수들[이름] = 값
+                    return 본문(람다_env)
+                return 호출
+
+            def 호출(*값들):
+                변수들.update(zip(매개변수들, 값들))
+                return 본문(람다_env)
+            return 호출
 
+        if isinstance(함수, 한랭함수):
+            if len(함수.선언.매개변수들) != 인자수:
+                raise 런타임에러(
+                    f"함수 '{함수.선언.이름}'은(는) {len(함수.선언.매개변수들)}개의 "
+                    f"인자가 필요하지만 {인자수}개가 전달됩니다"
+                )
+            return lambda *값들: self._함수실행(함수, 값들)
+        if isinstance(함수, 한랭클래스):
+            return lambda *값들: self._인스턴스생성(함수, 값들)
+        if callable(함수):
+            return 함수
         raise 런타임에러(f"호출할 수 없는 객체: {함수}")
 
+    def _병렬맵(self, 대상: Any, 함수: Any, 묶음크기: Optional[int] = None) -> list:
+        """대상의 각 항목에 함수를 작업자 프로세스들에서 적용 (결과는 대상의 순서대로)
+
+        작업자는 함수와 캡처한 값의 복사본으로 실행하므로 바깥 변수를 바꾸는 함수는 거부한다.
+        함수 안에서 출력한 줄은 작업자가 모아 두었다가 항목 순서대로 출력한다.
+        """
+        호출 = self._파이썬함수(함수, 1)
+        항목들 = list(대상)
+        if not isinstance(함수, (한랭함수, 한랭람다)):
+            # 내장 함수는 보낼 수 없으므로 여기서 바로 적용
+            return [호출(항목) for 항목 in 항목들]
+
+        묶음 = self._병렬함수로(함수, {})
+        try:
+            보낼함수 = pickle.dumps(묶음)
+        except Exception as e:
+            raise 런타임에러(f"병렬맵: 함수가 캡처한 값을 다른 프로세스로 보낼 수 없습니다 ({e})")
+        if not 항목들:
+            return []
+
+        작업자수 = self.병렬_작업자수 or os.cpu_count() or 1
+        if 묶음크기 is None:
+            # 작업자마다 네 묶음 정도 - 느린 묶음이 있어도 남은 작업자가 나머지를 가져감
+            묶음크기 = -(-len(항목들) // (작업자수 * 4))
+        묶음크기 = max(1, int(묶음크기))
+        미래들 = [_프로세스풀(작업자수).submit(_병렬작업, 보낼함수, 항목들[i:i + 묶음크기], self.허용경로들)
+                 for i in range(0, len(항목들), 묶음크기)]
+
+        결과들 = []
+        try:
+            for 미래 in 미래들:
+                try:
+                    값들, 출력들 = 미래.result()
+                except (사용자예외, 런타임에러):
+                    raise
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        _프로세스풀닫기()
+                    raise 런타임에러(f"병렬맵 작업 오류: {e}")
+                결과들.extend(값들)
+                for 줄 in 출력들:
+                    self.output_buffer.append(줄)
+                    self.output_callback(줄)
+        finally:
+            for 미래 in 미래들:
+                미래.cancel()
+        return 결과들
+
+    def _병렬함수로(self, 함수: Any, 묶은: Dict[int, _병렬함수]) -> _병렬함수:
+        """한랭 함수/람다를 그 함수가 캡처한 값(다른 사용자 함수 포함)과 함께 묶음"""
+        if id(함수) in 묶은:
+            return 묶은[id(함수)]
+        if isinstance(함수, 한랭람다):
+            선언 = 람다식(함수.매개변수들, 함수.본문, 함수.프레임재사용)
+            이름 = '람다'
+        else:
+            선언 = 함수.선언
+            이름 = 함수.선언.이름
+
+        바뀌는이름들 = 바깥변경이름들(선언, self.내장함수순도)
+        if 바뀌는이름들:
+            raise 런타임에러(
+                f"병렬맵: '{이름}'이(가) 바깥 변수 {', '.join(sorted(바뀌는이름들))}을(를) 바꿉니다 "
+                f"(작업자는 복사본으로 실행하므로 결과는 반환값으로 돌려주세요)")
+
+        묶음 = _병렬함수(_보낼사본(선언))
+        묶은[id(함수)] = 묶음
+        for 변수 in sorted(자유이름들(선언)):
+            if not 함수.클로저.exists(변수):
+                continue
+            값 = 함수.클로저.get(변수)
+            if self._내장값들.get(변수) is 값:
+                continue
+            if isinstance(값, (한랭함수, 한랭람다)):
+                값 = self._병렬함수로(값, 묶은)
+            elif isinstance(값, (한랭클래스, 한랭인스턴스, 한랭레코드, 한랭생성기)):
+                # 런타임에 만든 클래스/레코드형은 작업자 프로세스에 없음
+                raise 런타임에러(
+                    f"병렬맵: '{이름}'이(가) 캡처한 '{변수}'({type(값).__name__}) 값은 "
+                    f"다른 프로세스로 보낼 수 없습니다")
+            묶음.캡처[변수] = 값
+        return 묶음
+
+    def _병렬함수풀기(self, 묶음: _병렬함수, 풀린: Dict[int, Any]) -> Any:
+        """작업자 프로세스에서 _병렬함수를 전역 환경 아래의 한랭 함수/람다로 되돌림"""
+        if id(묶음) in 풀린:
+            return 풀린[id(묶음)]
+        클로저 = Environment(self.global_env)
+        if isinstance(묶음.선언, 람다식):
+            함수 = 한랭람다(묶음.선언, 클로저)
+        else:
+            함수 = self._함수만들기(묶음.선언, 클로저)
+        풀린[id(묶음)] = 함수
+        for 이름, 값 in 묶음.캡처.items():
+            if isinstance(값, _병렬함수):
+                값 = self._병렬함수풀기(값, 풀린)
+            클로저.define(이름, 값)
+        return 함수
+
     def execute_반환문(self, node: 반환문, env: Environment):
         값 = None
         if node.값:
@@ -439,21 +2242,103 @@ class HanlangInterpreter:
             for 문장 in node.거짓블록:
                 self.execute(문장, env)
 
+    def execute_선택문(self, node: 선택문, env: Environment) -> Any:
+        for 문장 in self._선택본문(node, self.execute(node.대상, env), env):
+            self.execute(문장, env)
+
+    def _선택본문(self, node: 선택문, 값: Any, env: Environment) -> List[ASTNode]:
+        """선택할 값과 같은 첫 경우의 본문 (없으면 기본 본문)
+
+        경우 값이 모두 리터럴이면 처음 실행할 때 값 -> 경우 번호 점프표를 만들어 한 번에 찾고,
+        아니면 만약/아니면만약처럼 경우 값을 차례로 계산해 비교한다.
+        """
+        if node.점프표 is None:
+            node.점프표 = self._점프표만들기(node)
+
+        번호 = None
+        if node.점프표 is False:
+            번호 = self._경우찾기(node, 값, env)
+        else:
+            try:
+                번호 = node.점프표.get(값)
+            except TypeError:
+                # 해시할 수 없는 값(보기 등)은 차례로 비교
+                번호 = self._경우찾기(node, 값, env)
+
+        if 번호 is None:
+            return node.기본 or []
+        return node.경우들[번호].본문
+
+    def _경우찾기(self, node: 선택문, 값: Any, env: Environment) -> Optional[int]:
+        for 번호, 경우 in enumerate(node.경우들):
+            for 경우값 in 경우.값들:
+                if 값 == self.execute(경우값, env):
+                    return 번호
+        return None
+
+    def _점프표만들기(self, node: 선택문) -> Any:
+        점프표: Dict[Any, int] = {}
+        for 번호, 경우 in enumerate(node.경우들):
+            for 경우값 in 경우.값들:
+                if isinstance(경우값, (숫자리터럴, 문자열리터럴, 불리언리터럴)):
+                    리터럴 = 경우값.값
+                elif isinstance(경우값, 없음리터럴):
+                    리터럴 = None
+                elif (isinstance(경우값, 단항연산) and 경우값.연산자 == '-'
+                      and isinstance(경우값.피연산자, 숫자리터럴)):
+                    리터럴 = -경우값.피연산자.값
+                else:
+                    return False
+                # 같은 값(1과 1.0 등)이 여러 번 나오면 먼저 나온 경우가 이김
+                점프표.setdefault(리터럴, 번호)
+        return 점프표
+
     def execute_반복문(self, node: 반복문, env: Environment) -> Any:
         시작 = int(self.execute(node.시작, env))
         끝 = int(self.execute(node.끝, env))
 
-        반복_env = Environment(env)
+        반복_env = self._환경만들기(env, node.프레임재사용)
 
-        for i in range(시작, 끝 + 1):
-            반복_env.define(node.변수, i)
-            try:
-                for 문장 in node.본문:
-                    self.execute(문장, 반복_env)
-            except 중단예외:
-                break
-            except 계속예외:
-                continue
+        try:
+            for i in range(시작, 끝 + 1):
+                반복_env.define(node.변수, i)
+                try:
+                    for 문장 in node.본문:
+                        self.execute(문장, 반복_env)
+                except 중단예외:
+                    break
+                except 계속예외:
+                    continue
+        finally:
+            if node.프레임재사용:
+                self._환경반납(반복_env)
+
+    def _반복자(self, 대상: Any):
+        if isinstance(대상, (dict, set, deque)):
+            대상 = tuple(대상)  # 반복 중에 항목이 추가/삭제되어도 안전하도록 미리 복사
+        try:
+            return iter(대상)
+        except TypeError:
+            raise 런타임에러(f"반복할 수 없는 값입니다: {type(대상).__name__}")
+
+    def execute_항목반복문(self, node: 항목반복문, env: Environment) -> Any:
+        반복자 = self._반복자(self.execute(node.대상, env))
+
+        반복_env = self._환경만들기(env, node.프레임재사용)
+
+        try:
+            for 항목 in 반복자:
+                반복_env.define(node.변수, 항목)
+                try:
+                    for 문장 in node.본문:
+                        self.execute(문장, 반복_env)
+                except 중단예외:
+                    break
+                except 계속예외:
+                    continue
+        finally:
+            if node.프레임재사용:
+                self._환경반납(반복_env)
 
     def execute_동안문(self, node: 동안문, env: Environment) -> Any:
         while self.execute(node.조건, env):
@@ -483,83 +2368,164 @@ class HanlangInterpreter:
             프롬프트 = str(self.execute(node.프롬프트, env))
         return self.input_callback(프롬프트)
 
+    def _동기입력불가(self, 프롬프트: str) -> str:
+        raise 런타임에러("비동기 입력을 쓰는 실행에서는 일반 함수, 람다, 리스트 내포 안에서 입력을 쓸 수 없습니다")
+
+    async def _입력기다리기(self, 프롬프트: str) -> str:
+        try:
+            return await self.async_input_callback(프롬프트)
+        except (사용자예외, 런타임에러):
+            raise
+        except Exception as e:
+            raise 런타임에러(f"입력 오류: {e}")
+
     def execute_인덱스접근(self, node: 인덱스접근, env: Environment) -> Any:
-        대상 = self.execute(node.대상, env)
-        인덱스 = self.execute(node.인덱스, env)
+        return self._인덱스값(self.execute(node.대상, env), self.execute(node.인덱스, env))
 
+    @staticmethod
+    def _인덱스값(대상: Any, 인덱스: Any) -> Any:
         try:
             if isinstance(대상, dict):
                 return 대상[인덱스]  # 딕셔너리는 키를 그대로 사용
+            if isinstance(인덱스, slice):
+                return 대상[인덱스]
             return 대상[int(인덱스)]  # 리스트/문자열은 정수 인덱스
-        except (IndexError, KeyError, TypeError) as e:
+        except (IndexError, KeyError, TypeError, ValueError) as e:
             raise 런타임에러(f"인덱스 오류: {e}")
 
+    def execute_슬라이스(self, node: 슬라이스, env: Environment) -> slice:
+        """시작:끝:간격을 파이썬 slice로 계산 (생략한 부분은 None)"""
+        return slice(*(None if 부분 is None else int(self.execute(부분, env))
+                       for 부분 in (node.시작, node.끝, node.간격)))
+
     def execute_속성접근(self, node: 속성접근, env: Environment) -> Any:
-        대상 = self.execute(node.대상, env)
+        return self._속성값(self.execute(node.대상, env), node, env)
 
+    def _속성값(self, 대상: Any, node: 속성접근, env: Environment) -> Any:
         if isinstance(대상, 한랭인스턴스):
-            if node.속성 in 대상.필드들:
-                return 대상.필드들[node.속성]
-            if node.속성 in 대상.클래스.메서드들:
+            _, 번호, 메서드 = self._속성찾기(대상, node)
+            if 번호 is not None:
+                return 대상.값들[번호]
+            if 메서드 is not None:
                 # 바인딩된 메서드 반환
-                메서드 = 대상.클래스.메서드들[node.속성]
                 return lambda *args: self._call_method(대상, 메서드, args)
             raise 런타임에러(f"'{대상.클래스.이름}'에 '{node.속성}' 속성이 없습니다")
 
-        # 문자열, 리스트 등의 내장 속성
-        if hasattr(대상, node.속성):
+        if isinstance(대상, 한랭레코드):
+            # 필드 이름은 레코드 종류별로 고정된 칸 번호로 바뀜 (호출 지점에 캐시)
+            캐시 = node.캐시
+            if 캐시 is not None and 캐시[0] is type(대상):
+                return 대상[캐시[1]]
+            번호 = 대상._칸번호.get(node.속성)
+            if 번호 is None:
+                raise 런타임에러(f"레코드 '{대상._이름}'에 '{node.속성}' 필드가 없습니다")
+            node.캐시 = (type(대상), 번호, None)
+            return 대상[번호]
+
+        if isinstance(대상, 한랭클래스) and node.속성 in 대상.메서드들:
+            # 부모.메서드(...) - 현재 메서드의 나에 대해 클래스의 메서드를 호출
+            if not env.exists('나'):
+                raise 런타임에러(f"'{대상.이름}.{node.속성}'은(는) 메서드 안에서만 호출할 수 있습니다")
+            인스턴스 = env.get('나')
+            메서드 = 대상.메서드들[node.속성]
+            return lambda *args: self._call_method(인스턴스, 메서드, args)
+
+        # 문자열, 리스트 등의 내장 속성 (_로 시작하는 파이썬 내부 속성은 감춤 - 파일 객체 등이 새지 않도록)
+        # str.format은 "{0._파일}"처럼 치환 필드 안에서 속성을 따라가므로 함께 감춘다
+        if not node.속성.startswith('_') and node.속성 not in _숨긴속성들 and hasattr(대상, node.속성):
             return getattr(대상, node.속성)
 
         raise 런타임에러(f"'{type(대상).__name__}'에 '{node.속성}' 속성이 없습니다")
 
-    def _call_method(self, 인스턴스: 한랭인스턴스, 메서드: 한랭함수, 인자들: tuple) -> Any:
-        함수_env = Environment(메서드.클로저)
+    def _속성찾기(self, 대상: 한랭인스턴스, node: 속성접근) -> tuple:
+        """(모양, 필드 칸 번호, 메서드) - 인스턴스 모양을 키로 하는 호출 지점 인라인 캐시
+
+        모양은 클래스마다 따로 만들어지므로 모양이 같으면 필드 배치와 메서드가 모두 같다.
+        """
+        캐시 = node.캐시
+        if 캐시 is not None and 캐시[0] is 대상.모양:
+            return 캐시
+        번호 = 대상.모양.칸번호.get(node.속성)
+        메서드 = None if 번호 is not None else 대상.클래스.메서드들.get(node.속성)
+        node.캐시 = (대상.모양, 번호, 메서드)
+        return node.캐시
+
+    def _메서드찾기(self, 대상: Any, node: 속성접근) -> Optional[한랭함수]:
+        """속성접근이 인스턴스의 메서드를 가리키면 그 메서드"""
+        if not isinstance(대상, 한랭인스턴스):
+            return None
+        return self._속성찾기(대상, node)[2]
+
+    def _call_method(self, 인스턴스: 한랭인스턴스, 메서드: 한랭함수, 인자들) -> Any:
+        함수_env = self._환경만들기(메서드.클로저, 메서드.선언.프레임재사용)
         함수_env.define('나', 인스턴스)
+        if 메서드.부모클래스 is not None:
+            함수_env.define('부모', 메서드.부모클래스)
 
         for 이름, 값 in zip(메서드.선언.매개변수들, 인자들):
             함수_env.define(이름, 값)
 
+        if 메서드.선언.생성기:
+            return 한랭생성기(메서드.선언.이름, self._생성기실행(메서드.선언.본문, 함수_env))
+        if 메서드.선언.비동기:
+            return self._코루틴실행(self._비동기본문(메서드.선언.본문, 함수_env))
+
         try:
             for 문장 in 메서드.선언.본문:
                 self.execute(문장, 함수_env)
         except 반환예외 as e:
             return e.값
+        finally:
+            if 메서드.선언.프레임재사용:
+                self._환경반납(함수_env)
 
         return None
 
     def execute_클래스선언(self, node: 클래스선언, env: Environment) -> None:
+        부모 = None
+        if node.부모 is not None:
+            부모 = self.execute(node.부모, env)
+            if not isinstance(부모, 한랭클래스):
+                raise 런타임에러(f"'{node.이름}'의 부모는 클래스여야 합니다: {부모}")
+
         메서드들 = {}
 
         for 문장 in node.본문:
             if isinstance(문장, 함수선언):
-                메서드들[문장.이름] = 한랭함수(문장, env)
+                메서드들[문장.이름] = 한랭함수(문장, env, 부모)
 
-        클래스 = 한랭클래스(node.이름, 메서드들)
+        클래스 = 한랭클래스(node.이름, 메서드들, 부모)
         env.define(node.이름, 클래스)
 
+    def execute_레코드선언(self, node: 레코드선언, env: Environment) -> None:
+        env.define(node.이름, 레코드형만들기(node.이름, node.필드들))
+
     def execute_시도문(self, node: 시도문, env: Environment) -> Any:
         try:
             for 문장 in node.시도블록:
                 self.execute(문장, env)
         except 사용자예외 as e:
             if node.잡기블록:
-                잡기_env = Environment(env)
-                if node.잡기변수:
-                    잡기_env.define(node.잡기변수, e.값)
-                for 문장 in node.잡기블록:
-                    self.execute(문장, 잡기_env)
+                self._잡기실행(node, env, e.값)
         except 런타임에러 as e:
             if node.잡기블록:
-                잡기_env = Environment(env)
-                if node.잡기변수:
-                    잡기_env.define(node.잡기변수, str(e))
-                for 문장 in node.잡기블록:
-                    self.execute(문장, 잡기_env)
+                self._잡기실행(node, env, str(e))
         finally:
             if node.마침내블록:
                 for 문장 in node.마침내블록:
                     self.execute(문장, env)
 
+    def _잡기실행(self, node: 시도문, env: Environment, 예외값: Any):
+        잡기_env = self._환경만들기(env, node.프레임재사용)
+        try:
+            if node.잡기변수:
+                잡기_env.define(node.잡기변수, 예외값)
+            for 문장 in node.잡기블록:
+                self.execute(문장, 잡기_env)
+        finally:
+            if node.프레임재사용:
+                self._환경반납(잡기_env)
+
     def execute_던지기문(self, node: 던지기문, env: Environment):
         값 = self.execute(node.값, env)
         raise 사용자예외(값)
@@ -572,7 +2538,424 @@ class HanlangInterpreter:
             return self.execute(node.거짓값, env)
 
     def execute_람다식(self, node: 람다식, env: Environment) -> 한랭람다:
-        return 한랭람다(node, env)
+        return 한랭람다(node, self._클로저환경(node.캡처, env))
+
+    def execute_불변식계산(self, node: 불변식계산, env: Environment) -> Any:
+        # 불변식은 부작용이 없으므로 미리 계산해도 안전하다.
+        # 오류가 나면 반복문 안에서 원래 위치에 도달했을 때 다시 계산하여 같은 오류를 낸다.
+        for 식 in node.불변식들:
+            try:
+                값 = self.execute(식.식, env)
+            except Exception:
+                값 = _계산실패
+            env.define(식.이름, 값)
+
+        try:
+            return self.execute(node.반복, env)
+        finally:
+            for 식 in node.불변식들:
+                env.variables.pop(식.이름, None)
+
+    def generate_불변식계산(self, node: 불변식계산, env: Environment) -> Iterator[Any]:
+        for 식 in node.불변식들:
+            try:
+                값 = self.execute(식.식, env)
+            except Exception:
+                값 = _계산실패
+            env.define(식.이름, 값)
+
+        try:
+            yield from self._블록생성([node.반복], env)
+        finally:
+            for 식 in node.불변식들:
+                env.variables.pop(식.이름, None)
+
+    def execute_불변식(self, node: 불변식, env: Environment) -> Any:
+        값 = env.get(node.이름)
+        if 값 is _계산실패:
+            return self.execute(node.식, env)
+        return 값
+
+    def execute_인라인호출(self, node: 인라인호출, env: Environment) -> Any:
+        # 인라인된 본문은 사용자 함수를 호출하지 않지만, 인자로 받은 생성기를 내장 함수가 소비하면
+        # 생성기 본문이 같은 호출 자리를 다시 실행해 인자칸을 덮어쓸 수 있으므로 이전 값을 되돌린다
+        칸 = node.칸
+        값들 = [self.execute(인자, env) for 인자 in node.인자들]
+        이전값들, 칸.값들 = 칸.값들, 값들
+        node.적중 += 1
+        try:
+            return self.execute(node.본문, env)
+        finally:
+            칸.값들 = 이전값들
+
+    def execute_인자참조(self, node: 인자참조, env: Environment) -> Any:
+        return node.칸.값들[node.번호]
+
+    def execute_양보문(self, node: 양보문, env: Environment):
+        raise 런타임에러("양보는 생성기 함수 안에서만 실행할 수 있습니다")
+
+    # 생성기 실행
+    # 생성기 함수의 본문은 execute_ 대신 파이썬 제너레이터인 generate_ 메서드로 실행하여
+    # 양보문에서 멈췄다가 다음 값을 요청받으면 이어서 실행한다 (스레드 없음).
+    # 양보를 품을 수 있는 문장만 generate_ 메서드가 있고 나머지는 execute_로 실행한다.
+    def _생성기실행(self, 본문: List[ASTNode], env: Environment) -> Iterator[Any]:
+        # 사용자 생성기의 본문은 쉬기 표시를 내지 않도록 쉬기를 끈 채로 진행시킨다.
+        # 닫힐 때(마침내 블록 실행)도 마찬가지 - 닫히는 생성기가 양보하면 마침내 블록이 건너뛰어진다.
+        실행 = self._블록생성(본문, env)
+        try:
+            while True:
+                이전, self._쉬기허용 = self._쉬기허용, False
+                try:
+                    값 = next(실행)
+                except (StopIteration, 반환예외):
+                    return
+                finally:
+                    self._쉬기허용 = 이전
+                yield 값
+        finally:
+            이전, self._쉬기허용 = self._쉬기허용, False
+            try:
+                실행.close()
+            finally:
+                self._쉬기허용 = 이전
+
+    def _블록생성(self, 문장들: List[ASTNode], env: Environment) -> Iterator[Any]:
+        for 문장 in 문장들:
+            # 비동기 실행이 이벤트 루프를 오래 붙잡지 않도록 주기적으로 쉬기 표시를 양보
+            if self._쉬기허용:
+                self._쉬기까지 -= 1
+                if self._쉬기까지 <= 0:
+                    self._쉬기까지 = self.비동기_쉬기간격
+                    yield _쉬기
+            method = getattr(self, f'generate_{type(문장).__name__}', None)
+            if method:
+                yield from method(문장, env)
+            elif 문장.대기:
+                yield from self._대기문장(문장, env)
+            else:
+                self.execute(문장, env)
+
+    def generate_양보문(self, node: 양보문, env: Environment) -> Iterator[Any]:
+        yield self.execute(node.값, env)
+
+    def generate_조건문(self, node: 조건문, env: Environment) -> Iterator[Any]:
+        if (yield from self._식생성(node.조건, env)):
+            yield from self._블록생성(node.참블록, env)
+        elif node.거짓블록:
+            yield from self._블록생성(node.거짓블록, env)
+
+    def generate_선택문(self, node: 선택문, env: Environment) -> Iterator[Any]:
+        값 = yield from self._식생성(node.대상, env)
+        yield from self._블록생성(self._선택본문(node, 값, env), env)
+
+    def generate_반복문(self, node: 반복문, env: Environment) -> Iterator[Any]:
+        시작 = int((yield from self._식생성(node.시작, env)))
+        끝 = int((yield from self._식생성(node.끝, env)))
+        yield from self._항목반복생성(node, range(시작, 끝 + 1), env)
+
+    def generate_항목반복문(self, node: 항목반복문, env: Environment) -> Iterator[Any]:
+        반복자 = self._반복자((yield from self._식생성(node.대상, env)))
+        yield from self._항목반복생성(node, 반복자, env)
+
+    def _항목반복생성(self, node: ASTNode, 반복자, env: Environment) -> Iterator[Any]:
+        반복_env = self._환경만들기(env, node.프레임재사용)
+        try:
+            for 항목 in 반복자:
+                반복_env.define(node.변수, 항목)
+                try:
+                    yield from self._블록생성(node.본문, 반복_env)
+                except 중단예외:
+                    break
+                except 계속예외:
+                    continue
+        finally:
+            if node.프레임재사용:
+                self._환경반납(반복_env)
+
+    def generate_동안문(self, node: 동안문, env: Environment) -> Iterator[Any]:
+        while (yield from self._식생성(node.조건, env)):
+            try:
+                yield from self._블록생성(node.본문, env)
+            except 중단예외:
+                break
+            except 계속예외:
+                continue
+
+    def generate_시도문(self, node: 시도문, env: Environment) -> Iterator[Any]:
+        try:
+            yield from self._블록생성(node.시도블록, env)
+        except 사용자예외 as e:
+            if node.잡기블록:
+                yield from self._잡기생성(node, env, e.값)
+        except 런타임에러 as e:
+            if node.잡기블록:
+                yield from self._잡기생성(node, env, str(e))
+        finally:
+            if node.마침내블록:
+                yield from self._블록생성(node.마침내블록, env)
+
+    def _잡기생성(self, node: 시도문, env: Environment, 예외값: Any) -> Iterator[Any]:
+        잡기_env = self._환경만들기(env, node.프레임재사용)
+        try:
+            if node.잡기변수:
+                잡기_env.define(node.잡기변수, 예외값)
+            yield from self._블록생성(node.잡기블록, 잡기_env)
+        finally:
+            if node.프레임재사용:
+                self._환경반납(잡기_env)
+
+    # 비동기 실행 - 비동기 함수 본문과 비동기 프로그램 최상위는 생성기로 실행하고,
+    # 기다리기식은 기다릴 대상을 양보해 _코루틴실행이 기다린 결과를 돌려받는다.
+    def _비동기본문(self, 본문: List[ASTNode], env: Environment) -> Iterator[Any]:
+        try:
+            yield from self._블록생성(본문, env)
+        except 반환예외 as e:
+            return e.값
+        return None
+
+    async def _코루틴실행(self, 실행: Iterator[Any]) -> Any:
+        """실행 생성기가 양보한 대상을 기다려 결과(또는 오류)를 돌려보내며 끝까지 실행"""
+        보낼값, 오류 = None, None
+        try:
+            while True:
+                이전, self._쉬기허용 = self._쉬기허용, True
+                try:
+                    대상 = 실행.send(보낼값) if 오류 is None else 실행.throw(오류)
+                except StopIteration as e:
+                    return e.value
+                finally:
+                    self._쉬기허용 = 이전
+                if self._출력대기열:
+                    await self._출력보내기()
+                if 대상 is _쉬기:
+                    보낼값 = None
+                    await asyncio.sleep(0)
+                    continue
+                try:
+                    보낼값, 오류 = await 대상, None
+                except (사용자예외, 런타임에러) as e:
+                    보낼값, 오류 = None, e
+                except Exception as e:
+                    보낼값, 오류 = None, 런타임에러(f"기다리기 오류: {e}")
+        finally:
+            이전, self._쉬기허용 = self._쉬기허용, False
+            try:
+                실행.close()
+            finally:
+                self._쉬기허용 = 이전
+
+    async def _출력보내기(self):
+        """대기열에 모인 출력 줄을 비동기 출력 대상에 순서대로 보냄"""
+        if self._출력잠금 is None:
+            self._출력잠금 = asyncio.Lock()
+        async with self._출력잠금:  # 여러 작업이 함께 보내도 줄 순서 유지
+            while self._출력대기열:
+                await self.async_output_callback(self._출력대기열.popleft())
+
+    def _식생성(self, node: ASTNode, env: Environment) -> Iterator[Any]:
+        """기다리기가 있을 수 있는 식 계산 (생성기의 반환값이 식의 값)"""
+        if not node.대기:
+            return self.execute(node, env)
+        if isinstance(node, 입력문):
+            프롬프트 = ""
+            if node.프롬프트:
+                프롬프트 = str((yield from self._식생성(node.프롬프트, env)))
+            return (yield self._입력기다리기(프롬프트))
+        if isinstance(node, 기다리기식):
+            대상 = yield from self._식생성(node.값, env)
+            if not inspect.isawaitable(대상):
+                raise 런타임에러(f"기다릴 수 없는 값입니다: {대상}")
+            return (yield 대상)
+        if isinstance(node, 삼항연산):
+            조건 = yield from self._식생성(node.조건, env)
+            return (yield from self._식생성(node.참값 if 조건 else node.거짓값, env))
+        if isinstance(node, 함수호출):
+            return (yield from self._호출생성(node, env))
+
+        # 마지막으로 기다리는 자식까지 차례로 계산해 계산된값으로 바꾼 사본을 실행
+        남은대기 = sum(자식.대기 for 자식 in 자식노드들(node))
+        사본 = copy.copy(node)
+        for 필드 in fields(node):
+            if not 남은대기:
+                break
+            값 = getattr(node, 필드.name)
+            if isinstance(값, ASTNode):
+                남은대기 -= 값.대기
+                값 = 계산된값((yield from self._식생성(값, env)))
+            elif isinstance(값, list):
+                새목록 = []
+                for 항목 in 값:
+                    if 남은대기 and isinstance(항목, ASTNode):
+                        남은대기 -= 항목.대기
+                        항목 = 계산된값((yield from self._식생성(항목, env)))
+                    elif 남은대기 and isinstance(항목, tuple):
+                        요소들 = []
+                        for 요소 in 항목:
+                            if 남은대기 and isinstance(요소, ASTNode):
+                                남은대기 -= 요소.대기
+                                요소 = 계산된값((yield from self._식생성(요소, env)))
+                            요소들.append(요소)
+                        항목 = tuple(요소들)
+                    새목록.append(항목)
+                값 = 새목록
+            setattr(사본, 필드.name, 값)
+        return self.execute(사본, env)
+
+    def _호출생성(self, node: 함수호출, env: Environment) -> Iterator[Any]:
+        """대기 표시된 함수 호출 - 일반 사용자 함수와 메서드는 본문도 생성기로 실행
+
+        그래서 비동기 실행 중에는 함수 안의 긴 반복도 쉬기 표시를 양보한다.
+        기억, 생성기, 비동기 함수와 내장 함수는 인자만 계산해 보통 호출로 실행한다.
+        """
+        인스턴스 = None
+        if isinstance(node.함수, 속성접근):
+            대상 = yield from self._식생성(node.함수.대상, env)
+            함수 = self._메서드찾기(대상, node.함수)
+            if 함수 is not None:
+                인스턴스 = 대상
+            else:
+                함수 = self._속성값(대상, node.함수, env)
+        else:
+            함수 = yield from self._식생성(node.함수, env)
+        인자들 = []
+        for 인자 in node.인자들:
+            인자들.append((yield from self._식생성(인자, env)))
+
+        if isinstance(함수, 한랭함수) and 함수.기억 is None \
+                and not (함수.선언.생성기 or 함수.선언.비동기):
+            if 인스턴스 is None and len(인자들) != len(함수.선언.매개변수들):
+                raise 런타임에러(
+                    f"함수 '{함수.선언.이름}'은(는) {len(함수.선언.매개변수들)}개의 "
+                    f"인자가 필요하지만 {len(인자들)}개가 전달되었습니다"
+                )
+            return (yield from self._본문생성(함수, 인자들, 인스턴스))
+        if 인스턴스 is not None:
+            return self._call_method(인스턴스, 함수, 인자들)
+
+        사본 = copy.copy(node)
+        사본.함수 = 계산된값(함수)
+        사본.인자들 = [계산된값(값) for 값 in 인자들]
+        return self.execute(사본, env)
+
+    def _본문생성(self, 함수: 한랭함수, 인자들, 인스턴스: Optional[한랭인스턴스] = None) -> Iterator[Any]:
+        """_본문실행/_call_method와 같지만 본문을 생성기로 실행 (반환값이 함수의 값)"""
+        함수_env = self._환경만들기(함수.클로저, 함수.선언.프레임재사용)
+        if 인스턴스 is not None:
+            함수_env.define('나', 인스턴스)
+            if 함수.부모클래스 is not None:
+                함수_env.define('부모', 함수.부모클래스)
+        for 이름, 값 in zip(함수.선언.매개변수들, 인자들):
+            함수_env.define(이름, 값)
+
+        try:
+            yield from self._블록생성(함수.선언.본문, 함수_env)
+        except 반환예외 as e:
+            return e.값
+        finally:
+            if 함수.선언.프레임재사용:
+                self._환경반납(함수_env)
+        return None
+
+    def _대기문장(self, node: ASTNode, env: Environment) -> Iterator[Any]:
+        """기다리기가 있는 단순 문장 실행 (대입문은 대상을 계산하지 않고 값만 먼저 계산)"""
+        if not isinstance(node, 대입문):
+            yield from self._식생성(node, env)
+            return
+        if node.대상.대기:
+            raise 런타임에러("대입할 대상에는 기다리기를 쓸 수 없습니다")
+        사본 = copy.copy(node)
+        사본.값 = 계산된값((yield from self._식생성(node.값, env)))
+        self.execute(사본, env)
+
+    def execute_기다리기식(self, node: 기다리기식, env: Environment) -> Any:
+        raise 런타임에러("기다리기는 비동기 함수 안이나 프로그램 최상위에서만 쓸 수 있습니다")
+
+    def execute_계산된값(self, node: 계산된값, env: Environment) -> Any:
+        return node.값
+
+    def _대기표시(self, node: ASTNode, 입력대기: bool = False, 호출대기: bool = False) -> bool:
+        """기다리기식이 들어 있는 노드에 대기 표시 (함수/람다/클래스 선언 자체는 멈추지 않음)
+
+        입력대기가 참이면 입력문도 비동기 입력을 기다리는 식으로 표시한다. 입력이 멈출 수 있는 곳은
+        프로그램 최상위와 비동기 함수 본문뿐이라 일반 함수, 람다, 리스트 내포 안으로는 넘기지 않는다.
+        호출대기가 참이면 내장 함수가 아닌 함수 호출도 표시해 _호출생성으로 실행한다. 생성기 함수
+        본문은 쉬기 표시를 내지 않으므로, 람다와 리스트 내포는 execute로만 실행되므로 제외한다.
+        """
+        대기 = isinstance(node, 기다리기식) or (입력대기 and isinstance(node, 입력문)) \
+            or (호출대기 and isinstance(node, 함수호출) and not (
+                isinstance(node.함수, 식별자) and node.함수.이름 in self._내장값들))
+        if isinstance(node, 함수선언):
+            입력대기 = node.비동기 and self.async_input_callback is not None
+            호출대기 = 호출대기 and not node.생성기
+        elif isinstance(node, (람다식, 리스트내포, 불변식)):
+            입력대기 = 호출대기 = False
+        for 자식 in 자식노드들(node):
+            # 대입 대상과 인라인된 본문은 _식생성으로 미리 계산하면 안 됨
+            자식호출대기 = 호출대기 and not (
+                (isinstance(node, 대입문) and 자식 is node.대상)
+                or (isinstance(node, 인라인호출) and 자식 is node.본문))
+            대기 = self._대기표시(자식, 입력대기, 자식호출대기) or 대기
+        if isinstance(node, (함수선언, 람다식, 클래스선언)):
+            return False
+        if 대기:
+            node.대기 = True
+        return 대기
+
+    @staticmethod
+    def _실행중루프(이름: str) -> asyncio.AbstractEventLoop:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            raise 런타임에러(f"'{이름}'은(는) 비동기 함수 안이나 기다리기를 쓰는 프로그램에서만 쓸 수 있습니다")
+
+
+# 병렬맵 작업자 프로세스 풀 (작업자 수, 풀) - 인터프리터들이 함께 재사용
+_병렬풀: Optional[Tuple[int, ProcessPoolExecutor]] = None
+
+
+def _프로세스풀(작업자수: int) -> ProcessPoolExecutor:
+    global _병렬풀
+    if _병렬풀 is None or _병렬풀[0] != 작업자수:
+        _프로세스풀닫기()
+        _병렬풀 = (작업자수, ProcessPoolExecutor(max_workers=작업자수))
+    return _병렬풀[1]
+
+
+def _프로세스풀닫기():
+    global _병렬풀
+    if _병렬풀 is not None:
+        _병렬풀[1].shutdown(wait=False, cancel_futures=True)
+        _병렬풀 = None
+
+
+# 작업자 프로세스의 인터프리터와 마지막으로 받은 함수 (같은 병렬맵의 묶음끼리 재사용)
+_작업자: Optional[HanlangInterpreter] = None
+_작업자함수: Tuple[bytes, Optional[Callable]] = (b'', None)
+
+
+def _작업자입력(프롬프트: str) -> str:
+    raise 런타임에러("병렬맵 함수 안에서는 입력을 쓸 수 없습니다")
+
+
+def _병렬작업(보낼함수: bytes, 항목들: list, 허용경로들: Tuple[str, ...] = ()) -> Tuple[list, List[str]]:
+    """작업자 프로세스에서 항목들에 함수를 적용하고 결과와 출력한 줄들을 반환
+
+    파일 함수는 호스트 인터프리터와 같은 허용경로들 안에서 쓸 수 있다.
+    """
+    global _작업자, _작업자함수
+    if _작업자 is None:
+        _작업자 = HanlangInterpreter(input_callback=_작업자입력)
+    if _작업자함수[0] != 보낼함수:
+        함수 = _작업자._병렬함수풀기(pickle.loads(보낼함수), {})
+        _작업자함수 = (보낼함수, _작업자._파이썬함수(함수, 1))
+    출력들: List[str] = []
+    _작업자.output_callback = 출력들.append
+    _작업자.output_buffer = []
+    _작업자.허용경로들 = 허용경로들
+    try:
+        return [_작업자함수[1](항목) for 항목 in 항목들], 출력들
+    finally:
+        _작업자._파일정리()
 
 
 if __name__ == "__main__":
@@ -20,15 +20,24 @@ class TokenType(Enum):
     변수 = auto()
     상수 = auto()
     함수 = auto()
+    기억 = auto()
+    비동기 = auto()
+    기다리기 = auto()
     반환 = auto()
+    양보 = auto()
     만약 = auto()
     아니면 = auto()
     아니면만약 = auto()
     반복 = auto()
+    안에 = auto()
+    선택 = auto()
+    경우 = auto()
+    기본 = auto()
     동안 = auto()
     중단 = auto()
     계속 = auto()
     클래스 = auto()
+    레코드 = auto()
     참 = auto()
     거짓 = auto()
     없음 = auto()
@@ -103,15 +112,24 @@ class HanlangLexer:
         '변수': TokenType.변수,
         '상수': TokenType.상수,
         '함수': TokenType.함수,
+        '기억': TokenType.기억,
+        '비동기': TokenType.비동기,
+        '기다리기': TokenType.기다리기,
         '반환': TokenType.반환,
+        '양보': TokenType.양보,
         '만약': TokenType.만약,
         '아니면': TokenType.아니면,
         '아니면만약': TokenType.아니면만약,
         '반복': TokenType.반복,
+        '안에': TokenType.안에,
+        '선택': TokenType.선택,
+        '경우': TokenType.경우,
+        '기본': TokenType.기본,
         '동안': TokenType.동안,
         '중단': TokenType.중단,
         '계속': TokenType.계속,
         '클래스': TokenType.클래스,
+        '레코드': TokenType.레코드,
         '참': TokenType.참,
         '거짓': TokenType.거짓,
         '없음': TokenType.없음,
@@ -203,10 +221,11 @@ class HanlangLexer:
                     result += '\t'
                 elif escape_char == '\\':
                     result += '\\'
-                elif escape_char == quote:
-                    result += quote
-                else:
+                elif escape_char in ('"', "'"):
                     result += escape_char
+                else:
+                    # 모르는 이스케이프는 역슬래시를 남김 (정규식의 \d, \w 등을 그대로 쓸 수 있음)
+                    result += '\\' + escape_char
             elif self.peek() == '\n':
                 self.error("문자열이 닫히지 않았습니다")
             else:
@@ -0,0 +1,826 @@
+# -*- coding: utf-8 -*-
+"""
+한랭(HanLang) 최적화기 - AST 최적화 패스
+실행 전에 AST를 분석하여 더 빠르게 실행되는 형태로 변환합니다.
+"""
+
+import copy
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from hanlang_parser import (
+    ASTNode, 프로그램, 숫자리터럴, 문자열리터럴, 불리언리터럴, 없음리터럴, 리스트리터럴, 리스트내포,
+    딕셔너리리터럴, 식별자, 이항연산, 단항연산, 변수선언, 대입문, 함수선언, 함수호출,
+    반환문, 양보문, 기다리기식, 반복문, 항목반복문, 동안문, 입력문, 인덱스접근, 슬라이스, 속성접근, 클래스선언, 레코드선언, 시도문,
+    삼항연산, 람다식, 불변식, 불변식계산, 인자칸, 인라인호출, 인자참조
+)
+
+_리터럴들 = (숫자리터럴, 문자열리터럴, 불리언리터럴, 없음리터럴)
+_산술연산자 = {'+', '-', '*', '/', '%', '**'}
+# 값을 바꾸지 않는 내장 모음/배열/정규식 메서드 (나머지 메서드 호출은 받는 값을 바꿀 수 있다고 봄)
+_읽기메서드들 = frozenset({
+    '포함', '합집합', '교집합', '차집합', '부분집합', '최소', '최대', '앞', '뒤', '하한', '상한', '구간',
+    '문자열', '목록', '합계', '제곱근', '일치', '찾기모두', '교체', '분리',
+})
+
+
+@dataclass
+class 반복문보고:
+    """반복문 하나에 대한 최적화 결과"""
+    반복문: str
+    끌어올린식들: List[str] = field(default_factory=list)
+    사유: Optional[str] = None
+
+
+@dataclass
+class 인라인보고:
+    """인라인된 함수 하나에 대한 결과"""
+    이름: str
+    크기: int
+    호출지점들: List[인라인호출] = field(default_factory=list)
+
+    @property
+    def 적중(self) -> int:
+        """인라인된 호출 지점들이 실제로 실행된 횟수"""
+        return sum(지점.적중 for 지점 in self.호출지점들)
+
+
+@dataclass
+class 최적화보고:
+    """최적화 패스 결과 보고서"""
+    반복문들: List[반복문보고] = field(default_factory=list)
+    인라인들: List[인라인보고] = field(default_factory=list)
+    전체스코프: int = 0
+    재사용스코프: int = 0
+    클로저: int = 0
+    캡처변수: int = 0
+
+    def __str__(self):
+        줄들 = ["=== 최적화 보고 ==="]
+        줄들.append(f"프레임 재사용 스코프: {self.재사용스코프}/{self.전체스코프}")
+        줄들.append(f"평평한 클로저: {self.클로저}개 (캡처 변수 {self.캡처변수}개)")
+        for 보고 in self.인라인들:
+            줄들.append(f"함수 {보고.이름} (크기 {보고.크기}): "
+                        f"호출 지점 {len(보고.호출지점들)}곳 인라인, {보고.적중}회 실행")
+        for 보고 in self.반복문들:
+            if 보고.끌어올린식들:
+                줄들.append(f"{보고.반복문}: {', '.join(보고.끌어올린식들)} 끌어올림")
+            else:
+                줄들.append(f"{보고.반복문}: 끌어올린 식 없음"
+                            + (f" ({보고.사유})" if 보고.사유 else ""))
+        return '\n'.join(줄들)
+
+
+def 식문자열(node: ASTNode) -> str:
+    """표현식을 한랭 소스 형태의 문자열로 변환 (보고용)"""
+    if isinstance(node, 숫자리터럴):
+        return repr(node.값)
+    if isinstance(node, 문자열리터럴):
+        return '"' + node.값.replace('"', '\\"') + '"'
+    if isinstance(node, 불리언리터럴):
+        return '참' if node.값 else '거짓'
+    if isinstance(node, 없음리터럴):
+        return '없음'
+    if isinstance(node, 식별자):
+        return node.이름
+    if isinstance(node, 리스트리터럴):
+        return '[' + ', '.join(식문자열(요소) for 요소 in node.요소들) + ']'
+    if isinstance(node, 리스트내포):
+        return (f"[{식문자열(node.식)} 반복 {node.변수} 안에 {식문자열(node.대상)}"
+                + (f" 만약 {식문자열(node.조건)}" if node.조건 else '') + "]")
+    if isinstance(node, 딕셔너리리터럴):
+        return '{' + ', '.join(f"{식문자열(키)}: {식문자열(값)}" for 키, 값 in node.쌍들) + '}'
+    if isinstance(node, 이항연산):
+        왼쪽 = 식문자열(node.왼쪽)
+        오른쪽 = 식문자열(node.오른쪽)
+        if isinstance(node.왼쪽, (이항연산, 삼항연산)):
+            왼쪽 = f"({왼쪽})"
+        if isinstance(node.오른쪽, (이항연산, 삼항연산)):
+            오른쪽 = f"({오른쪽})"
+        return f"{왼쪽} {node.연산자} {오른쪽}"
+    if isinstance(node, 단항연산):
+        if node.연산자 == '-':
+            return f"-{식문자열(node.피연산자)}"
+        return f"{node.연산자} {식문자열(node.피연산자)}"
+    if isinstance(node, 함수호출):
+        return f"{식문자열(node.함수)}({', '.join(식문자열(인자) for 인자 in node.인자들)})"
+    if isinstance(node, 인덱스접근):
+        return f"{식문자열(node.대상)}[{식문자열(node.인덱스)}]"
+    if isinstance(node, 슬라이스):
+        부분들 = [식문자열(부분) if 부분 else '' for 부분 in (node.시작, node.끝, node.간격)]
+        return ':'.join(부분들 if node.간격 else 부분들[:2])
+    if isinstance(node, 속성접근):
+        return f"{식문자열(node.대상)}.{node.속성}"
+    if isinstance(node, 삼항연산):
+        return f"{식문자열(node.조건)} ? {식문자열(node.참값)} : {식문자열(node.거짓값)}"
+    if isinstance(node, 람다식):
+        return f"({', '.join(node.매개변수들)}) => {식문자열(node.본문)}"
+    if isinstance(node, 입력문):
+        return f"입력({식문자열(node.프롬프트) if node.프롬프트 else ''})"
+    if isinstance(node, 기다리기식):
+        return f"기다리기 {식문자열(node.값)}"
+    if isinstance(node, 불변식):
+        return 식문자열(node.식)
+    if isinstance(node, 인라인호출):
+        return f"{node.이름}({', '.join(식문자열(인자) for 인자 in node.인자들)})"
+    if isinstance(node, 인자참조):
+        return node.이름
+    return type(node).__name__
+
+
+def 자식노드들(node: ASTNode):
+    """노드의 직계 자식 AST 노드들을 순서대로 반환"""
+    for 필드 in fields(node):
+        값 = getattr(node, 필드.name)
+        if isinstance(값, ASTNode):
+            yield 값
+        elif isinstance(값, list):
+            for 항목 in 값:
+                if isinstance(항목, ASTNode):
+                    yield 항목
+                elif isinstance(항목, tuple):
+                    for 요소 in 항목:
+                        if isinstance(요소, ASTNode):
+                            yield 요소
+
+
+def 자식치환(node: ASTNode, 변환: Callable[[ASTNode], ASTNode]):
+    """노드의 직계 자식들을 변환 함수의 결과로 교체"""
+    for 필드 in fields(node):
+        값 = getattr(node, 필드.name)
+        if isinstance(값, ASTNode):
+            setattr(node, 필드.name, 변환(값))
+        elif isinstance(값, list):
+            새목록 = []
+            for 항목 in 값:
+                if isinstance(항목, ASTNode):
+                    항목 = 변환(항목)
+                elif isinstance(항목, tuple):
+                    항목 = tuple(변환(요소) if isinstance(요소, ASTNode) else 요소
+                                for 요소 in 항목)
+                새목록.append(항목)
+            setattr(node, 필드.name, 새목록)
+
+
+def 노드수(node: ASTNode) -> int:
+    """하위 트리의 노드 개수"""
+    return 1 + sum(노드수(자식) for 자식 in 자식노드들(node))
+
+
+def 바인딩횟수(node: ASTNode) -> Counter:
+    """프로그램 어디에서든 각 이름이 선언되거나 대입되는 횟수"""
+    횟수: Counter = Counter()
+
+    def 방문(n: ASTNode):
+        if isinstance(n, (변수선언, 함수선언, 클래스선언, 레코드선언)):
+            횟수[n.이름] += 1
+        if isinstance(n, (함수선언, 람다식)):
+            횟수.update(n.매개변수들)
+        elif isinstance(n, (반복문, 항목반복문, 리스트내포)):
+            횟수[n.변수] += 1
+        elif isinstance(n, 시도문) and n.잡기변수:
+            횟수[n.잡기변수] += 1
+        elif isinstance(n, 대입문) and isinstance(n.대상, 식별자):
+            횟수[n.대상.이름] += 1
+        for 자식 in 자식노드들(n):
+            방문(자식)
+
+    방문(node)
+    return 횟수
+
+
+def 블록선언이름들(문장들: List[ASTNode]) -> Set[str]:
+    """블록이 속한 스코프에 선언되는 이름들 (새 스코프를 만드는 안쪽 블록은 제외)"""
+    이름들: Set[str] = set()
+
+    def 방문(n: ASTNode):
+        if isinstance(n, (변수선언, 함수선언, 클래스선언, 레코드선언)):
+            이름들.add(n.이름)
+        if isinstance(n, (함수선언, 클래스선언, 람다식, 반복문, 항목반복문)):
+            return
+        if isinstance(n, 시도문):
+            for 문장 in n.시도블록 + (n.마침내블록 or []):
+                방문(문장)
+            return
+        for 자식 in 자식노드들(n):
+            방문(자식)
+
+    for 문장 in 문장들:
+        방문(문장)
+    return 이름들
+
+
+def 양보포함(node: ASTNode, 입력대기: bool = False) -> bool:
+    """하위 트리(안쪽 함수 제외)에 실행이 멈추는 양보문이나 기다리기식이 있는지
+
+    입력대기가 참이면 (비동기 입력을 쓰는 실행) 입력문도 멈추므로 함께 센다.
+    """
+    if isinstance(node, (양보문, 기다리기식)) or (입력대기 and isinstance(node, 입력문)):
+        return True
+    if isinstance(node, (함수선언, 람다식, 클래스선언)):
+        return False
+    return any(양보포함(자식, 입력대기) for 자식 in 자식노드들(node))
+
+
+def 메서드스코프이름들(클래스: 클래스선언, 메서드: 함수선언) -> Set[str]:
+    """메서드 호출 프레임에 묶이는 이름들 (나, 부모 클래스가 있으면 부모 포함)"""
+    이름들 = {'나'} | set(메서드.매개변수들) | 블록선언이름들(메서드.본문)
+    if 클래스.부모 is not None:
+        이름들.add('부모')
+    return 이름들
+
+
+def 스코프자식들(node: ASTNode) -> Iterator[Tuple[ASTNode, Optional[Set[str]], bool]]:
+    """직계 자식과, 자식이 새 스코프에서 실행되면 그 스코프에 묶이는 이름들, 함수 프레임 여부"""
+    if isinstance(node, 함수선언):
+        이름들 = set(node.매개변수들) | 블록선언이름들(node.본문)
+        for 문장 in node.본문:
+            yield 문장, 이름들, True
+    elif isinstance(node, 람다식):
+        yield node.본문, set(node.매개변수들), True
+    elif isinstance(node, 클래스선언):
+        if node.부모 is not None:
+            yield node.부모, None, False
+        for 메서드 in node.본문:
+            if isinstance(메서드, 함수선언):
+                이름들 = 메서드스코프이름들(node, 메서드)
+                for 문장 in 메서드.본문:
+                    yield 문장, 이름들, True
+    elif isinstance(node, (반복문, 항목반복문)):
+        if isinstance(node, 반복문):
+            yield node.시작, None, False
+            yield node.끝, None, False
+        else:
+            yield node.대상, None, False
+        이름들 = {node.변수} | 블록선언이름들(node.본문)
+        for 문장 in node.본문:
+            yield 문장, 이름들, False
+    elif isinstance(node, 시도문) and node.잡기블록:
+        for 문장 in node.시도블록:
+            yield 문장, None, False
+        이름들 = 블록선언이름들(node.잡기블록)
+        if node.잡기변수:
+            이름들.add(node.잡기변수)
+        for 문장 in node.잡기블록:
+            yield 문장, 이름들, False
+        for 문장 in node.마침내블록 or []:
+            yield 문장, None, False
+    elif isinstance(node, 리스트내포):
+        yield node.대상, None, False
+        yield node.식, {node.변수}, False
+        if node.조건 is not None:
+            yield node.조건, {node.변수}, False
+    else:
+        for 자식 in 자식노드들(node):
+            yield 자식, None, False
+
+
+def 자유이름들(node: ASTNode, 묶인: Set[str] = frozenset()) -> Set[str]:
+    """하위 트리에서 읽거나 쓰는 이름 중 하위 트리 안에서 선언되지 않은 것"""
+    if isinstance(node, 식별자):
+        return set() if node.이름 in 묶인 else {node.이름}
+    결과: Set[str] = set()
+    if isinstance(node, 속성접근) and '나' not in 묶인:
+        # 클래스의 메서드를 꺼내면 (부모.메서드) 현재 나에 바인딩되므로 나도 사용
+        결과.add('나')
+    for 자식, 이름들, _ in 스코프자식들(node):
+        결과 |= 자유이름들(자식, 묶인 | 이름들 if 이름들 else 묶인)
+    return 결과
+
+
+def 같은값이름들(node: ASTNode) -> Set[str]:
+    """식의 값이 그 값 자체이거나 그 안에 든 값일 수 있는 이름들 (d, d[0], d.칸, [d], 조건 ? d : e)"""
+    while isinstance(node, (인덱스접근, 속성접근)):
+        node = node.대상
+    if isinstance(node, 식별자):
+        return {node.이름}
+    결과: Set[str] = set()
+    if isinstance(node, 삼항연산):
+        결과 = 같은값이름들(node.참값) | 같은값이름들(node.거짓값)
+    elif isinstance(node, 리스트리터럴):
+        for 요소 in node.요소들:
+            결과 |= 같은값이름들(요소)
+    elif isinstance(node, 딕셔너리리터럴):
+        for _, 값 in node.쌍들:
+            결과 |= 같은값이름들(값)
+    return 결과
+
+
+def 바깥변경이름들(node: ASTNode, 내장함수순도: Dict[str, str],
+                 묶인: Set[str] = frozenset()) -> Set[str]:
+    """하위 트리에서 다시 대입하거나 내용을 바꾸는 이름 중 하위 트리 안에서 선언되지 않은 것
+
+    대입문의 대상(인덱스/속성 대입은 맨 앞 식별자), '변경' 내장 함수의 첫 번째 인자와
+    읽기 전용이 아닌 메서드를 부르는 값(본것.추가(x)의 본것)을 본다.
+    다른 사용자 함수에 인자로 넘겨 그 함수가 바꾸는 것(g(d))은 보지 않는다. 지역 변수가 바깥 값을 가리킬 수 있으면 (변수 t = d, 항목반복 t 안에 d) 그 지역 변수의
+    내용을 바꾸는 것도 바깥 이름을 바꾸는 것으로 본다.
+    """
+    결과: Set[str] = set()
+    바뀐지역들: Set[str] = set()
+    별칭들: Dict[str, Set[Tuple[str, bool]]] = {}
+    _변경수집(node, 내장함수순도, 묶인, 결과, 바뀐지역들, 별칭들)
+
+    # 내용이 바뀐 지역 변수에서 그 값을 준 이름들을 따라가 바깥 이름까지 찾음
+    남은 = list(바뀐지역들)
+    while 남은:
+        for 원본, 바깥 in 별칭들.get(남은.pop(), ()):
+            if 바깥:
+                결과.add(원본)
+            elif 원본 not in 바뀐지역들:
+                바뀐지역들.add(원본)
+                남은.append(원본)
+    return 결과
+
+
+def _변경수집(node: ASTNode, 내장함수순도: Dict[str, str], 묶인: Set[str], 결과: Set[str],
+           바뀐지역들: Set[str], 별칭들: Dict[str, Set[Tuple[str, bool]]]):
+    대상 = None
+    내용변경 = True
+    if isinstance(node, 대입문):
+        대상 = node.대상
+        if isinstance(대상, 식별자):
+            내용변경 = False
+            _별칭추가(별칭들, 대상.이름, node.값, 묶인)
+        while isinstance(대상, (인덱스접근, 속성접근)):
+            대상 = 대상.대상
+    elif (isinstance(node, 함수호출) and isinstance(node.함수, 식별자) and node.인자들
+          and 내장함수순도.get(node.함수.이름) == '변경'):
+        대상 = node.인자들[0]
+        while isinstance(대상, (인덱스접근, 속성접근)):
+            대상 = 대상.대상
+    elif (isinstance(node, 함수호출) and isinstance(node.함수, 속성접근)
+          and node.함수.속성 not in _읽기메서드들):
+        대상 = node.함수.대상
+        while isinstance(대상, (인덱스접근, 속성접근)):
+            대상 = 대상.대상
+    elif isinstance(node, 변수선언) and node.초기값 is not None:
+        _별칭추가(별칭들, node.이름, node.초기값, 묶인)
+    elif isinstance(node, (항목반복문, 리스트내포)):
+        _별칭추가(별칭들, node.변수, node.대상, 묶인)
+    if isinstance(대상, 식별자):
+        if 대상.이름 not in 묶인:
+            결과.add(대상.이름)
+        elif 내용변경:
+            바뀐지역들.add(대상.이름)
+    for 자식, 이름들, _ in 스코프자식들(node):
+        _변경수집(자식, 내장함수순도, 묶인 | 이름들 if 이름들 else 묶인, 결과, 바뀐지역들, 별칭들)
+
+
+def _별칭추가(별칭들: Dict[str, Set[Tuple[str, bool]]], 이름: str, 값: ASTNode, 묶인: Set[str]):
+    """이름이 값 식의 이름들과 같은 값을 가리킬 수 있음을 기록 (바깥 이름인지도 함께)"""
+    for 원본 in 같은값이름들(값):
+        별칭들.setdefault(이름, set()).add((원본, 원본 not in 묶인))
+
+
+@dataclass
+class _스코프:
+    이름들: Set[str]
+    함수경계: bool = False
+
+
+@dataclass
+class _반복분석:
+    대입된이름들: Set[str] = field(default_factory=set)
+    사용자호출: bool = False
+    힙변경: bool = False
+
+
+@dataclass
+class _인라인후보:
+    이름: str
+    선언위치: int
+    매개변수들: List[str]
+    본문: ASTNode
+    보고: Optional[인라인보고] = None
+    자유변수들: Set[str] = field(default_factory=set)
+
+
+class HanlangOptimizer:
+    """한랭 최적화기 - 실행 전에 AST를 변환"""
+
+    인라인_기본최대크기 = 20
+
+    def __init__(self, 내장함수순도: Dict[str, str], 인라인_최대크기: int = None,
+                 입력대기: bool = False, 비동기호스트: bool = False):
+        # 내장함수순도: 이름 -> '순수' | '읽기' | '변경'
+        # 입력대기: 비동기 입력을 쓰는 실행이라 입력문에서도 실행이 멈추는지
+        # 비동기호스트: 이벤트 루프에서 실행되어 반복문도 쉬기 표시에서 멈추는지
+        #   (최상위에 기다리기가 있는 프로그램도 그렇게 실행된다)
+        self.내장함수순도 = 내장함수순도
+        self.입력대기 = 입력대기
+        self.비동기호스트 = 비동기호스트
+        self.인라인_최대크기 = (self.인라인_기본최대크기 if 인라인_최대크기 is None
+                          else 인라인_최대크기)
+        self.보고 = 최적화보고()
+        self._재정의된이름들: Set[str] = set()
+        self._불변식번호 = 0
+        self._인라인후보들: Dict[str, _인라인후보] = {}
+
+    def optimize(self, node: 프로그램) -> 프로그램:
+        바인딩 = 바인딩횟수(node)
+        self._재정의된이름들 = set(바인딩)
+        self.비동기호스트 = self.비동기호스트 or node.비동기
+        if self.인라인_최대크기 > 0:
+            self._인라인(node, 바인딩)
+        node.문장들 = [self._반복문최적화(문장) for 문장 in node.문장들]
+        self._탈출분석(node)
+        self._캡처분석(node, [])
+        return node
+
+    def _내장순도(self, node: 함수호출) -> Optional[str]:
+        """호출 대상이 재정의되지 않은 내장 함수이면 그 순도를 반환"""
+        if isinstance(node.함수, 식별자) and node.함수.이름 not in self._재정의된이름들:
+            return self.내장함수순도.get(node.함수.이름)
+        return None
+
+    # 작은 함수/람다 인라인
+    def _인라인(self, node: 프로그램, 바인딩: Counter):
+        # 한 번만 바인딩되는 최상위 함수/람다만 호출 대상이 항상 같다고 보장할 수 있다
+        후보들: Dict[str, _인라인후보] = {}
+        for 위치, 문장 in enumerate(node.문장들):
+            if isinstance(문장, 함수선언):
+                # 기억 함수는 호출이 캐시를 거쳐야 하고 비동기 함수는 코루틴을 반환하므로 제외
+                if (not 문장.기억 and not 문장.비동기 and len(문장.본문) == 1 and isinstance(문장.본문[0], 반환문)
+                        and 문장.본문[0].값 is not None):
+                    후보들[문장.이름] = _인라인후보(
+                        문장.이름, 위치, 문장.매개변수들, 문장.본문[0].값)
+            elif isinstance(문장, 변수선언) and isinstance(문장.초기값, 람다식):
+                후보들[문장.이름] = _인라인후보(
+                    문장.이름, 위치, 문장.초기값.매개변수들, 문장.초기값.본문)
+        self._인라인후보들 = {
+            이름: 후보 for 이름, 후보 in 후보들.items()
+            if 바인딩[이름] == 1 and len(set(후보.매개변수들)) == len(후보.매개변수들)
+        }
+
+        준비됨: Dict[str, bool] = {}
+        for 이름 in self._인라인후보들:
+            self._인라인준비(이름, 준비됨, set())
+        self._인라인후보들 = {이름: 후보 for 이름, 후보 in self._인라인후보들.items()
+                         if 준비됨.get(이름)}
+
+        for 위치, 문장 in enumerate(node.문장들):
+            node.문장들[위치] = self._호출치환(문장, set(), 위치)
+
+        # 다른 함수 본문 안에 인라인된 지점까지 모두 보고에 포함
+        for n in self._하위노드들(node):
+            if isinstance(n, 인라인호출):
+                self._인라인후보들[n.이름].보고.호출지점들.append(n)
+        for 후보 in self._인라인후보들.values():
+            if 후보.보고.호출지점들:
+                self.보고.인라인들.append(후보.보고)
+
+    def _인라인준비(self, 이름: str, 준비됨: Dict[str, bool], 방문중: Set[str]) -> bool:
+        """후보 본문 안의 다른 후보 호출을 먼저 인라인하고 인라인 가능 여부를 결정"""
+        if 이름 in 준비됨:
+            return 준비됨[이름]
+        if 이름 in 방문중:
+            return False  # 재귀 호출
+        방문중.add(이름)
+        후보 = self._인라인후보들[이름]
+        매개변수들 = set(후보.매개변수들)
+
+        가능 = True
+
+        def 치환(n: ASTNode) -> ASTNode:
+            nonlocal 가능
+            if isinstance(n, (람다식, 입력문, 리스트내포)):
+                가능 = False
+                return n
+            자식치환(n, 치환)
+            if isinstance(n, 함수호출):
+                if self._내장순도(n) is not None:
+                    return n
+                if isinstance(n.함수, 식별자) and n.함수.이름 in self._인라인후보들:
+                    안쪽 = self._인라인후보들[n.함수.이름]
+                    if (안쪽.선언위치 < 후보.선언위치
+                            and self._인라인준비(안쪽.이름, 준비됨, 방문중)
+                            and len(n.인자들) == len(안쪽.매개변수들)
+                            and not (안쪽.자유변수들 & 매개변수들)):
+                        return self._인라인생성(안쪽, n.인자들)
+                가능 = False
+            return n
+
+        후보.본문 = 치환(후보.본문)
+        if 가능 and 노드수(후보.본문) > self.인라인_최대크기:
+            가능 = False
+        if 가능:
+            후보.자유변수들 = {
+                n.이름 for n in self._하위노드들(후보.본문)
+                if isinstance(n, 식별자) and n.이름 not in 매개변수들
+            }
+            if any(isinstance(n, 속성접근) and isinstance(n.대상, 식별자)
+                   and n.대상.이름 not in 매개변수들
+                   for n in self._하위노드들(후보.본문)):
+                # 클래스의 메서드를 꺼내면 호출 지점의 나에 바인딩된다
+                후보.자유변수들.add('나')
+            후보.보고 = 인라인보고(이름, 노드수(후보.본문))
+        방문중.discard(이름)
+        준비됨[이름] = 가능
+        return 가능
+
+    def _하위노드들(self, node: ASTNode):
+        yield node
+        for 자식 in 자식노드들(node):
+            yield from self._하위노드들(자식)
+
+    def _인라인생성(self, 후보: _인라인후보, 인자들: List[ASTNode]) -> 인라인호출:
+        칸 = 인자칸(len(후보.매개변수들))
+        번호들 = {이름: 번호 for 번호, 이름 in enumerate(후보.매개변수들)}
+
+        def 매개변수치환(n: ASTNode) -> ASTNode:
+            if isinstance(n, 식별자) and n.이름 in 번호들:
+                return 인자참조(n.이름, 번호들[n.이름], 칸)
+            자식치환(n, 매개변수치환)
+            return n
+
+        본문 = 매개변수치환(copy.deepcopy(후보.본문))
+        return 인라인호출(후보.이름, 인자들, 본문, 칸)
+
+    def _호출치환(self, node: ASTNode, 지역이름들: Set[str], 문장위치: int) -> ASTNode:
+        """호출 지점을 인라인호출로 교체 (지역이름들: 호출 지점을 감싸는 지역 스코프의 이름)"""
+        if isinstance(node, 함수선언):
+            안쪽 = 지역이름들 | set(node.매개변수들) | 블록선언이름들(node.본문)
+            node.본문 = [self._호출치환(문장, 안쪽, 문장위치) for 문장 in node.본문]
+            return node
+        if isinstance(node, 클래스선언):
+            for 문장 in node.본문:
+                if isinstance(문장, 함수선언):
+                    안쪽 = 지역이름들 | 메서드스코프이름들(node, 문장)
+                    문장.본문 = [self._호출치환(s, 안쪽, 문장위치) for s in 문장.본문]
+            return node
+        if isinstance(node, 람다식):
+            node.본문 = self._호출치환(node.본문, 지역이름들 | set(node.매개변수들), 문장위치)
+            return node
+        if isinstance(node, (반복문, 항목반복문)):
+            if isinstance(node, 반복문):
+                node.시작 = self._호출치환(node.시작, 지역이름들, 문장위치)
+                node.끝 = self._호출치환(node.끝, 지역이름들, 문장위치)
+            else:
+                node.대상 = self._호출치환(node.대상, 지역이름들, 문장위치)
+            안쪽 = 지역이름들 | {node.변수} | 블록선언이름들(node.본문)
+            node.본문 = [self._호출치환(문장, 안쪽, 문장위치) for 문장 in node.본문]
+            return node
+        if isinstance(node, 리스트내포):
+            node.대상 = self._호출치환(node.대상, 지역이름들, 문장위치)
+            안쪽 = 지역이름들 | {node.변수}
+            node.식 = self._호출치환(node.식, 안쪽, 문장위치)
+            if node.조건 is not None:
+                node.조건 = self._호출치환(node.조건, 안쪽, 문장위치)
+            return node
+        if isinstance(node, 시도문) and node.잡기블록:
+            node.시도블록 = [self._호출치환(문장, 지역이름들, 문장위치) for 문장 in node.시도블록]
+            안쪽 = 지역이름들 | 블록선언이름들(node.잡기블록)
+            if node.잡기변수:
+                안쪽 = 안쪽 | {node.잡기변수}
+            node.잡기블록 = [self._호출치환(문장, 안쪽, 문장위치) for 문장 in node.잡기블록]
+            if node.마침내블록:
+                node.마침내블록 = [self._호출치환(문장, 지역이름들, 문장위치)
+                               for 문장 in node.마침내블록]
+            return node
+
+        자식치환(node, lambda 자식: self._호출치환(자식, 지역이름들, 문장위치))
+
+        if isinstance(node, 함수호출) and isinstance(node.함수, 식별자):
+            후보 = self._인라인후보들.get(node.함수.이름)
+            if (후보 is not None and 후보.선언위치 < 문장위치
+                    and len(node.인자들) == len(후보.매개변수들)
+                    and not (후보.자유변수들 & 지역이름들)):
+                return self._인라인생성(후보, node.인자들)
+        return node
+
+    # 탈출 분석
+    def _탈출분석(self, node: ASTNode):
+        """클로저가 캡처할 수 없는 스코프에 프레임재사용 표시
+
+        스코프 안에서 함수/람다/클래스가 만들어지지 않으면 그 스코프의 Environment를
+        참조하는 값이 스코프 밖으로 나갈 수 없으므로 실행이 끝난 뒤 재사용해도 된다.
+        양보문이 있는 스코프는 생성기가 멈춰 있는 동안 살아 있어야 하므로 제외한다.
+        """
+        본문: Optional[List[ASTNode]] = None
+        if isinstance(node, (함수선언, 반복문, 항목반복문)):
+            본문 = node.본문
+        elif isinstance(node, 람다식):
+            본문 = [node.본문]
+        elif isinstance(node, 리스트내포):
+            본문 = [node.식] + ([node.조건] if node.조건 is not None else [])
+        elif isinstance(node, 시도문) and node.잡기블록:
+            본문 = node.잡기블록
+
+        if 본문 is not None:
+            node.프레임재사용 = not any(self._클로저생성(문장) or 양보포함(문장, self.입력대기) for 문장 in 본문)
+            self.보고.전체스코프 += 1
+            if node.프레임재사용:
+                self.보고.재사용스코프 += 1
+
+        for 자식 in 자식노드들(node):
+            self._탈출분석(자식)
+
+    def _클로저생성(self, node: ASTNode) -> bool:
+        if isinstance(node, (함수선언, 람다식, 클래스선언)):
+            return True
+        return any(self._클로저생성(자식) for 자식 in 자식노드들(node))
+
+    # 자유 변수 분석 (평평한 클로저)
+    def _캡처분석(self, node: ASTNode, 스코프들: List[_스코프], 자기이름: Optional[str] = None):
+        """함수/람다가 참조하는 바깥 지역 변수와 그 변수를 가진 스코프까지의 거리를 기록
+
+        스코프들은 바깥쪽부터 안쪽 순서의 지역 스코프이며, 어느 지역 스코프에도
+        없는 이름은 전역이므로 캡처하지 않는다. 메서드는 전체 스코프 체인을 유지한다.
+        """
+        if isinstance(node, (함수선언, 람다식)):
+            if isinstance(node, 함수선언):
+                자기이름 = node.이름
+            node.캡처 = self._캡처목록(자유이름들(node), 스코프들, 자기이름)
+            self.보고.클로저 += 1
+            self.보고.캡처변수 += len(node.캡처)
+
+        for 자식, 이름들, 함수경계 in 스코프자식들(node):
+            안쪽 = 스코프들 if 이름들 is None else 스코프들 + [_스코프(이름들, 함수경계)]
+            자식이름 = None
+            if (isinstance(node, 변수선언) and 자식 is node.초기값
+                    and isinstance(자식, 람다식) and not node.상수여부):
+                자식이름 = node.이름
+            self._캡처분석(자식, 안쪽, 자식이름)
+
+    def _캡처목록(self, 이름들: Set[str], 스코프들: List[_스코프],
+                 자기이름: Optional[str]) -> List[Tuple[str, int, bool]]:
+        """(이름, 스코프 거리, 선언예정) 목록
+
+        함수 프레임 바깥의 변수는 그 프레임의 클로저 환경(프레임 거리 + 1)에서 찾는다.
+        선언예정은 클로저를 곧바로 자기 이름에 바인딩하는 재귀 참조로, 아직 없는 변수의 셀을 미리 만든다.
+        """
+        캡처 = []
+        for 이름 in sorted(이름들):
+            경계거리 = None
+            for 거리, 스코프 in enumerate(reversed(스코프들)):
+                if 이름 in 스코프.이름들:
+                    if 경계거리 is None:
+                        캡처.append((이름, 거리, 이름 == 자기이름 and 거리 == 0))
+                    else:
+                        캡처.append((이름, 경계거리 + 1, False))
+                    break
+                if 스코프.함수경계 and 경계거리 is None:
+                    경계거리 = 거리
+        return 캡처
+
+    # 반복문 불변식 끌어올리기
+    def _반복문최적화(self, node: ASTNode) -> ASTNode:
+        if not isinstance(node, (반복문, 항목반복문, 동안문)):
+            자식치환(node, self._반복문최적화)
+            return node
+
+        if isinstance(node, 반복문):
+            설명 = f"반복 {node.변수} = {식문자열(node.시작)} : {식문자열(node.끝)}"
+        elif isinstance(node, 항목반복문):
+            설명 = f"반복 {node.변수} 안에 {식문자열(node.대상)}"
+        else:
+            설명 = f"동안 {식문자열(node.조건)}"
+        보고 = 반복문보고(설명)
+        self.보고.반복문들.append(보고)
+
+        # 안쪽 반복문을 먼저 처리
+        자식치환(node, self._반복문최적화)
+
+        분석 = _반복분석()
+        if isinstance(node, (반복문, 항목반복문)):
+            분석.대입된이름들.add(node.변수)
+        else:
+            self._반복분석(node.조건, 분석)
+        for 문장 in node.본문:
+            self._반복분석(문장, 분석)
+
+        if 분석.사용자호출:
+            보고.사유 = "사용자 함수 호출 포함"
+            return node
+        if 양보포함(node, self.입력대기):
+            # 양보/기다리기로 멈춘 사이에 바깥 코드가 값을 바꿀 수 있음
+            보고.사유 = "양보 포함"
+            return node
+        if self.비동기호스트:
+            # 이벤트 루프에서는 반복문이 주기적으로 쉬므로 그 사이 다른 작업이 값을 바꿀 수 있음
+            보고.사유 = "비동기 실행"
+            return node
+
+        후보들: Dict[str, 불변식] = {}
+        if isinstance(node, 동안문):
+            node.조건 = self._불변식치환(node.조건, 분석, 후보들)
+        node.본문 = [self._불변식치환(문장, 분석, 후보들) for 문장 in node.본문]
+
+        if not 후보들:
+            return node
+        보고.끌어올린식들 = list(후보들)
+        return 불변식계산(list(후보들.values()), node)
+
+    def _반복분석(self, node: ASTNode, 분석: _반복분석):
+        """반복문 본문에서 대입되는 이름, 사용자 호출, 힙 변경 여부를 수집"""
+        if isinstance(node, (함수선언, 클래스선언, 레코드선언)):
+            분석.대입된이름들.add(node.이름)
+            return
+        if isinstance(node, (람다식, 불변식)):
+            return
+        if isinstance(node, 변수선언):
+            분석.대입된이름들.add(node.이름)
+        elif isinstance(node, (반복문, 항목반복문, 리스트내포)):
+            분석.대입된이름들.add(node.변수)
+        elif isinstance(node, 시도문) and node.잡기변수:
+            분석.대입된이름들.add(node.잡기변수)
+        elif isinstance(node, 대입문):
+            if isinstance(node.대상, 식별자):
+                분석.대입된이름들.add(node.대상.이름)
+            else:
+                분석.힙변경 = True
+        elif isinstance(node, 함수호출):
+            순도 = self._내장순도(node)
+            if 순도 is None:
+                분석.사용자호출 = True
+            elif 순도 == '변경':
+                분석.힙변경 = True
+        for 자식 in 자식노드들(node):
+            self._반복분석(자식, 분석)
+
+    def _불변식치환(self, node: ASTNode, 분석: _반복분석,
+                   후보들: Dict[str, 불변식]) -> ASTNode:
+        if self._끌어올릴가치(node) and self._불변(node, 분석):
+            키 = 식문자열(node)
+            if 키 not in 후보들:
+                self._불변식번호 += 1
+                후보들[키] = 불변식(f"#불변{self._불변식번호}", node)
+            return 후보들[키]
+
+        if isinstance(node, (람다식, 함수선언, 클래스선언, 불변식)):
+            return node
+        if isinstance(node, 불변식계산):
+            # 안쪽 반복문의 불변식도 바깥 반복문에 대해 불변이면 더 끌어올림
+            for 안쪽 in node.불변식들:
+                안쪽.식 = self._불변식치환(안쪽.식, 분석, 후보들)
+            node.반복 = self._불변식치환(node.반복, 분석, 후보들)
+            return node
+        if isinstance(node, 대입문):
+            # 대입 대상 자체는 바꾸지 않고 그 안의 식만 치환
+            if not isinstance(node.대상, 식별자):
+                자식치환(node.대상, lambda 자식: self._불변식치환(자식, 분석, 후보들))
+            node.값 = self._불변식치환(node.값, 분석, 후보들)
+            return node
+
+        자식치환(node, lambda 자식: self._불변식치환(자식, 분석, 후보들))
+        return node
+
+    def _끌어올릴가치(self, node: ASTNode) -> bool:
+        """식별자나 리터럴보다 비싼 계산을 포함하는지"""
+        if isinstance(node, (함수호출, 속성접근, 인덱스접근)):
+            return True
+        if isinstance(node, (이항연산, 단항연산, 삼항연산)):
+            return any(self._끌어올릴가치(자식) for 자식 in 자식노드들(node))
+        return False
+
+    def _불변(self, node: ASTNode, 분석: _반복분석) -> bool:
+        """반복 중에 값이 바뀌지 않고 부작용 없이 계산되는 식인지"""
+        if isinstance(node, _리터럴들):
+            return True
+        if isinstance(node, 식별자):
+            # 힙이 변경되는 반복문에서는 컬렉션 내용을 읽을 수 있는 식별자를 믿지 않음
+            return not 분석.힙변경 and node.이름 not in 분석.대입된이름들
+        if isinstance(node, 함수호출):
+            순도 = self._내장순도(node)
+            if 순도 == '순수':
+                # 순수 내장 함수는 스칼라 인자만 읽음
+                return all(
+                    인자.이름 not in 분석.대입된이름들 if isinstance(인자, 식별자)
+                    else self._불변(인자, 분석)
+                    for 인자 in node.인자들
+                )
+            if 순도 == '읽기':
+                return not 분석.힙변경 and all(self._불변(인자, 분석) for 인자 in node.인자들)
+            return False
+        if isinstance(node, 속성접근):
+            return not 분석.힙변경 and self._불변(node.대상, 분석)
+        if isinstance(node, 인덱스접근):
+            return (not 분석.힙변경 and self._불변(node.대상, 분석)
+                    and self._불변(node.인덱스, 분석))
+        if isinstance(node, 이항연산):
+            # 산술 결과가 새 리스트일 수 있으면 공유할 수 없으므로 스칼라만 허용
+            if node.연산자 in _산술연산자 and not (
+                    self._스칼라(node.왼쪽) and self._스칼라(node.오른쪽)):
+                return False
+            return self._불변(node.왼쪽, 분석) and self._불변(node.오른쪽, 분석)
+        if isinstance(node, 단항연산):
+            if node.연산자 == '-' and not self._스칼라(node.피연산자):
+                return False
+            return self._불변(node.피연산자, 분석)
+        if isinstance(node, 삼항연산):
+            return all(self._불변(자식, 분석) for 자식 in 자식노드들(node))
+        return False
+
+    def _스칼라(self, node: ASTNode) -> bool:
+        """결과가 항상 숫자/문자열/불리언인 식인지"""
+        if isinstance(node, (숫자리터럴, 문자열리터럴, 불리언리터럴)):
+            return True
+        if isinstance(node, 함수호출):
+            return self._내장순도(node) in ('순수', '읽기')
+        if isinstance(node, 이항연산):
+            if node.연산자 in _산술연산자:
+                return self._스칼라(node.왼쪽) and self._스칼라(node.오른쪽)
+            return node.연산자 not in ('그리고', '또는')
+        if isinstance(node, 단항연산):
+            return node.연산자 == '아님' or self._스칼라(node.피연산자)
+        return False
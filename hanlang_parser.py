@@ -4,18 +4,20 @@
 토큰을 AST(추상 구문 트리)로 변환합니다.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Any
 from hanlang_lexer import Token, TokenType, HanlangLexer
 
 # AST 노드 정의
 @dataclass
 class ASTNode:
-    pass
+    # 기다리기가 있어 실행 중에 멈출 수 있으면 인터프리터가 True로 설정
+    대기 = False
 
 @dataclass
 class 프로그램(ASTNode):
     문장들: List[ASTNode]
+    비동기: bool = False  # 최상위에 기다리기가 있으면 이벤트 루프에서 실행
 
 @dataclass
 class 숫자리터럴(ASTNode):
@@ -37,6 +39,16 @@ class 없음리터럴(ASTNode):
 class 리스트리터럴(ASTNode):
     요소들: List[ASTNode]
 
+@dataclass
+class 리스트내포(ASTNode):
+    """[식 반복 변수 안에 대상 만약 조건]"""
+    식: ASTNode
+    변수: str
+    대상: ASTNode
+    조건: Optional[ASTNode] = None
+    프레임재사용: bool = field(default=False, repr=False)  # 최적화기가 설정
+    컴파일: Optional[tuple] = field(default=None, repr=False, compare=False)  # 인터프리터가 설정 (식, 조건)
+
 @dataclass
 class 딕셔너리리터럴(ASTNode):
     쌍들: List[tuple]  # (키, 값) 튜플 리스트
@@ -67,12 +79,19 @@ class 대입문(ASTNode):
     대상: ASTNode
     연산자: str
     값: ASTNode
+    이어붙이기: Optional[bool] = field(default=None, repr=False, compare=False)  # 인터프리터가 설정
 
 @dataclass
 class 함수선언(ASTNode):
     이름: str
     매개변수들: List[str]
     본문: List[ASTNode]
+    생성기: bool = False  # 본문에 양보가 있으면 호출할 때 생성기를 반환
+    기억: bool = False  # 기억 함수이면 인자별 결과를 LRU 캐시에 저장
+    기억크기: Optional[int] = None  # None이면 인터프리터 기본 크기
+    비동기: bool = False  # 비동기 함수이면 호출할 때 코루틴을 반환
+    프레임재사용: bool = field(default=False, repr=False)  # 최적화기가 설정
+    캡처: Optional[list] = field(default=None, repr=False)  # 최적화기가 설정
 
 @dataclass
 class 함수호출(ASTNode):
@@ -83,18 +102,47 @@ class 함수호출(ASTNode):
 class 반환문(ASTNode):
     값: Optional[ASTNode]
 
+@dataclass
+class 양보문(ASTNode):
+    값: ASTNode
+
+@dataclass
+class 기다리기식(ASTNode):
+    값: ASTNode
+
 @dataclass
 class 조건문(ASTNode):
     조건: ASTNode
     참블록: List[ASTNode]
     거짓블록: Optional[List[ASTNode]]
 
+@dataclass
+class 경우절(ASTNode):
+    값들: List[ASTNode]
+    본문: List[ASTNode]
+
+@dataclass
+class 선택문(ASTNode):
+    대상: ASTNode
+    경우들: List[경우절]
+    기본: Optional[List[ASTNode]] = None
+    # 인터프리터가 설정 (리터럴 값 -> 경우 번호, 리터럴이 아닌 경우 값이 있으면 False)
+    점프표: Optional[Any] = field(default=None, repr=False, compare=False)
+
 @dataclass
 class 반복문(ASTNode):
     변수: str
     시작: ASTNode
     끝: ASTNode
     본문: List[ASTNode]
+    프레임재사용: bool = field(default=False, repr=False)  # 최적화기가 설정
+
+@dataclass
+class 항목반복문(ASTNode):
+    변수: str
+    대상: ASTNode
+    본문: List[ASTNode]
+    프레임재사용: bool = field(default=False, repr=False)  # 최적화기가 설정
 
 @dataclass
 class 동안문(ASTNode):
@@ -122,15 +170,28 @@ class 인덱스접근(ASTNode):
     대상: ASTNode
     인덱스: ASTNode
 
+@dataclass
+class 슬라이스(ASTNode):
+    시작: Optional[ASTNode]
+    끝: Optional[ASTNode]
+    간격: Optional[ASTNode] = None
+
 @dataclass
 class 속성접근(ASTNode):
     대상: ASTNode
     속성: str
+    캐시: Optional[tuple] = field(default=None, repr=False, compare=False)  # 인터프리터가 설정 (모양/레코드형, 칸 번호, 메서드)
 
 @dataclass
 class 클래스선언(ASTNode):
     이름: str
     본문: List[ASTNode]
+    부모: Optional[ASTNode] = None
+
+@dataclass
+class 레코드선언(ASTNode):
+    이름: str
+    필드들: List[str]
 
 @dataclass
 class 시도문(ASTNode):
@@ -138,6 +199,7 @@ class 시도문(ASTNode):
     잡기변수: Optional[str]
     잡기블록: Optional[List[ASTNode]]
     마침내블록: Optional[List[ASTNode]]
+    프레임재사용: bool = field(default=False, repr=False)  # 최적화기가 설정
 
 @dataclass
 class 던지기문(ASTNode):
@@ -153,6 +215,62 @@ class 삼항연산(ASTNode):
 class 람다식(ASTNode):
     매개변수들: List[str]
     본문: ASTNode
+    프레임재사용: bool = field(default=False, repr=False)  # 최적화기가 설정
+    캡처: Optional[list] = field(default=None, repr=False)  # 최적화기가 설정
+
+
+# 최적화기가 생성하는 노드
+@dataclass
+class 불변식(ASTNode):
+    """반복문 밖에서 미리 계산된 불변 표현식"""
+    이름: str
+    식: ASTNode
+
+@dataclass
+class 불변식계산(ASTNode):
+    """반복문에 들어가기 전에 불변식들을 계산"""
+    불변식들: List[불변식]
+    반복: ASTNode
+
+class 인자칸:
+    """인라인호출과 그 본문의 인자참조들이 공유하는 인자 값 저장소"""
+    __slots__ = ('값들',)
+
+    def __init__(self, 개수: int):
+        self.값들 = [None] * 개수
+
+    def __repr__(self):
+        return f"인자칸({len(self.값들)})"
+
+@dataclass
+class 인라인호출(ASTNode):
+    """작은 함수 호출을 그 본문으로 치환한 식"""
+    이름: str
+    인자들: List[ASTNode]
+    본문: ASTNode
+    칸: 인자칸
+    적중: int = 0
+
+@dataclass
+class 인자참조(ASTNode):
+    """인라인된 본문 안의 매개변수 자리"""
+    이름: str
+    번호: int
+    칸: 인자칸
+
+
+# 인터프리터가 생성하는 노드
+@dataclass
+class 계산된값(ASTNode):
+    """기다리기가 있는 식을 나누어 계산할 때 이미 계산한 자식 자리"""
+    값: Any
+
+
+# 기억 함수 본문에서 쓸 수 없는 내장 함수 (결과가 인자만으로 정해지지 않음)
+기억금지함수들 = frozenset({
+    '랜덤', '랜덤정수', '파일열기', '줄들', '전체읽기', '파일쓰기', '추가쓰기',
+    'CSV읽기', 'CSV쓰기', 'JSON읽기', 'JSON쓰기', 'JSON줄들',
+})
 
 
 class HanlangParser:
@@ -161,6 +279,14 @@ class HanlangParser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.pos = 0
+        # 파싱 중인 함수마다 양보문이 나왔는지 기록
+        self.양보표시: List[bool] = []
+        # 파싱 중인 함수/람다마다 기다리기를 쓸 수 있는지 (비어 있으면 최상위)
+        self.비동기표시: List[bool] = []
+        self.기다리기수 = 0
+        self.최상위기다리기 = False
+        # 기억 함수 본문 안이면 0보다 큼
+        self.기억깊이 = 0
 
     def error(self, message: str):
         token = self.current()
@@ -205,7 +331,7 @@ class HanlangParser:
                 문장들.append(문장)
             self.skip_newlines()
 
-        return 프로그램(문장들)
+        return 프로그램(문장들, self.최상위기다리기)
 
     def parse_statement(self) -> Optional[ASTNode]:
         self.skip_newlines()
@@ -218,10 +344,21 @@ class HanlangParser:
             return self.parse_variable_declaration(상수=True)
         elif token.type == TokenType.함수:
             return self.parse_function_declaration()
+        elif token.type == TokenType.기억:
+            return self.parse_memo_function_declaration()
+        elif token.type == TokenType.비동기:
+            self.advance()  # 비동기 키워드
+            if not self.match(TokenType.함수):
+                self.error("비동기 뒤에는 함수 선언이 필요합니다")
+            return self.parse_function_declaration(비동기=True)
         elif token.type == TokenType.반환:
             return self.parse_return_statement()
+        elif token.type == TokenType.양보:
+            return self.parse_yield_statement()
         elif token.type == TokenType.만약:
             return self.parse_if_statement()
+        elif token.type == TokenType.선택:
+            return self.parse_match_statement()
         elif token.type == TokenType.반복:
             return self.parse_for_statement()
         elif token.type == TokenType.동안:
@@ -236,6 +373,8 @@ class HanlangParser:
             return self.parse_print_statement()
         elif token.type == TokenType.클래스:
             return self.parse_class_declaration()
+        elif token.type == TokenType.레코드:
+            return self.parse_record_declaration()
         elif token.type == TokenType.시도:
             return self.parse_try_statement()
         elif token.type == TokenType.던지기:
@@ -254,7 +393,7 @@ class HanlangParser:
 
         return 변수선언(이름, 초기값, 상수)
 
-    def parse_function_declaration(self) -> 함수선언:
+    def parse_function_declaration(self, 비동기: bool = False) -> 함수선언:
         self.advance()  # 함수 키워드
         이름 = self.expect(TokenType.식별자, "함수 이름이 필요합니다").value
 
@@ -268,9 +407,48 @@ class HanlangParser:
                 매개변수들.append(self.expect(TokenType.식별자, "매개변수 이름이 필요합니다").value)
 
         self.expect(TokenType.오른쪽괄호, ") 가 필요합니다")
+
+        self.양보표시.append(False)
+        self.비동기표시.append(비동기)
         본문 = self.parse_block()
+        self.비동기표시.pop()
+        생성기 = self.양보표시.pop()
+
+        if 비동기 and 생성기:
+            self.error(f"비동기 함수 '{이름}'에는 양보를 쓸 수 없습니다")
+        return 함수선언(이름, 매개변수들, 본문, 생성기, 비동기=비동기)
+
+    def parse_memo_function_declaration(self) -> 함수선언:
+        self.advance()  # 기억 키워드
+
+        크기 = None
+        if self.match(TokenType.왼쪽괄호):
+            self.advance()
+            크기 = self.expect(TokenType.정수, "기억할 결과 개수(정수)가 필요합니다").value
+            if 크기 < 1:
+                self.error("기억할 결과 개수는 1 이상이어야 합니다")
+            self.expect(TokenType.오른쪽괄호, ") 가 필요합니다")
 
-        return 함수선언(이름, 매개변수들, 본문)
+        if not self.match(TokenType.함수):
+            self.error("기억 뒤에는 함수 선언이 필요합니다")
+
+        self.기억깊이 += 1
+        try:
+            선언 = self.parse_function_declaration()
+        finally:
+            self.기억깊이 -= 1
+
+        if 선언.생성기:
+            self.error(f"기억 함수 '{선언.이름}'에는 양보를 쓸 수 없습니다")
+        선언.기억 = True
+        선언.기억크기 = 크기
+        return 선언
+
+    def _기억검사(self, 이름: str):
+        """기억 함수 본문에서 결과를 인자만으로 정할 수 없게 만드는 구문 거부"""
+        if self.기억깊이:
+            self.error(f"기억 함수 안에서는 '{이름}'을(를) 쓸 수 없습니다 "
+                       f"(결과가 인자만으로 정해져야 합니다)")
 
     def parse_block(self) -> List[ASTNode]:
         self.skip_newlines()
@@ -296,6 +474,13 @@ class HanlangParser:
 
         return 반환문(값)
 
+    def parse_yield_statement(self) -> 양보문:
+        if not self.양보표시:
+            self.error("양보는 함수 안에서만 사용할 수 있습니다")
+        self.advance()  # 양보 키워드
+        self.양보표시[-1] = True
+        return 양보문(self.parse_expression())
+
     def parse_if_statement(self) -> 조건문:
         self.advance()  # 만약 키워드
         조건 = self.parse_expression()
@@ -313,11 +498,60 @@ class HanlangParser:
 
         return 조건문(조건, 참블록, 거짓블록)
 
-    def parse_for_statement(self) -> 반복문:
+    def parse_match_statement(self) -> 선택문:
+        self.advance()  # 선택 키워드
+        대상 = self.parse_expression()
+        self.skip_newlines()
+        self.expect(TokenType.왼쪽중괄호, "{ 가 필요합니다")
+        self.skip_newlines()
+
+        경우들 = []
+        기본 = None
+        while not self.match(TokenType.오른쪽중괄호, TokenType.파일끝):
+            if self.match(TokenType.경우):
+                self.advance()
+                값들 = [self.parse_expression()]
+                while self.match(TokenType.쉼표):
+                    self.advance()
+                    값들.append(self.parse_expression())
+                self.expect(TokenType.콜론, ": 가 필요합니다")
+                경우들.append(경우절(값들, self.parse_case_body()))
+            elif self.match(TokenType.기본):
+                if 기본 is not None:
+                    self.error("기본은 한 번만 쓸 수 있습니다")
+                self.advance()
+                self.expect(TokenType.콜론, ": 가 필요합니다")
+                기본 = self.parse_case_body()
+            else:
+                self.error("경우 또는 기본이 필요합니다")
+
+        self.expect(TokenType.오른쪽중괄호, "} 가 필요합니다")
+        return 선택문(대상, 경우들, 기본)
+
+    def parse_case_body(self) -> List[ASTNode]:
+        """다음 경우/기본 또는 선택문의 } 앞까지의 문장들"""
+        문장들 = []
+        self.skip_newlines()
+        while not self.match(TokenType.경우, TokenType.기본,
+                             TokenType.오른쪽중괄호, TokenType.파일끝):
+            문장 = self.parse_statement()
+            if 문장:
+                문장들.append(문장)
+            self.skip_newlines()
+        return 문장들
+
+    def parse_for_statement(self) -> ASTNode:
         self.advance()  # 반복 키워드
         변수 = self.expect(TokenType.식별자, "반복 변수 이름이 필요합니다").value
 
-        self.expect(TokenType.대입, "= 가 필요합니다")
+        # 반복 항목 안에 컬렉션 { ... }
+        if self.match(TokenType.안에):
+            self.advance()
+            대상 = self.parse_expression()
+            본문 = self.parse_block()
+            return 항목반복문(변수, 대상, 본문)
+
+        self.expect(TokenType.대입, "= 또는 안에 가 필요합니다")
         시작 = self.parse_expression()
 
         # ~ 또는 .. 으로 범위 표현 (여기서는 콜론 사용)
@@ -336,6 +570,7 @@ class HanlangParser:
         return 동안문(조건, 본문)
 
     def parse_print_statement(self) -> 출력문:
+        self._기억검사('출력')
         self.advance()  # 출력 키워드
         self.expect(TokenType.왼쪽괄호, "( 가 필요합니다")
 
@@ -352,9 +587,41 @@ class HanlangParser:
     def parse_class_declaration(self) -> 클래스선언:
         self.advance()  # 클래스 키워드
         이름 = self.expect(TokenType.식별자, "클래스 이름이 필요합니다").value
+
+        부모 = None
+        if self.match(TokenType.왼쪽괄호):
+            self.advance()
+            부모 = 식별자(self.expect(TokenType.식별자, "부모 클래스 이름이 필요합니다").value)
+            self.expect(TokenType.오른쪽괄호, ") 가 필요합니다")
+
         본문 = self.parse_block()
 
-        return 클래스선언(이름, 본문)
+        for 문장 in 본문:
+            # 메서드의 결과는 나의 필드에도 달려 있어 인자만으로 기억할 수 없음
+            if isinstance(문장, 함수선언) and 문장.기억:
+                self.error(f"메서드 '{이름}.{문장.이름}'은(는) 기억 함수로 만들 수 없습니다")
+
+        return 클래스선언(이름, 본문, 부모)
+
+    def parse_record_declaration(self) -> 레코드선언:
+        self.advance()  # 레코드 키워드
+        이름 = self.expect(TokenType.식별자, "레코드 이름이 필요합니다").value
+
+        self.expect(TokenType.왼쪽괄호, "( 가 필요합니다")
+        필드들 = []
+
+        if not self.match(TokenType.오른쪽괄호):
+            필드들.append(self.expect(TokenType.식별자, "필드 이름이 필요합니다").value)
+            while self.match(TokenType.쉼표):
+                self.advance()
+                필드들.append(self.expect(TokenType.식별자, "필드 이름이 필요합니다").value)
+
+        self.expect(TokenType.오른쪽괄호, ") 가 필요합니다")
+
+        if len(set(필드들)) != len(필드들):
+            self.error(f"레코드 '{이름}'에 같은 이름의 필드가 있습니다")
+
+        return 레코드선언(이름, 필드들)
 
     def parse_try_statement(self) -> 시도문:
         self.advance()  # 시도 키워드
@@ -432,7 +699,9 @@ class HanlangParser:
 
         self.expect(TokenType.오른쪽괄호, ") 가 필요합니다")
         self.expect(TokenType.화살표함수, "=> 가 필요합니다")
+        self.비동기표시.append(False)
         본문 = self.parse_expression()
+        self.비동기표시.pop()
 
         return 람다식(매개변수들, 본문)
 
@@ -495,7 +764,8 @@ class HanlangParser:
         left = self.parse_additive()
 
         while self.match(TokenType.같음, TokenType.다름, TokenType.작음,
-                        TokenType.큼, TokenType.작거나같음, TokenType.크거나같음):
+                        TokenType.큼, TokenType.작거나같음, TokenType.크거나같음,
+                        TokenType.안에):
             op = self.advance().value
             right = self.parse_additive()
             left = 이항연산(left, op, right)
@@ -538,6 +808,15 @@ class HanlangParser:
             operand = self.parse_unary()
             return 단항연산(op, operand)
 
+        if self.match(TokenType.기다리기):
+            if self.비동기표시 and not self.비동기표시[-1]:
+                self.error("기다리기는 비동기 함수 안이나 프로그램 최상위에서만 쓸 수 있습니다")
+            self.advance()
+            if not self.비동기표시:
+                self.최상위기다리기 = True
+            self.기다리기수 += 1
+            return 기다리기식(self.parse_unary())
+
         return self.parse_call()
 
     def parse_call(self) -> ASTNode:
@@ -559,7 +838,7 @@ class HanlangParser:
 
             elif self.match(TokenType.왼쪽대괄호):
                 self.advance()
-                인덱스 = self.parse_expression()
+                인덱스 = self.parse_index()
                 self.expect(TokenType.오른쪽대괄호, "] 가 필요합니다")
                 expr = 인덱스접근(expr, 인덱스)
 
@@ -573,6 +852,25 @@ class HanlangParser:
 
         return expr
 
+    def parse_index(self) -> ASTNode:
+        """[ ] 안의 인덱스 또는 시작:끝:간격 슬라이스 (각 부분은 생략 가능)"""
+        시작 = None
+        if not self.match(TokenType.콜론):
+            시작 = self.parse_expression()
+            if not self.match(TokenType.콜론):
+                return 시작
+        self.advance()
+
+        끝 = None
+        if not self.match(TokenType.콜론, TokenType.오른쪽대괄호):
+            끝 = self.parse_expression()
+        간격 = None
+        if self.match(TokenType.콜론):
+            self.advance()
+            if not self.match(TokenType.오른쪽대괄호):
+                간격 = self.parse_expression()
+        return 슬라이스(시작, 끝, 간격)
+
     def parse_primary(self) -> ASTNode:
         token = self.current()
 
@@ -597,10 +895,13 @@ class HanlangParser:
             return 없음리터럴()
 
         if token.type == TokenType.식별자:
+            if token.value in 기억금지함수들:
+                self._기억검사(token.value)
             self.advance()
             return 식별자(token.value)
 
         if token.type == TokenType.입력:
+            self._기억검사('입력')
             self.advance()
             self.expect(TokenType.왼쪽괄호, "( 가 필요합니다")
             프롬프트 = None
@@ -623,7 +924,10 @@ class HanlangParser:
             요소들 = []
 
             if not self.match(TokenType.오른쪽대괄호):
+                기다리기수 = self.기다리기수
                 요소들.append(self.parse_expression())
+                if self.match(TokenType.반복):
+                    return self.parse_list_comprehension(요소들[0], 기다리기수)
                 while self.match(TokenType.쉼표):
                     self.advance()
                     요소들.append(self.parse_expression())
@@ -659,6 +963,22 @@ class HanlangParser:
 
         self.error(f"예상치 못한 토큰: {token.type.name}")
 
+    def parse_list_comprehension(self, 식: ASTNode, 기다리기수: int) -> 리스트내포:
+        self.advance()  # 반복 키워드
+        변수 = self.expect(TokenType.식별자, "반복 변수 이름이 필요합니다").value
+        self.expect(TokenType.안에, "안에 가 필요합니다")
+        대상 = self.parse_expression()
+
+        조건 = None
+        if self.match(TokenType.만약):
+            self.advance()
+            조건 = self.parse_expression()
+
+        self.expect(TokenType.오른쪽대괄호, "] 가 필요합니다")
+        if self.기다리기수 != 기다리기수:
+            self.error("리스트 내포 안에서는 기다리기를 쓸 수 없습니다")
+        return 리스트내포(식, 변수, 대상, 조건)
+
 
 if __name__ == "__main__":
     code = '''
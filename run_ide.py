@@ -6,6 +6,7 @@
 
 import sys
 import os
+import multiprocessing
 
 # 현재 디렉토리를 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,4 +15,6 @@ sys.path.insert(0, current_dir)
 from hanlang_ide import main
 
 if __name__ == "__main__":
+    # PyInstaller로 묶은 실행 파일에서 병렬맵 작업자 프로세스가 IDE를 다시 띄우지 않도록
+    multiprocessing.freeze_support()
     main()